@@ -0,0 +1,644 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/*
+ * Copyright (c) 2019 Huazhong University of Science and Technology, Dian Group
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License version 2 as
+ * published by the Free Software Foundation;
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to the Free Software
+ * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+ *
+ * Author: Pengyu Liu <eic_lpy@hust.edu.cn>
+ */
+#include <string.h>
+#include <stdbool.h>
+#include <limits.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/shm.h>
+#include <sys/ipc.h>
+#include <sys/syscall.h>
+#include <linux/futex.h>
+#include "memory-pool.h"
+
+#if defined(__GNUC__)
+#if defined(__i386__) || defined(__x86_64__)
+#define ShmYield() __asm__ __volatile__("pause")
+#elif defined(__ia64__) || defined(__ia64)
+#define ShmYield() __asm__ __volatile__("hint @pause")
+#elif defined(__arm__)
+#define ShmYield() __asm__ __volatile__("yield")
+#endif
+#endif
+
+#if !defined(ShmYield)
+#define ShmYield() usleep(0)
+#endif
+
+// Spin iterations before falling back to a futex sleep (adapted at run time)
+#define SHM_SPIN_MIN 64
+#define SHM_SPIN_MAX 65536
+// Upper bound of a single futex sleep, so that a peer which never wakes us
+// (e.g. an ns-3 build without wake-ups) is still polled
+#define SHM_SLEEP_NS 1000000
+// Interval between two checks of pending Python signals (Ctrl+C)
+#define SHM_SIGNAL_NS 100000000
+// The clock is read once every SHM_CLOCK_MASK + 1 spins
+#define SHM_CLOCK_MASK 0x3ff
+
+typedef bool (*ShmCondFunc)(uint8_t value, uint8_t a, uint8_t b);
+
+enum ShmWaitStatus
+{
+    ShmWaitReady = 0,
+    ShmWaitFinish,
+    ShmWaitTimeout
+};
+
+uint32_t gSpinLimit = SHM_SPIN_MAX;
+
+uint8_t *gMemoryPoolPtr;
+CtrlInfoBlock *gCtrlInfo;
+bool gHasInit;
+bool gIsCreator;
+key_t gShmid;
+struct shmid_ds gShmds;
+uint32_t gMemoryPoolSize;
+uint32_t gMemoryKey;
+uint32_t gConfigLen;
+uint32_t gCtrlBlockSize;
+uint16_t gCurrentVersion;
+SharedMemoryCtrl *gCurCtrlInfo;
+
+SharedMemoryCtrl *gMemoryCtrlInfo[MAX_ID];
+SharedMemoryLockable *gMemoryLocker[MAX_ID];
+
+void CtrlInfoLock(void)
+{
+    while (!__sync_bool_compare_and_swap(&gCtrlInfo->ctrlInfoLock, 0x0, 0xffff))
+        ShmYield();
+}
+bool CtrlInfoUnlock(void)
+{
+    return __sync_bool_compare_and_swap(&gCtrlInfo->ctrlInfoLock, 0xffff, 0x0);
+}
+
+static bool CondMod(uint8_t value, uint8_t mod, uint8_t res)
+{
+    return value % mod == res;
+}
+
+static bool CondEqual(uint8_t value, uint8_t tar, uint8_t unused)
+{
+    return value == tar;
+}
+
+// Futexes work on aligned 32-bit words, the byte is watched through the word holding it
+static volatile uint32_t *FutexWord(volatile void *addr)
+{
+    return (volatile uint32_t *)((uintptr_t)addr & ~(uintptr_t)3);
+}
+
+static uint64_t NowNs(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+}
+
+// Wake every process sleeping on the word holding addr
+void ShmWake(volatile void *addr)
+{
+    syscall(SYS_futex, FutexWord(addr), FUTEX_WAKE, INT_MAX, NULL, NULL, 0);
+}
+
+// Wait until cond(*value) holds or *finish is set. Busy-spins unless block is set,
+// in which case it spins for a while and then sleeps on a futex.
+// Gives up after timeoutNs. Must be called without the GIL.
+static enum ShmWaitStatus ShmWait(volatile uint8_t *value, ShmCondFunc cond, uint8_t a, uint8_t b,
+                                  volatile bool *finish, bool block, uint64_t timeoutNs)
+{
+    uint64_t deadline = NowNs() + timeoutNs;
+    uint32_t spin;
+    for (spin = 0; !block || spin < gSpinLimit; ++spin)
+    {
+        if (finish && *finish)
+            return ShmWaitFinish;
+        if (cond(*value, a, b))
+        {
+            // The peer answered while spinning: allow a longer spin next time
+            if (block && gSpinLimit < SHM_SPIN_MAX)
+                gSpinLimit <<= 1;
+            return ShmWaitReady;
+        }
+        if ((spin & SHM_CLOCK_MASK) == SHM_CLOCK_MASK && NowNs() >= deadline)
+            return ShmWaitTimeout;
+        ShmYield();
+    }
+    // The peer is slow: spin less next time
+    if (gSpinLimit > SHM_SPIN_MIN)
+        gSpinLimit >>= 1;
+
+    volatile uint32_t *word = FutexWord(value);
+    while (true)
+    {
+        // Read the word before checking, so that a change in between makes FUTEX_WAIT return at once
+        uint32_t seen = *word;
+        if (finish && *finish)
+            return ShmWaitFinish;
+        if (cond(*value, a, b))
+            return ShmWaitReady;
+        uint64_t now = NowNs();
+        if (now >= deadline)
+            return ShmWaitTimeout;
+        uint64_t sleepNs = deadline - now < SHM_SLEEP_NS ? deadline - now : SHM_SLEEP_NS;
+        struct timespec ts = {0, (long)sleepNs};
+        syscall(SYS_futex, word, FUTEX_WAIT, seen, &ts, NULL, 0);
+    }
+}
+
+// Wait without the GIL, taking it back only between two slices to handle signals.
+// A negative timeout [s] waits forever, a zero timeout polls once.
+// Returns 1 when ready, 0 when finished and -1 on error or timeout (exception set).
+static int ShmWaitInterruptible(volatile uint8_t *value, ShmCondFunc cond, uint8_t a, uint8_t b,
+                                volatile bool *finish, bool block, double timeout)
+{
+    uint64_t deadline = timeout < 0 ? UINT64_MAX : NowNs() + (uint64_t)(timeout * 1e9);
+    enum ShmWaitStatus status;
+    while (true)
+    {
+        // The condition is checked at least once per slice, even after the deadline
+        uint64_t now = NowNs();
+        uint64_t left = deadline > now ? deadline - now : 0;
+        uint64_t slice = left < SHM_SIGNAL_NS ? left : SHM_SIGNAL_NS;
+        Py_BEGIN_ALLOW_THREADS
+        status = ShmWait(value, cond, a, b, finish, block, slice);
+        Py_END_ALLOW_THREADS
+        if (status == ShmWaitReady)
+            return 1;
+        if (status == ShmWaitFinish)
+            return 0;
+        if (NowNs() >= deadline)
+        {
+            PyErr_SetString(PyExc_TimeoutError, "Timeout while waiting for memory");
+            return -1;
+        }
+        if (PyErr_CheckSignals())
+            return -1;
+    }
+}
+
+// Lock the memory once the wait is over
+static void ShmLock(SharedMemoryLockable *info)
+{
+    Py_BEGIN_ALLOW_THREADS
+    while (!__sync_bool_compare_and_swap(&info->nextVersion, info->version, info->version + (uint8_t)1))
+        ShmYield();
+    Py_END_ALLOW_THREADS
+}
+
+static void *GetMemory(uint16_t id, uint32_t size)
+{
+    if (id >= MAX_ID)
+    {
+        PyErr_SetString(PyExc_RuntimeError, "Id out of range");
+        return NULL;
+    }
+    CtrlInfoLock();
+    if (gCtrlInfo->ctrlInfoVersion != gCurrentVersion)
+    {
+        while (gCurCtrlInfo->ctrlInfo == FollowCtrlBlock)
+        {
+            --gCurCtrlInfo;
+            if (gMemoryCtrlInfo[gCurCtrlInfo->id] != 0)
+            {
+                CtrlInfoUnlock();
+                PyErr_Format(PyExc_RuntimeError, "Id %u has been used", gCurCtrlInfo->id);
+                return NULL;
+            }
+            gMemoryCtrlInfo[gCurCtrlInfo->id] = gCurCtrlInfo;
+        }
+        gCurrentVersion = gCtrlInfo->ctrlInfoVersion;
+    }
+    if (gMemoryCtrlInfo[id] != 0)
+    {
+        if (size != gMemoryCtrlInfo[id]->size)
+        {
+            CtrlInfoUnlock();
+            PyErr_Format(PyExc_RuntimeError, "Size of memory error(%u %u)", size, gMemoryCtrlInfo[id]->size);
+            return NULL;
+        }
+        CtrlInfoUnlock();
+        return gMemoryPoolPtr + gMemoryCtrlInfo[id]->offset;
+    };
+
+    if (gCtrlInfo->freeMemOffset + size >= gMemoryPoolSize - gConfigLen - (gCtrlInfo->ctrlInfoVersion + 1) * gCtrlBlockSize)
+    {
+        CtrlInfoUnlock();
+        PyErr_SetString(PyExc_RuntimeError, "Memory pool full");
+        return NULL;
+    }
+    gCurCtrlInfo->ctrlInfo = FollowCtrlBlock;
+    --gCurCtrlInfo;
+    gCurCtrlInfo->ctrlInfo = LastCtrlBlock;
+    gCurCtrlInfo->id = id;
+    gCurCtrlInfo->size = size;
+    gCurCtrlInfo->offset = gCtrlInfo->freeMemOffset;
+    gMemoryCtrlInfo[id] = gCurCtrlInfo;
+
+    ++gCtrlInfo->ctrlInfoVersion;
+    gCurrentVersion = gCtrlInfo->ctrlInfoVersion;
+
+    void *ret = gMemoryPoolPtr + gCtrlInfo->freeMemOffset;
+    gCtrlInfo->freeMemOffset += size;
+    if (!CtrlInfoUnlock())
+    {
+        PyErr_SetString(PyExc_RuntimeError, "Lock status error");
+        return NULL;
+    }
+    return ret;
+}
+
+// void Init(uint32_t key, uint32_t poolSize)
+PyObject *py_init(PyObject *self, PyObject *args)
+{
+    if (gHasInit)
+    {
+        Py_RETURN_NONE;
+    }
+    gHasInit = true;
+    uint32_t key, poolSize;
+    if (!PyArg_ParseTuple(args, "II", &key, &poolSize))
+    {
+        return NULL;
+    }
+    memset(gMemoryCtrlInfo, 0, sizeof(gMemoryCtrlInfo));
+    memset(gMemoryLocker, 0, sizeof(gMemoryLocker));
+    gCtrlBlockSize = sizeof(SharedMemoryCtrl);
+    gConfigLen = sizeof(CtrlInfoBlock);
+
+    gMemoryPoolSize = poolSize;
+    gMemoryKey = key;
+
+    gShmid = shmget(gMemoryKey, gMemoryPoolSize, 0666 | IPC_CREAT);
+    if (gShmid < 0)
+    {
+        switch (errno)
+        {
+        case EACCES:
+            PyErr_SetString(PyExc_RuntimeError, "Permission error");
+            break;
+        case EINVAL:
+            PyErr_SetString(PyExc_ValueError, "Invalid size");
+            break;
+        case ENOMEM:
+            PyErr_SetString(PyExc_MemoryError, "No enough memory to allocate");
+            break;
+        case ENOSPC:
+            PyErr_SetString(PyExc_OSError, "Too many shared memory identifiers");
+            break;
+        default:
+            PyErr_SetString(PyExc_Exception, "Unknow error");
+            break;
+        }
+        return NULL;
+    }
+    gMemoryPoolPtr = (uint8_t *)shmat(gShmid, NULL, 0);
+    if (gMemoryPoolPtr <= 0)
+    {
+        gMemoryPoolPtr = NULL;
+        switch (errno)
+        {
+        case EACCES:
+            PyErr_SetString(PyExc_RuntimeError, "Permission error");
+            break;
+        case ENOMEM:
+            PyErr_SetString(PyExc_MemoryError, "No enough memory");
+            break;
+        case EINVAL:
+            PyErr_SetString(PyExc_ValueError, "Invalid params");
+            break;
+        default:
+            PyErr_SetString(PyExc_Exception, "Unknow error");
+            break;
+        }
+        return NULL;
+    }
+    if (shmctl(gShmid, IPC_STAT, &gShmds) < 0)
+    {
+        switch (errno)
+        {
+        case EIDRM:
+        case EINVAL:
+            PyErr_Format(PyExc_RuntimeError, "No shared memory with id %u", gShmid);
+            break;
+
+        case EACCES:
+            PyErr_SetString(PyExc_RuntimeError, "Permission error");
+            break;
+
+        default:
+            PyErr_SetString(PyExc_Exception, "Unknow error");
+            break;
+        }
+        return NULL;
+    }
+    gIsCreator = getpid() == gShmds.shm_cpid;
+    if (gIsCreator)
+        memset(gMemoryPoolPtr, 0, gMemoryPoolSize);
+    else
+        sleep(1);
+
+    gCtrlInfo = (CtrlInfoBlock *)(gMemoryPoolPtr + gMemoryPoolSize - gConfigLen);
+    gCurCtrlInfo = (SharedMemoryCtrl *)gCtrlInfo;
+    gCurrentVersion = 0;
+    CtrlInfoLock();
+    if (gCtrlInfo->ctrlInfoVersion == gCurrentVersion)
+    {
+        if (!CtrlInfoUnlock())
+        {
+            PyErr_SetString(PyExc_RuntimeError, "Lock status error");
+            return NULL;
+        }
+        Py_RETURN_NONE;
+    }
+    while (gCurCtrlInfo->ctrlInfo == FollowCtrlBlock)
+    {
+        --gCurCtrlInfo;
+        if (gMemoryCtrlInfo[gCurCtrlInfo->id] != 0)
+        {
+            CtrlInfoUnlock();
+            PyErr_Format(PyExc_RuntimeError, "Id %u has been used", gCurCtrlInfo->id);
+            return NULL;
+        }
+        gMemoryCtrlInfo[gCurCtrlInfo->id] = gCurCtrlInfo;
+    }
+    gCurrentVersion = gCtrlInfo->ctrlInfoVersion;
+    if (!CtrlInfoUnlock())
+    {
+        PyErr_SetString(PyExc_RuntimeError, "Lock status error");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+PyObject *py_resetAll(PyObject *self, PyObject *args)
+{
+    CtrlInfoLock();
+    memset(gMemoryPoolPtr, 0, gMemoryPoolSize - gConfigLen);
+    __sync_bool_compare_and_swap(&gCtrlInfo->ctrlInfoLock, 0xffff, 0x0);
+    Py_RETURN_NONE;
+}
+
+PyObject *py_reset(PyObject *self, PyObject *args)
+{
+    CtrlInfoLock();
+    memset(gMemoryPoolPtr, 0, (uint8_t *)gCurCtrlInfo - gMemoryPoolPtr);
+    if (!CtrlInfoUnlock())
+    {
+        PyErr_SetString(PyExc_RuntimeError, "Lock status error");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+// void FreeMemory(void)
+PyObject *py_freeMemory(PyObject *self, PyObject *args)
+{
+    if (!gIsCreator)
+        Py_RETURN_NONE;
+    shmctl(gShmid, IPC_STAT, &gShmds);
+    while (gShmds.shm_nattch != 1)
+        shmctl(gShmid, IPC_STAT, &gShmds);
+    shmctl(gShmid, IPC_RMID, 0);
+    Py_RETURN_NONE;
+}
+
+// void *GetMemory(uint16_t id, uint32_t size)
+PyObject *py_getMemory(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    uint32_t size;
+    if (!PyArg_ParseTuple(args, "HI", &id, &size))
+        return NULL;
+    void *ret = GetMemory(id, size);
+    if (NULL == ret)
+        return NULL;
+    return Py_BuildValue("K", (unsigned long long)ret);
+}
+
+// void *RegisterMemory(uint16_t id, uint32_t size)
+PyObject *py_regMemory(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    uint32_t size;
+    if (!PyArg_ParseTuple(args, "HI", &id, &size))
+        return NULL;
+
+    void *ret = GetMemory(id, size + sizeof(SharedMemoryLockable));
+    if (NULL == ret)
+        return NULL;
+    gMemoryLocker[id] = (SharedMemoryLockable *)ret;
+
+    return Py_BuildValue("K", (unsigned long long)gMemoryLocker[id]->mem);
+}
+
+// void *AcquireMemory(uint16_t id) //Should register first
+PyObject *py_acquireMemory(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    if (!PyArg_ParseTuple(args, "H", &id))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    while (!__sync_bool_compare_and_swap(&info->nextVersion, info->version, info->version + (uint8_t)1))
+        ShmYield();
+    return Py_BuildValue("K", (unsigned long long)info->mem);
+}
+
+// void *AcquireMemoryCond(uint16_t id, uint8_t mod, uint8_t res,
+//                         bool *finish = NULL, int block = 0, double timeout = -1)
+// Wait (without the GIL) until version%mod==res and lock the memory.
+// Returns None without locking if *finish is set, raises TimeoutError after timeout seconds.
+PyObject *py_acquireMemoryCond(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    uint8_t mod;
+    uint8_t res;
+    unsigned long long finish = 0;
+    int block = 0;
+    double timeout = -1;
+    if (!PyArg_ParseTuple(args, "HBB|Kid", &id, &mod, &res, &finish, &block, &timeout))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    int ret = ShmWaitInterruptible(&info->version, CondMod, mod, res, (volatile bool *)finish, block, timeout);
+    if (ret < 0)
+        return NULL;
+    if (ret == 0)
+        Py_RETURN_NONE;
+    ShmLock(info);
+    return Py_BuildValue("K", (unsigned long long)info->mem);
+}
+
+// void *AcquireMemoryTarget(uint16_t id, uint8_t tar,
+//                           bool *finish = NULL, int block = 0, double timeout = -1)
+// Same as AcquireMemoryCond, waiting until version==tar
+PyObject *py_acquireMemoryTarget(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    uint8_t tar;
+    unsigned long long finish = 0;
+    int block = 0;
+    double timeout = -1;
+    if (!PyArg_ParseTuple(args, "HB|Kid", &id, &tar, &finish, &block, &timeout))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    int ret = ShmWaitInterruptible(&info->version, CondEqual, tar, 0, (volatile bool *)finish, block, timeout);
+    if (ret < 0)
+        return NULL;
+    if (ret == 0)
+        Py_RETURN_NONE;
+    ShmLock(info);
+    return Py_BuildValue("K", (unsigned long long)info->mem);
+}
+
+// void *AcquireMemoryCondFunc(uint16_t id, bool (*cond)(uint8_t version))
+PyObject *py_acquireMemoryCondFunc(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    PyObject *cond;
+    if (!PyArg_ParseTuple(args, "HO", &id, &cond))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    while (true)
+    {
+        PyObject *ret = PyObject_CallObject(cond, Py_BuildValue("B", info->version));
+        uint16_t con;
+        if (!PyArg_ParseTuple(ret, "H", &con))
+        {
+            return NULL;
+        }
+        if (con)
+        {
+            break;
+        }
+    }
+
+    while (!__sync_bool_compare_and_swap(&info->nextVersion, info->version, info->version + (uint8_t)1))
+        ShmYield();
+    return Py_BuildValue("K", (unsigned long long)info->mem);
+}
+
+// void ReleaseMemory(uint16_t id) //Should register first
+PyObject *py_releaseMemory(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    if (!PyArg_ParseTuple(args, "H", &id))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    if (!__sync_bool_compare_and_swap(&info->version, info->nextVersion - (uint8_t)1, info->nextVersion))
+    {
+        PyErr_Format(PyExc_RuntimeError, "Lock %u status error", id);
+        return NULL;
+    }
+    ShmWake(&info->version);
+    Py_RETURN_NONE;
+}
+
+// void ReleaseMemoryAndRollback(uint16_t id)
+PyObject *py_releaseMemoryAndRollback(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    if (!PyArg_ParseTuple(args, "H", &id))
+        return NULL;
+
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    if (!__sync_bool_compare_and_swap(&info->nextVersion, info->version + (uint8_t)1, info->version))
+    {
+        PyErr_Format(PyExc_RuntimeError, "Lock %u status error", id);
+        return NULL;
+    }
+    ShmWake(&info->version);
+    Py_RETURN_NONE;
+}
+
+// uint8_t GetMemoryVersion(uint8_t id)
+PyObject *py_getMemoryVersion(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    if (!PyArg_ParseTuple(args, "H", &id))
+    {
+        return NULL;
+    }
+    return Py_BuildValue("B", gMemoryLocker[id]->version);
+}
+
+// void IncMemoryVersion(uint16_t id)
+PyObject *py_incMemoryVersion(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    if (!PyArg_ParseTuple(args, "H", &id))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    while (!__sync_bool_compare_and_swap(&info->nextVersion, info->version, info->version + (uint8_t)1))
+        ShmYield();
+    if (!__sync_bool_compare_and_swap(&info->version, info->nextVersion - (uint8_t)1, info->nextVersion))
+    {
+        PyErr_Format(PyExc_RuntimeError, "Lock %u status error", id);
+        return NULL;
+    }
+    ShmWake(&info->version);
+    Py_RETURN_NONE;
+}
+
+// bool WaitMemoryCond(uint16_t id, uint8_t mod, uint8_t res, bool *finish = NULL)
+// Block until version%mod==res (True) or *finish is set (False)
+PyObject *py_waitMemoryCond(PyObject *self, PyObject *args)
+{
+    uint16_t id;
+    uint8_t mod;
+    uint8_t res;
+    unsigned long long finish = 0;
+    if (!PyArg_ParseTuple(args, "HBB|K", &id, &mod, &res, &finish))
+    {
+        return NULL;
+    }
+    SharedMemoryLockable *info = gMemoryLocker[id];
+    int ret = ShmWaitInterruptible(&info->version, CondMod, mod, res, (volatile bool *)finish, true, -1);
+    if (ret < 0)
+        return NULL;
+    return PyBool_FromLong(ret);
+}
+
+// void WaitMemoryTag(uint8_t *tag, uint8_t value)
+// Block until *tag==value, used by NS3Var
+PyObject *py_waitMemoryTag(PyObject *self, PyObject *args)
+{
+    unsigned long long tag;
+    uint8_t value;
+    if (!PyArg_ParseTuple(args, "KB", &tag, &value))
+    {
+        return NULL;
+    }
+    if (ShmWaitInterruptible((volatile uint8_t *)tag, CondEqual, value, 0, NULL, true, -1) < 0)
+        return NULL;
+    Py_RETURN_NONE;
+}
\ No newline at end of file
@@ -0,0 +1,331 @@
+# -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+# Copyright (c) 2019 Huazhong University of Science and Technology, Dian Group
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 2 as
+# published by the Free Software Foundation;
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Author: Pengyu Liu <eic_lpy@hust.edu.cn>
+#         Hao Yin <haoyin@uw.edu>
+
+import itertools
+import json
+import os
+import subprocess
+import time
+from collections import OrderedDict
+from copy import copy
+
+import psutil
+
+try:
+    from collections.abc import Iterable
+except:
+    pass
+cpu_num = psutil.cpu_count()
+try:
+    devnull = subprocess.DEVNULL
+except:
+    devnull = open(os.devnull, 'w')
+RESERVE_CPU = 4
+
+
+class cder:
+    '''
+    Example:
+        with cder('/path/to/use/'):
+            pass
+    '''
+
+    def __init__(self, path):
+        self.dir = path
+
+    def __enter__(self):
+        self.cwd = os.getcwd()
+        os.chdir(self.dir)
+
+    def __exit__(self, Type, value, traceback):
+        os.chdir(self.cwd)
+
+
+def get_free_cpu(perc=20):
+    return sorted(filter(lambda x: x[1] < perc, zip(range(cpu_num), psutil.cpu_percent(interval=1, percpu=True))), key=lambda x: x[1])
+
+
+def kill_proc_tree(p, timeout=None, on_terminate=None):
+    if isinstance(p, int):
+        p = psutil.Process(p)
+    elif not isinstance(p, psutil.Process):
+        p = psutil.Process(p.pid)
+    ch = [p]+p.children(recursive=True)
+    for c in ch:
+        try:
+            c.kill()
+        except psutil.NoSuchProcess:
+            continue
+    succ, err = psutil.wait_procs(ch, timeout=timeout,
+                                  callback=on_terminate)
+    return (succ, err)
+
+
+def get_settings(setting_map):
+    if not setting_map.keys():
+        return [('', '')], ''
+    key, value = setting_map.popitem()
+    ret, file_name_format = get_settings(setting_map)
+    file_name_format = file_name_format+'_'+key
+    if not isinstance(value, Iterable):
+        value = [value]
+    newret = []
+    for v in value:
+        for precmd, prefn in ret:
+            newret.append((precmd+' --{}={}'.format(key, v),
+                           (prefn+'_{}'.format(v)).strip('_')))
+    return newret, file_name_format.strip('_')
+
+
+def get_setting_maps(setting_map):
+    # same combinations and file names as get_settings, as parameter maps
+    keys = list(setting_map.keys())
+    values = []
+    for value in setting_map.values():
+        if isinstance(value, str) or not isinstance(value, Iterable):
+            value = [value]
+        values.append(list(value))
+    ret = []
+    for combination in itertools.product(*reversed(values)):
+        combination = combination[::-1]
+        ret.append((OrderedDict(zip(keys, combination)),
+                    '_'.join(str(v) for v in combination).strip('_')))
+    return ret
+
+
+def get_setting(setting_map):
+    ret = ''
+    for key, value in setting_map.items():
+        ret += ' --{}={}'.format(key, value)
+    return ret
+
+
+# ns-3 trees already built in this session
+built_paths = set()
+
+
+def build_ns3(path, force=False):
+    path = os.path.abspath(path)
+    if path in built_paths and not force:
+        return True
+    print('build')
+    proc = subprocess.Popen('./waf build', shell=True, stdout=subprocess.PIPE,
+                            stderr=devnull, universal_newlines=True, cwd=path)
+    proc.wait()
+    ok = False
+    for line in proc.stdout:
+        if "'build' finished successfully" in line:
+            ok = True
+            break
+    if ok:
+        built_paths.add(path)
+    return ok
+
+
+def run_single_ns3(path, pname, setting=None, env=None, show_output=False, build=True):
+    if build and not build_ns3(path):
+        return None
+    if env:
+        env.update(os.environ)
+    env['LD_LIBRARY_PATH'] = os.path.abspath(os.path.join(path, 'build', 'lib'))
+    # exec: the process is the script itself, not a shell (nothing is orphaned when it is killed)
+    if not setting:
+        cmd = 'exec ./{}'.format(pname)
+    else:
+        cmd = 'exec ./{}{}'.format(pname, get_setting(setting))
+    _, exec_path = ns3_program(path, pname)
+    if show_output:
+        proc = subprocess.Popen(
+            cmd, shell=True, universal_newlines=True, cwd=exec_path, env=env)
+    else:
+        proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
+                                stderr=devnull, universal_newlines=True, cwd=exec_path, env=env)
+    return proc
+
+
+def ns3_program(path, pname):
+    # return the built executable of the program and its working directory
+    exec_path = os.path.join(path, 'build', 'scratch')
+    if os.path.isdir(os.path.join(exec_path, pname)):
+        exec_path = os.path.join(exec_path, pname)
+    return os.path.join(exec_path, pname), exec_path
+
+
+class JobScheduler:
+    '''
+    Run a queue of ns-3 jobs on a bounded pool of processes, each one pinned
+    to its own core. Every job runs the built program directly (no waf), writes
+    its output in a file and is retried up to `retries` times if it fails.
+    Jobs run from the ns-3 root, as with `./waf --run`, so relative paths in
+    the arguments and in the scripts do not move.
+    The status of the jobs is saved in `state_file` after every change, so an
+    interrupted run can be resumed: the finished jobs are skipped, while the
+    failed ones are run again (with `retries` new attempts).
+
+    Example:
+        sched = JobScheduler('../../', 'ran-ai', state_file='jobs.json')
+        sched.add('run1', {'RngRun': 1})
+        sched.add('run2', {'RngRun': 2})
+        stats = sched.run()
+    '''
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, path, pname, cpus=None, reserve=RESERVE_CPU, retries=1,
+                 state_file=None, log_dir='.', poll_interval=0.1):
+        self.path = os.path.abspath(path)
+        self.pname = pname
+        if cpus is None:
+            cpus = sorted(os.sched_getaffinity(0))
+        self.cpus = list(cpus)[:max(1, len(cpus) - reserve)]
+        self.retries = retries
+        self.state_file = state_file
+        self.log_dir = log_dir
+        self.poll_interval = poll_interval
+        self.jobs = OrderedDict()
+        if state_file and os.path.isfile(state_file):
+            with open(state_file) as f:
+                self.jobs.update(json.load(f, object_pairs_hook=OrderedDict))
+            for job in self.jobs.values():
+                # jobs interrupted while running start over
+                if job['status'] == self.RUNNING:
+                    job['status'] = self.PENDING
+                # failed jobs are retried on resume
+                elif job['status'] == self.FAILED:
+                    job['status'] = self.PENDING
+                    job['attempts'] = 0
+
+    # add a job (ignored if the same job is already known, e.g. on resume)
+    # \param[in] name : job name, also the name of its output file
+    # \param[in] setting : ns3 script input parameters
+    # \return : whether the job was added
+    def add(self, name, setting=None):
+        args = ['--{}={}'.format(key, value) for key, value in (setting or {}).items()]
+        if name in self.jobs:
+            if self.jobs[name]['args'] != args:
+                raise ValueError('Job {} already exists with different arguments'.format(name))
+            return False
+        self.jobs[name] = {'args': args,
+                           'status': self.PENDING, 'attempts': 0,
+                           'returncode': None, 'duration': None}
+        return True
+
+    def save(self):
+        if not self.state_file:
+            return
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.jobs, f, indent=1)
+        os.replace(tmp, self.state_file)
+
+    def launch(self, name, cpu, program, env):
+        job = self.jobs[name]
+        job['status'] = self.RUNNING
+        job['attempts'] += 1
+        with open(os.path.join(self.log_dir, name), 'w') as out:
+            proc = subprocess.Popen([program] + job['args'], stdout=out, stderr=subprocess.STDOUT,
+                                    cwd=self.path, env=env, preexec_fn=lambda: os.sched_setaffinity(0, {cpu}))
+        return proc
+
+    # run all the pending jobs and wait for them
+    # \param[in] build : whether to build ns-3 first(default : True)
+    # \return : throughput statistics of the run
+    def run(self, build=True):
+        if build and not build_ns3(self.path):
+            raise RuntimeError('ns-3 build failed')
+        program, _ = ns3_program(self.path, self.pname)
+        env = dict(os.environ)
+        env['LD_LIBRARY_PATH'] = os.path.join(self.path, 'build', 'lib')
+        queue = [name for name, job in self.jobs.items() if job['status'] == self.PENDING]
+        free = list(self.cpus)
+        running = {}    # proc -> (name, cpu, start time)
+        stats = {'done': 0, 'failed': 0, 'retried': 0}
+        start = time.time()
+        busy = 0.0
+        changed = False     # saved when a job is launched or finishes, and on exit
+        try:
+            while queue or running:
+                while queue and free:
+                    name = queue.pop(0)
+                    cpu = free.pop(0)
+                    running[self.launch(name, cpu, program, env)] = (name, cpu, time.time())
+                    changed = True
+                if changed:
+                    self.save()
+                    changed = False
+                time.sleep(self.poll_interval)
+                for proc in [proc for proc in running if proc.poll() is not None]:
+                    name, cpu, job_start = running.pop(proc)
+                    free.append(cpu)
+                    job = self.jobs[name]
+                    job['returncode'] = proc.returncode
+                    job['duration'] = time.time() - job_start
+                    busy += job['duration']
+                    if proc.returncode == 0:
+                        job['status'] = self.DONE
+                        stats['done'] += 1
+                    elif job['attempts'] <= self.retries:
+                        job['status'] = self.PENDING
+                        queue.append(name)
+                        stats['retried'] += 1
+                    else:
+                        job['status'] = self.FAILED
+                        stats['failed'] += 1
+                    changed = True
+        finally:
+            # interrupted: the running jobs will be run again on resume
+            for proc, (name, _, _) in running.items():
+                kill_proc_tree(proc)
+                self.jobs[name]['status'] = self.PENDING
+                self.jobs[name]['attempts'] -= 1
+            self.save()
+        elapsed = time.time() - start
+        stats['elapsed'] = elapsed
+        stats['jobs_per_hour'] = stats['done'] * 3600 / elapsed if elapsed > 0 else 0
+        stats['cpu_utilization'] = busy / (elapsed * len(self.cpus)) if elapsed > 0 else 0
+        return stats
+
+
+def run_bulk_ns3(path, pname, commons, settings, debug=False, **kwargs):
+    sched = JobScheduler(path, pname, **kwargs)
+    names = set()
+    for smap in settings:
+        for smap_setting, fn in get_setting_maps(smap):
+            setting = OrderedDict(commons)
+            setting.update(smap_setting)
+            # the same file name can come from several settings: number the repetitions
+            name, repetition = fn or pname, 1
+            while name in names:
+                repetition += 1
+                name = '{}_{}'.format(fn or pname, repetition)
+            names.add(name)
+            sched.add(name, setting)
+    stats = sched.run()
+    if debug:
+        print('done {done}, failed {failed}, retried {retried}, {jobs_per_hour:.1f} jobs/hour, '
+              'CPU utilization {cpu_utilization:.0%}'.format(**stats))
+    return stats
+
+
+__all__ = ['cpu_num', 'cder', 'get_free_cpu', 'kill_proc_tree',
+           'get_settings', 'get_setting_maps', 'get_setting', 'build_ns3', 'run_single_ns3',
+           'ns3_program', 'JobScheduler', 'run_bulk_ns3']
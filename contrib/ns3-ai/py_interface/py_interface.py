@@ -0,0 +1,471 @@
+# -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+# Copyright (c) 2019 Huazhong University of Science and Technology, Dian Group
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 2 as
+# published by the Free Software Foundation;
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Author: Pengyu Liu <eic_lpy@hust.edu.cn>
+
+from collections import deque
+from ctypes import *
+from typing import Optional
+
+import shm_pool
+from ns3_util import *
+from shm_pool import (AcquireMemory, AcquireMemoryCond, AcquireMemoryCondFunc,
+                      AcquireMemoryTarget, FreeMemory, GetMemory,
+                      GetMemoryVersion, IncMemoryVersion, Init, RegisterMemory,
+                      ReleaseMemory, ReleaseMemoryRB, Reset, ResetAll,
+                      WaitMemoryCond, WaitMemoryTag)
+
+READABLE = 0xff
+SETABLE = 0
+
+# Wait modes used while waiting for ns-3
+SPIN_WAIT = 0   # busy-spin in C without the GIL, in Python for NS3Var (lowest latency, burns a core)
+BLOCK_WAIT = 1  # adaptive spin then futex sleep in C (woken by ns-3)
+
+
+class NS3Var:
+    def __init__(self, uid, structType, waitMode=SPIN_WAIT):
+        class sType(Structure):
+            _pack_ = 1
+            _fields_ = [
+                ('tagWt', c_ubyte),
+                ('tagRd', c_ubyte),
+                ('data', structType),
+            ]
+        self.m_id = uid
+        self.m_dataType = sType
+        self.m_addr = GetMemory(self.m_id, sizeof(self.m_dataType))
+        self.m_obj = self.m_dataType.from_address(self.m_addr)
+        self.waitMode = waitMode
+
+    def SetWaitMode(self, waitMode):
+        self.waitMode = waitMode
+
+    def Set(self, data):
+        if self.waitMode == BLOCK_WAIT:
+            WaitMemoryTag(self.m_addr + self.m_dataType.tagWt.offset, SETABLE)
+        while self.m_obj.tagWt != SETABLE:
+            pass
+        self.m_obj.data = data
+        self.m_obj.tagWt = READABLE
+
+    def Get(self):
+        if self.waitMode == BLOCK_WAIT:
+            WaitMemoryTag(self.m_addr + self.m_dataType.tagRd.offset, READABLE)
+        while self.m_obj.tagRd != READABLE:
+            pass
+        ret = self.m_obj.data
+        self.m_obj.tagRd = SETABLE
+        return ret
+
+    def GetObj(self):
+        return self.m_obj
+
+
+class NS3BigVar:
+    def __init__(self, uid, structType, waitMode=SPIN_WAIT):
+        assert issubclass(structType, Structure)
+        self.m_id = uid
+        self.m_dataType = structType
+        self.m_obj = self.m_dataType.from_address(
+            RegisterMemory(self.m_id, sizeof(self.m_dataType)))
+        self.mod = 2
+        self.res = 1
+        self.waitMode = waitMode
+
+    def GetVersion(self):
+        return int(GetMemoryVersion(self.m_id))
+
+    def SetCond(self, mod, res):
+        self.mod = mod
+        self.res = res
+
+    def SetWaitMode(self, waitMode):
+        self.waitMode = waitMode
+
+    def __enter__(self):
+        # print('enter')
+        AcquireMemoryCond(self.m_id, self.mod, self.res, 0, self.waitMode)
+        return self.m_obj
+
+    def __exit__(self, Type, value, traceback):
+        # print('exit')
+        ReleaseMemory(self.m_id)
+
+
+# Zero-copy numpy view over a ctypes structure in the shared memory.
+# Returns the given field, the only field of the structure if there is just one,
+# or the whole structure as a 0-d structured array.
+def _ndarray_view(cObj, field=None):
+    import numpy as np   # only needed by the array accessors
+    view = np.frombuffer(cObj, dtype=np.dtype(type(cObj))).reshape(())
+    if field is None and len(cObj._fields_) == 1:
+        field = cObj._fields_[0][0]
+    if field is None:
+        return view
+    return view[field]
+
+
+class EmptyInfo(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('unused', c_uint8)
+    ]
+
+# This class established an environment for ns3 and python
+# to exchange data with the share memory
+# to implement Reinforcement Learning algorithm with python.
+class Ns3AIRL:
+    # init data field for RL
+    # \param[in] uid : the share mempool's id
+    # \param[in] EnvType : the type of RL environment
+    # \param[in] ActType : the type of RL action
+    # \param[in] ExtInfo : extra information(default : EmptyInfo)
+    # \param[in] waitMode : SPIN_WAIT or BLOCK_WAIT(default : SPIN_WAIT)
+    def __init__(self, uid, EnvType, ActType, ExtInfo=EmptyInfo, waitMode=SPIN_WAIT):
+        assert issubclass(EnvType, Structure)
+        assert issubclass(ActType, Structure)
+        assert issubclass(ExtInfo, Structure)
+
+        self.m_id = uid
+        self.envType = EnvType
+        self.actType = ActType
+        self.extInfo = ExtInfo
+        self.finished = False
+
+        # the main field for RL
+        class StorageType(Structure):
+            _pack_ = 1
+            _fields_ = [
+                ('env', self.envType),
+                ('act', self.actType),
+                ('ext', self.extInfo),
+                ('isFinish', c_bool)
+            ]
+        self.type = StorageType
+        self.m_obj = self.type.from_address(
+            RegisterMemory(self.m_id, sizeof(self.type)))   # allocate from shared memory to create object
+        self.mod = 2
+        self.res = 1
+        self.waitMode = waitMode
+        self.timeout = None
+        self.finishAddr = addressof(self.m_obj) + self.type.isFinish.offset
+
+    # get memory version (even for ns-3 and odd for python)
+    def GetVersion(self):
+        return int(GetMemoryVersion(self.m_id))
+
+    def isFinish(self):
+        return self.m_obj.isFinish
+
+    # numpy views over the env and the action (no copy, valid for the whole episode)
+    # e.g. Env with ('imsiStatsMap', (c_double * 28) * 50) gives a (50, 28) float64 array
+    # \param[in] field : name of the field(default : the only field, or the whole structure)
+    def env_array(self, field=None):
+        return _ndarray_view(self.m_obj.env, field)
+
+    def act_array(self, field=None):
+        return _ndarray_view(self.m_obj.act, field)
+
+    # set the operation lock (res: even for ns-3 and odd for python)
+    def SetCond(self, mod, res):
+        self.mod = mod
+        self.res = res
+
+    # set how to wait for ns-3 (SPIN_WAIT or BLOCK_WAIT)
+    def SetWaitMode(self, waitMode):
+        self.waitMode = waitMode
+
+    # set the timeout used by the with statement (None : wait forever)
+    def SetTimeout(self, timeout):
+        self.timeout = timeout
+
+    # acquire ns-3's data in the memory
+    # the wait runs in C without the GIL, other Python threads keep running
+    # \param[in] timeout : seconds before raising TimeoutError(default : None, wait forever)
+    def Acquire(self, timeout=None):
+        if timeout is None:
+            timeout = -1
+        if AcquireMemoryCond(self.m_id, self.mod, self.res,
+                             self.finishAddr, self.waitMode, timeout) is None:
+            self.finished = True
+            return None
+        return self.m_obj
+
+    def Release(self):
+        ReleaseMemory(self.m_id)
+
+    def ReleaseAndRollback(self):
+        ReleaseMemoryRB(self.m_id)
+
+    def __enter__(self):  # ensure Ctrl+C can interrupt the function
+        return self.Acquire(self.timeout)
+
+    def __exit__(self, Type, value, traceback):
+        if self.finished:
+            return
+        self.Release()
+
+# This class established an environment for ns3 and python
+# to exchange data with the share memory
+# to implement Deep Learning algorithm with python.
+class Ns3AIDL:
+    def __init__(self, uid, FeatureType, PredictedType, TargetType, ExtInfo=EmptyInfo, waitMode=SPIN_WAIT):
+        assert issubclass(FeatureType, Structure)
+        assert issubclass(PredictedType, Structure)
+        assert issubclass(TargetType, Structure)
+        assert issubclass(ExtInfo, Structure)
+
+        self.m_id = uid
+        self.featureType = FeatureType
+        self.predictedType = PredictedType
+        self.targetType = TargetType
+        self.extInfo = ExtInfo
+        self.finished = False
+
+        class StorageType(Structure):
+            _pack_ = 1
+            _fields_ = [
+                ('feat', self.featureType),
+                ('pred', self.predictedType),
+                ('tar', self.targetType),
+                ('ext', self.extInfo),
+                ('isFinish', c_bool)
+            ]
+        self.type = StorageType
+        self.m_obj = self.type.from_address(
+            RegisterMemory(self.m_id, sizeof(self.type)))   # allocate from shared memory to create object
+        self.mod = 2
+        self.res = 1
+        self.waitMode = waitMode
+        self.timeout = None
+        self.finishAddr = addressof(self.m_obj) + self.type.isFinish.offset
+
+    # get memory version (even for ns-3 and odd for python)
+    def GetVersion(self):
+        return int(GetMemoryVersion(self.m_id))
+
+    def isFinish(self):
+        return self.m_obj.isFinish
+
+    # numpy views over the feature, the prediction and the target (no copy)
+    # \param[in] field : name of the field(default : the only field, or the whole structure)
+    def feat_array(self, field=None):
+        return _ndarray_view(self.m_obj.feat, field)
+
+    def pred_array(self, field=None):
+        return _ndarray_view(self.m_obj.pred, field)
+
+    def tar_array(self, field=None):
+        return _ndarray_view(self.m_obj.tar, field)
+
+    # set the operation lock (res: even for ns-3 and odd for python)
+    def SetCond(self, mod, res):
+        self.mod = mod
+        self.res = res
+
+    # set how to wait for ns-3 (SPIN_WAIT or BLOCK_WAIT)
+    def SetWaitMode(self, waitMode):
+        self.waitMode = waitMode
+
+    # set the timeout used by the with statement (None : wait forever)
+    def SetTimeout(self, timeout):
+        self.timeout = timeout
+
+    # acquire ns-3's data in the memory
+    # the wait runs in C without the GIL, other Python threads keep running
+    # \param[in] timeout : seconds before raising TimeoutError(default : None, wait forever)
+    def Acquire(self, timeout=None):
+        if timeout is None:
+            timeout = -1
+        if AcquireMemoryCond(self.m_id, self.mod, self.res,
+                             self.finishAddr, self.waitMode, timeout) is None:
+            self.finished = True
+            return None
+        return self.m_obj
+
+    def Release(self):
+        ReleaseMemory(self.m_id)
+
+    def ReleaseAndRollback(self):
+        ReleaseMemoryRB(self.m_id)
+
+    def __enter__(self):  # ensure Ctrl+C can interrupt the function
+        return self.Acquire(self.timeout)
+
+    def __exit__(self, Type, value, traceback):
+        if self.finished:
+            return
+        self.Release()
+
+# This class set up the ns-3 environment and built the shared memory pool.
+class Experiment:
+    _created = False
+
+    # init ns-3 environment
+    # \param[in] shmKey : share memory key
+    # \param[in] memSize : share memory size
+    # \param[in] programName : program name of ns3
+    # \param[in] path : current working directory
+    def __init__(self, shmKey, memSize, programName, path):
+        if self._created:
+            raise Exception('Experiment is singleton')
+        self._created = True
+        self.shmKey = shmKey
+        self.memSize = memSize
+        self.programName = programName
+        self.path = path
+        self.proc = None
+        self.dirty = True
+        Init(shmKey, memSize)
+
+    def __del__(self):
+        print('cleaning')
+        self.kill()
+        FreeMemory()
+
+    # run ns3 script in cmd with the setting being input
+    # \param[in] setting : ns3 script input parameters(default : None)
+    # \param[in] show_output : whether to show output or not(default : False)
+    def run(self, setting=None, show_output=False):
+        self.kill()
+        env = {'NS_GLOBAL_VALUE': 'SharedMemoryKey={};SharedMemoryPoolSize={};'.format(
+            self.shmKey, self.memSize)}
+        self.proc = run_single_ns3(
+            self.path, self.programName, setting, env=env, show_output=show_output, build=self.dirty)
+        self.dirty = False
+        return self.proc
+
+    def kill(self):
+        if self.proc and self.isalive():
+            kill_proc_tree(self.proc)
+            self.proc = None
+
+    def reset(self):
+        self.kill()
+        Reset()
+
+    def isalive(self):
+        return self.proc.poll() == None
+
+
+# Run several ns3 scripts at once, sharing the memory pool of the Experiment.
+# Each script must register its own memory block ids and the pool must be
+# large enough for all of them (e.g. memSize times the number of scripts).
+class VecExperiment(Experiment):
+    def __init__(self, shmKey, memSize, programName, path):
+        super(VecExperiment, self).__init__(shmKey, memSize, programName, path)
+        self.procs = []
+
+    # run one ns3 script per setting (the program is built at most once)
+    # \param[in] settings : list of ns3 script input parameters
+    # \param[in] show_output : whether to show output or not(default : False)
+    def run(self, settings, show_output=False):
+        self.kill()
+        for setting in settings:
+            env = {'NS_GLOBAL_VALUE': 'SharedMemoryKey={};SharedMemoryPoolSize={};'.format(
+                self.shmKey, self.memSize)}
+            proc = run_single_ns3(self.path, self.programName, setting, env=env,
+                                  show_output=show_output, build=self.dirty)
+            self.dirty = False
+            if proc is None:
+                self.kill()
+                return None
+            self.procs.append(proc)
+        return self.procs
+
+    def kill(self):
+        for proc in self.procs:
+            if proc.poll() == None:
+                kill_proc_tree(proc)
+        self.procs = []
+
+    def isalive(self):
+        return any(proc.poll() == None for proc in self.procs)
+
+
+# Keep poolSize ns3 scripts launched ahead of time: each one loads its libraries
+# and sleeps on its own parameter block (ids paramKey, paramKey + 1, ...) until
+# run() hands it the parameters of an episode, so that the process spawn and the
+# loading of ns-3 overlap with the previous episode.
+# The script must read the parameters (ParamType) from the block given by --paramBlockKey.
+class WarmExperiment(Experiment):
+    def __init__(self, shmKey, memSize, programName, path, ParamType, paramKey, poolSize=1):
+        assert issubclass(ParamType, Structure)
+        super(WarmExperiment, self).__init__(shmKey, memSize, programName, path)
+        self.paramType = ParamType
+        self.paramKey = paramKey
+        self.poolSize = poolSize
+        self.setting = None
+        self.showOutput = False
+        self.slot = None    # parameter block of the running script
+        self.warm = deque()     # (proc, slot) of the scripts waiting for their parameters
+        self.params = [self.paramType.from_address(RegisterMemory(paramKey + slot, sizeof(ParamType)))
+                       for slot in range(poolSize + 1)]
+
+    def __del__(self):
+        self.killWarm()
+        super(WarmExperiment, self).__del__()
+
+    # launch the missing scripts of the pool
+    def fill(self):
+        while len(self.warm) < self.poolSize:
+            used = [slot for _, slot in self.warm] + [self.slot]
+            slot = next(slot for slot in range(self.poolSize + 1) if slot not in used)
+            setting = dict(self.setting or {})
+            setting['paramBlockKey'] = self.paramKey + slot
+            env = {'NS_GLOBAL_VALUE': 'SharedMemoryKey={};SharedMemoryPoolSize={};'.format(
+                self.shmKey, self.memSize)}
+            proc = run_single_ns3(self.path, self.programName, setting, env=env,
+                                  show_output=self.showOutput, build=self.dirty)
+            self.dirty = False
+            if proc is None:
+                return False
+            self.warm.append((proc, slot))
+        return True
+
+    # start an episode on a warm script (the pool is refilled right after)
+    # \param[in] setting : ns3 script input parameters, the same for all the episodes(default : None)
+    # \param[in] show_output : whether to show output or not(default : False)
+    # \param[in] params : dict with the fields of ParamType for this episode(default : None)
+    def run(self, setting=None, show_output=False, params=None):
+        self.kill()
+        if setting != self.setting or show_output != self.showOutput:
+            self.killWarm()
+            self.setting = dict(setting) if setting else None
+            self.showOutput = show_output
+        if not self.fill():
+            return None
+        self.proc, self.slot = self.warm.popleft()
+        paramId = self.paramKey + self.slot
+        AcquireMemoryCond(paramId, 2, 0)
+        for key, value in (params or {}).items():
+            setattr(self.params[self.slot], key, value)
+        ReleaseMemory(paramId)
+        self.fill()
+        return self.proc
+
+    def killWarm(self):
+        for proc, _ in self.warm:
+            if proc.poll() == None:
+                kill_proc_tree(proc)
+        self.warm.clear()
+
+
+__all__ = ['Init', 'FreeMemory', 'ResetAll', 'Reset', 'GetMemory', 'RegisterMemory',
+           'AcquireMemory', 'AcquireMemoryCond', 'AcquireMemoryTarget', 'AcquireMemoryCondFunc',
+           'ReleaseMemory', 'ReleaseMemoryRB', 'GetMemoryVersion', 'IncMemoryVersion', 'WaitMemoryCond', 'WaitMemoryTag',
+           'SPIN_WAIT', 'BLOCK_WAIT', 'NS3Var', 'NS3BigVar', 'Ns3AIRL', 'Ns3AIDL', 'Experiment', 'VecExperiment', 'WarmExperiment']
@@ -0,0 +1,58 @@
+# -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 2 as
+# published by the Free Software Foundation;
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Tests of the waits of the shm_pool extension (build it first: python3 setup.py build_ext --inplace)
+#
+# Usage: python3 -m pytest test_shm_pool.py
+
+import os
+
+import pytest
+
+shm_pool = pytest.importorskip('shm_pool')
+
+POOL_SIZE = 4096
+BLOCK_ID = 2333
+BLOCK_SIZE = 8
+SPIN_WAIT = 0
+BLOCK_WAIT = 1
+
+
+@pytest.fixture(scope='module')
+def block():
+    shm_pool.Init(4321 + os.getpid() % 1000, POOL_SIZE)
+    shm_pool.RegisterMemory(BLOCK_ID, BLOCK_SIZE)
+    yield BLOCK_ID
+    shm_pool.FreeMemory()
+
+
+@pytest.mark.parametrize('wait_mode', [SPIN_WAIT, BLOCK_WAIT])
+@pytest.mark.parametrize('timeout', [0, 1e-9])
+def test_ready_block_is_acquired_after_the_deadline(block, wait_mode, timeout):
+    # A zero (or already expired) timeout polls the block once instead of failing at once
+    version = shm_pool.GetMemoryVersion(block)
+    assert shm_pool.AcquireMemoryCond(block, 2, version % 2, 0, wait_mode, timeout) is not None
+    shm_pool.ReleaseMemory(block)
+    assert shm_pool.AcquireMemoryTarget(block, (version + 1) % 256, 0, wait_mode, timeout) is not None
+    shm_pool.ReleaseMemory(block)
+
+
+@pytest.mark.parametrize('wait_mode', [SPIN_WAIT, BLOCK_WAIT])
+@pytest.mark.parametrize('timeout', [0, 0.01])
+def test_busy_block_times_out(block, wait_mode, timeout):
+    version = shm_pool.GetMemoryVersion(block)
+    with pytest.raises(TimeoutError):
+        shm_pool.AcquireMemoryCond(block, 2, (version + 1) % 2, 0, wait_mode, timeout)
+    assert shm_pool.GetMemoryVersion(block) == version
@@ -0,0 +1,103 @@
+# -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 2 as
+# published by the Free Software Foundation;
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Compare the wait modes of Ns3AIRL.Acquire.
+# A second Python process plays the ns-3 side: it acquires the even versions,
+# "simulates" for a while and hands the block back, exactly like Ns3AIRL in ns-3.
+# For every mode the agent side reports the round-trip latency (time between
+# the release of the peer and the return of Acquire) and its own CPU time.
+#
+# Usage: python3 wait_benchmark.py [--steps 500] [--work 2]
+
+import argparse
+import subprocess
+import sys
+import time
+from ctypes import *
+
+from py_interface import *
+
+KEY = 4321
+POOL_SIZE = 4096
+BLOCK_ID = 2333
+
+
+class Env(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('sentTime', c_double)
+    ]
+
+
+class Act(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('step', c_int)
+    ]
+
+
+def run_peer(steps, work):
+    Init(KEY, POOL_SIZE)
+    rl = Ns3AIRL(BLOCK_ID, Env, Act)
+    rl.SetCond(2, 0)
+    for step in range(steps):
+        with rl as data:
+            end = time.monotonic() + work / 1000
+            while time.monotonic() < end:   # ns-3 is busy simulating the next step
+                pass
+            data.env.sentTime = time.monotonic()
+
+
+def run_agent(steps, work, waitMode):
+    Reset()
+    peer = subprocess.Popen([sys.executable, __file__, '--peer',
+                             '--steps', str(steps), '--work', str(work)])
+    rl = Ns3AIRL(BLOCK_ID, Env, Act, waitMode=waitMode)
+    latencies = []
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    for step in range(steps):
+        with rl as data:
+            latencies.append(time.monotonic() - data.env.sentTime)
+            data.act.step = step
+    cpu, wall = time.process_time() - cpu_start, time.monotonic() - wall_start
+    peer.wait()
+    latencies.sort()
+    return {'mean': sum(latencies) / steps * 1e6,
+            'p50': latencies[steps // 2] * 1e6,
+            'p99': latencies[int(steps * 0.99)] * 1e6,
+            'cpu': cpu / steps * 1e3,
+            'load': cpu / wall * 100}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--work', type=float, default=2, help='ns-3 time per step [ms]')
+    parser.add_argument('--peer', action='store_true')
+    args = parser.parse_args()
+
+    if args.peer:
+        run_peer(args.steps, args.work)
+        sys.exit(0)
+
+    Init(KEY, POOL_SIZE)
+    print('steps={} ns-3 work per step={} ms'.format(args.steps, args.work))
+    print('{:<8}{:>12}{:>12}{:>12}{:>16}{:>10}'.format(
+        'mode', 'mean [us]', 'p50 [us]', 'p99 [us]', 'cpu/step [ms]', 'cpu [%]'))
+    for name, mode in [('spin', SPIN_WAIT), ('block', BLOCK_WAIT)]:
+        r = run_agent(args.steps, args.work, mode)
+        print('{:<8}{:>12.1f}{:>12.1f}{:>12.1f}{:>16.3f}{:>10.1f}'.format(
+            name, r['mean'], r['p50'], r['p99'], r['cpu'], r['load']))
+    FreeMemory()
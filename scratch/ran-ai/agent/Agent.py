@@ -3,8 +3,10 @@ import copy
 import numpy as np
 from torch.nn import Module
 from agent.DoubleQLearning import DQL
+from agent.AsyncLearner import AsyncLearner
 from agent.NeuralNetwork import LinearNeuralNetwork
-from plot.Linearplot import linear_plot, multi_linear_plot
+from plot.PlotEngine import PlotEngine
+from utils.TrainingLog import TrainingLog, load_training_log
 import seaborn as sns
 
 
@@ -32,6 +34,13 @@ class CentralizedAgent(object):
                  learning_rate: float,
                  eps: float,
                  weight_decay: float,
+                 prioritized_replay: bool = False,
+                 async_learning: bool = False,
+                 update_ratio: float = 1.0,
+                 sync_interval: int = 100,
+                 plot_workers: int = 1,
+                 plot_decimation: str = 'mean',
+                 plot_point_num: int = 100,
                  format=None):
 
         # Number of steps and episodes
@@ -39,6 +48,11 @@ class CentralizedAgent(object):
         self.format = format
         self.step_num, self.episode_num = step_num, episode_num
 
+        # Plot engine rendering the figures of plot_data (created first, so that its processes are forked
+        # before the networks and the learner thread start any thread)
+
+        self.plots = PlotEngine(plot_workers, plot_decimation, plot_point_num)
+
         # State dimension
 
         self.state_dim: int = state_dim
@@ -82,7 +96,21 @@ class CentralizedAgent(object):
                        gamma,
                        batch_size,
                        target_replace,
-                       memory_capacity)
+                       memory_capacity,
+                       self.learning_state_dim,
+                       prioritized=prioritized_replay)
+
+        # Asynchronous learning: the learning steps run in a background thread,
+        # while the actions are chosen by an actor network periodically synced with the primary network
+
+        if async_learning:
+            self.actor_net: Module = LinearNeuralNetwork(self.learning_state_dim, self.action_num)
+            self.actor_net.load_state_dict(self.primary_net.state_dict())
+            self.learner = AsyncLearner(self.dql, self.actor_net, update_ratio, sync_interval)
+            self.learner.start()
+        else:
+            self.actor_net: Module = self.primary_net
+            self.learner = None
 
         # Initialize learning transition (state, action, reward, new_state)
 
@@ -94,17 +122,52 @@ class CentralizedAgent(object):
 
         self.data_idx = -1
 
-        # Learning data
+        # Learning data, logged step by step: once the log is opened in a data folder (see open_data),
+        # only the steps of the last episode are kept in memory
+
+        self.log = TrainingLog({'states': (self.user_num, self.state_dim),
+                                'actions': (self.user_num, self.action_num),
+                                'q_values': (self.user_num, self.action_num),
+                                'chamfer_distances': (self.user_num,),
+                                'qos': (self.user_num,),
+                                'rewards': (self.user_num,),
+                                'temperatures': (),
+                                'losses': ()},
+                               step_num)
+
+    # Learning data as (user, ..., step) arrays
+
+    @property
+    def state_data(self):
+        return np.moveaxis(self.log.read('states'), 0, -1)
+
+    @property
+    def action_data(self):
+        return np.moveaxis(self.log.read('actions'), 0, -1)
 
-        self.state_data = np.zeros((self.user_num, self.state_dim, step_num * episode_num), dtype=np.float32)
-        self.action_data = np.zeros((self.user_num, self.action_num, step_num * episode_num), dtype=np.float32)
-        self.q_value_data = np.zeros((self.user_num, self.action_num, step_num * episode_num), dtype=np.float32)
+    @property
+    def q_value_data(self):
+        return np.moveaxis(self.log.read('q_values'), 0, -1)
 
-        self.chamfer_data = np.zeros((self.user_num, step_num * episode_num), dtype=np.float32)
-        self.qos_data = np.zeros((self.user_num, step_num * episode_num), dtype=np.float32)
-        self.reward_data = np.zeros((self.user_num, step_num * episode_num), dtype=np.float32)
-        self.temperature_data = np.zeros(step_num * episode_num, dtype=np.float32)
-        self.loss_data = np.zeros(step_num * episode_num, dtype=np.float32)
+    @property
+    def chamfer_data(self):
+        return np.moveaxis(self.log.read('chamfer_distances'), 0, -1)
+
+    @property
+    def qos_data(self):
+        return np.moveaxis(self.log.read('qos'), 0, -1)
+
+    @property
+    def reward_data(self):
+        return np.moveaxis(self.log.read('rewards'), 0, -1)
+
+    @property
+    def temperature_data(self):
+        return self.log.read('temperatures')
+
+    @property
+    def loss_data(self):
+        return self.log.read('losses')
 
     def reset(self):
 
@@ -114,36 +177,45 @@ class CentralizedAgent(object):
         self.old_states = [None] * self.user_num
         self.old_actions = [None] * self.user_num
 
+    def get_q_values(self, states: [np.ndarray]):
+
+        """
+        Estimate the q values of a batch of states (one per row) with a single forward pass
+        """
+
+        x = torch.as_tensor(np.asarray(states, dtype=np.float32)[:, self.state_mask])
+
+        if self.learner is None:
+            with torch.no_grad():
+                return self.actor_net.forward(x).numpy()
+        else:
+            with torch.no_grad(), self.learner.weight_lock:
+                return self.actor_net.forward(x).numpy()
+
     def get_action(self,
                    states: [np.ndarray],
                    temp: float):
 
         """
         Choose an action according to the epsilon-greedy policy
+        All the users are processed at once with a single forward pass
         """
 
         assert 0 <= temp <= 1
 
-        actions, q_values = [], []
+        # Estimate the q values of the input states
 
-        for user_idx, state in enumerate(states):
+        q_values = self.get_q_values(states)
 
-            x = torch.tensor(state[self.state_mask], dtype=torch.float32)
+        # Choose an action according to the epsilon greedy policy
 
-            # Estimate the q values of the input state
+        actions = np.argmax(q_values, 1)  # Greedy actions
 
-            with torch.no_grad():
-                user_q_values = self.primary_net.forward(x).detach().numpy()
+        # The random numbers are drawn user by user, in the same order as the per-user policy
 
-            # Choose an action according to the epsilon greedy policy
-
-            if np.random.uniform() - temp > 0:
-                user_action = np.argmax(user_q_values, 0)  # Greedy action
-            else:
-                user_action = np.random.randint(0, self.action_num)  # Random action
-
-            actions.append(user_action)
-            q_values.append(user_q_values)
+        for user_idx in range(len(actions)):
+            if np.random.uniform() - temp <= 0:
+                actions[user_idx] = np.random.randint(0, self.action_num)  # Random action
 
         return actions, q_values
 
@@ -163,22 +235,18 @@ class CentralizedAgent(object):
 
         self.data_idx += 1
 
-        self.temperature_data[self.data_idx] = temp
-
-        for user_idx in range(self.user_num):
-
-            # Update the learning data
+        # Update the learning data (a row of the log buffers)
 
-            action_vector = np.zeros(self.action_num)
-            action_vector[action_indexes[user_idx]] = 1
-            self.action_data[user_idx, :, self.data_idx] = action_vector
+        row = self.log.append(1).start
+        data = self.log.buffers
 
-            self.q_value_data[user_idx, :, self.data_idx] = q_values[user_idx]
-
-            self.reward_data[user_idx, self.data_idx] = rewards[user_idx]
-            self.state_data[user_idx, :, self.data_idx] = states[user_idx]
-            self.qos_data[user_idx, self.data_idx] = qos_per_user[user_idx]
-            self.chamfer_data[user_idx, self.data_idx] = cd_per_user[user_idx]
+        data['temperatures'][row] = temp
+        data['actions'][row] = np.eye(self.action_num)[action_indexes]
+        data['q_values'][row] = q_values
+        data['rewards'][row] = rewards
+        data['states'][row] = states
+        data['qos'][row] = qos_per_user
+        data['chamfer_distances'][row] = cd_per_user
 
         # Update the transition variables
 
@@ -191,42 +259,152 @@ class CentralizedAgent(object):
 
         if train:
 
-            # If the state variable is not None, store the new transition in the replay memory
+            # If the old state variable is not None, store the new transitions of all the users in the replay memory
 
-            if self.states[0] is not None:
-                for user_idx in range(self.user_num):
-                    self.dql.store_transition(np.copy(self.old_states[user_idx]),
-                                              self.old_actions[user_idx],
-                                              self.rewards[user_idx],
-                                              np.copy(self.states[user_idx]))
+            if self.old_states[0] is not None:
+                self.dql.store_transitions(np.stack(self.old_states),
+                                           np.asarray(self.old_actions),
+                                           np.asarray(self.rewards),
+                                           np.stack(self.states))
 
-            # If the replay memory is full, perform a learning step
+            # If the replay memory is full, perform a learning step (or let the learner thread perform it)
 
             if self.dql.ready():
-                loss = self.dql.step()
+                if self.learner is None:
+                    loss = self.dql.step()
+                else:
+                    self.learner.add_data()
+                    loss = self.learner.loss  # Loss of the last completed learning step
 
                 # Update the algorithm loss
 
-                self.loss_data[self.data_idx] = loss
+                self.log.buffers['losses'][row] = loss
+
+    def update_episode(self,
+                       action_indexes: np.ndarray,
+                       q_values: np.ndarray,
+                       rewards: np.ndarray,
+                       states: np.ndarray,
+                       qos_per_user: np.ndarray,
+                       cd_per_user: np.ndarray,
+                       temp: float,
+                       train: bool):
+
+        """
+        Update the learning data of the agent with consecutive steps at once
+        The arguments are (step, user, ...) arrays: the data and the transitions are the same as
+        calling update for each step, but the transitions are all inserted before the learning steps
+        (the same as the step by step update if only the last step is followed by a learning step)
+        """
+
+        step_num = len(rewards)
+
+        # Steps followed by a learning step (computed before the transition variables change)
+
+        learning_steps = self.learning_steps(step_num)
+
+        self.data_idx += step_num
+
+        # Update the learning data (rows of the log buffers)
+
+        rows = self.log.append(step_num)
+        data = self.log.buffers
+
+        data['temperatures'][rows] = temp
+
+        data['actions'][rows] = np.eye(self.action_num)[action_indexes]
+        data['q_values'][rows] = q_values
+
+        data['rewards'][rows] = rewards
+        data['states'][rows] = states
+        data['qos'][rows] = qos_per_user
+        data['chamfer_distances'][rows] = cd_per_user
+
+        # Transitions from each step to the next one (the first one starts from the last step of the previous episode)
+
+        states = states[:, :, self.state_mask]
+
+        if self.states[0] is not None:
+            old_states = np.concatenate((np.stack(self.states)[np.newaxis], states[:-1]))
+            old_actions = np.concatenate((np.asarray(self.actions)[np.newaxis], action_indexes[:-1]))
+            new_states, new_rewards = states, rewards
+        else:
+            old_states, old_actions = states[:-1], action_indexes[:-1]
+            new_states, new_rewards = states[1:], rewards[1:]
+
+        # Update the transition variables
+
+        self.old_states = list(old_states[-1]) if len(old_states) > 0 else [None] * self.user_num
+        self.old_actions = list(old_actions[-1]) if len(old_actions) > 0 else [None] * self.user_num
+
+        self.actions = list(action_indexes[-1])
+        self.rewards = list(rewards[-1])
+        self.states = list(states[-1])
+
+        if train:
+
+            # Store the transitions of all the steps in the replay memory
+
+            if len(old_states) > 0:
+                self.dql.store_transitions(old_states.reshape(-1, old_states.shape[-1]),
+                                           old_actions.reshape(-1),
+                                           new_rewards.reshape(-1),
+                                           new_states.reshape(-1, new_states.shape[-1]))
+
+            # Perform a learning step for each step where the replay memory was full (or let the learner thread do it)
+
+            for step in np.flatnonzero(learning_steps):
+                if self.learner is None:
+                    loss = self.dql.step()
+                else:
+                    self.learner.add_data()
+                    loss = self.learner.loss
+
+                self.log.buffers['losses'][rows.start + step] = loss
+
+    def learning_steps(self, step_num: int):
+
+        """
+        Mask of the next step_num steps (updated with training) followed by a learning step,
+        i.e. those after which the replay memory is full
+        """
+
+        stored = np.cumsum(np.full(step_num, self.user_num))
+
+        if self.states[0] is None:
+            stored -= self.user_num  # No transition in the first step
+
+        return self.dql.memory_step + stored >= self.dql.memory_capacity
+
+    def synchronize(self):
+
+        """
+        Wait for the pending learning steps of the learner thread and sync the actor network
+        """
+
+        if self.learner is not None:
+            self.learner.wait()
+
+    def open_data(self, data_folder: str):
+
+        """
+        Log the learning data in the data folder (the previous one is replaced at the first save)
+        """
+
+        self.log.open(data_folder)
 
     def save_data(self, data_folder: str):
 
         """
-        Save the learning data
+        Save the learning data (only the steps not saved yet are written)
         """
 
-        np.save(data_folder + 'states.npy', self.state_data)
-        np.save(data_folder + 'rewards.npy', self.reward_data)
-        np.save(data_folder + 'actions.npy', self.action_data)
-        np.save(data_folder + 'q_values.npy', self.q_value_data)
-        np.save(data_folder + 'temperatures.npy', self.temperature_data)
-        np.save(data_folder + 'losses.npy', self.loss_data)
-        np.save(data_folder + 'qos.npy', self.qos_data)
-        np.save(data_folder + 'chamfer_distances.npy', self.chamfer_data)
-        np.save(data_folder + 'data_idx.npy', self.data_idx)
+        self.log.open(data_folder)
+        self.log.flush()
 
     def save_model(self, data_folder: str):
 
+        self.synchronize()
         self.dql.save_model(data_folder)
 
     def load_data(self, data_folder: str):
@@ -235,91 +413,105 @@ class CentralizedAgent(object):
         Load the learning data
         """
 
-        self.data_idx = np.load(data_folder + 'data_idx.npy')
+        self.log = load_training_log(data_folder, self.step_num)  # The steps are read lazily
 
-        self.state_data = np.load(data_folder + 'states.npy')
-        self.reward_data = np.load(data_folder + 'rewards.npy')
-        self.action_data = np.load(data_folder + 'actions.npy')
-        self.q_value_data = np.load(data_folder + 'q_values.npy')
-        self.temperature_data = np.load(data_folder + 'temperatures.npy')
-        self.loss_data = np.load(data_folder + 'losses.npy')
-
-        self.qos_data = np.load(data_folder + 'qos.npy')
-        self.chamfer_data = np.load(data_folder + 'chamfer_distances.npy')
+        self.data_idx = len(self.log) - 1
 
     def load_model(self, data_folder: str):
 
+        self.synchronize()
         self.dql.load_model(data_folder)
 
+        if self.learner is not None:
+            self.learner.sync()
+
     def plot_data(self, data_folder: str, episode_num: int):
 
         """
-        Plot the learning data
+        Plot the learning data (the figures are rendered in the background, see wait_plots)
         """
 
+        self.plots.open(data_folder)
+
         state_palette = sns.color_palette('rocket', n_colors=np.sum(self.state_mask))
         action_palette = sns.color_palette('rocket_r', n_colors=3)
         single_palette = sns.color_palette('rocket', n_colors=1)
 
+        # Data of all the users ((user, ..., step) arrays), each quantity read once from the log, chunk by chunk
+
+        states = self.log.user_data('states', self.data_idx)
+        q_values = self.log.user_data('q_values', self.data_idx)
+        actions = self.log.user_data('actions', self.data_idx)
+        rewards = self.log.user_data('rewards', self.data_idx)
+        chamfer_distances = self.log.user_data('chamfer_distances', self.data_idx)
+        qos = self.log.user_data('qos', self.data_idx)
+
         for user_idx in range(self.user_num):
 
+            # Data of the user ((..., step) arrays)
+
+            user_state_data = states[user_idx]
+            user_q_value_data = q_values[user_idx]
+            user_action_data = actions[user_idx]
+            user_reward_data = rewards[user_idx]
+            user_chamfer_data = chamfer_distances[user_idx]
+
             ### LEARN PLOT ###
 
             user_folder = data_folder + '/learn/' + str(user_idx) + '/'
 
             # States
 
-            multi_data = [self.state_data[user_idx, i, :self.data_idx] for i in range(self.state_dim) if
-                          self.state_mask[i]]
+            multi_data = [user_state_data[i] for i in range(self.state_dim) if self.state_mask[i]]
 
             multi_keys = np.array(self.state_labels)[self.state_mask]
 
-            multi_linear_plot(multi_data,
-                              multi_keys,
-                              'Episode',
-                              'State',
-                              episode_num,
-                              user_folder + 'states',
-                              palette=state_palette,
-                              plot_format=self.format)
+            self.plots.multi_linear_plot(multi_data,
+                                         multi_keys,
+                                         'Episode',
+                                         'State',
+                                         episode_num,
+                                         user_folder + 'states',
+                                         palette=state_palette,
+                                         plot_format=self.format)
 
             # Q values
 
-            multi_data = [self.q_value_data[user_idx, i, :self.data_idx] for i in range(self.action_num)]
+            multi_data = [user_q_value_data[i] for i in range(self.action_num)]
             multi_keys = self.action_labels
 
-            multi_linear_plot(multi_data,
-                              multi_keys,
-                              'Episode',
-                              'Q value',
-                              episode_num,
-                              user_folder + 'q_values',
-                              palette=action_palette,
-                              plot_format=self.format)
+            self.plots.multi_linear_plot(multi_data,
+                                         multi_keys,
+                                         'Episode',
+                                         'Q value',
+                                         episode_num,
+                                         user_folder + 'q_values',
+                                         palette=action_palette,
+                                         plot_format=self.format)
 
             # Actions
 
-            multi_data = [self.action_data[user_idx, i, :self.data_idx] for i in range(self.action_num)]
+            multi_data = [user_action_data[i] for i in range(self.action_num)]
             multi_keys = self.action_labels
 
-            multi_linear_plot(multi_data,
-                              multi_keys,
-                              'Episode',
-                              'Action probability',
-                              episode_num,
-                              user_folder + 'actions',
-                              palette=action_palette,
-                              plot_format=self.format)
+            self.plots.multi_linear_plot(multi_data,
+                                         multi_keys,
+                                         'Episode',
+                                         'Action probability',
+                                         episode_num,
+                                         user_folder + 'actions',
+                                         palette=action_palette,
+                                         plot_format=self.format)
 
             # Reward
 
-            linear_plot(self.reward_data[user_idx, :self.data_idx],
-                        'Episode',
-                        'Reward',
-                        episode_num,
-                        user_folder + 'rewards',
-                        palette=single_palette,
-                        plot_format=self.format)
+            self.plots.linear_plot(user_reward_data,
+                                   'Episode',
+                                   'Reward',
+                                   episode_num,
+                                   user_folder + 'rewards',
+                                   palette=single_palette,
+                                   plot_format=self.format)
 
             ### SINGLE FEATURE PLOT ###
 
@@ -328,28 +520,28 @@ class CentralizedAgent(object):
             for i in range(self.state_dim):
                 min_value, max_value = self.state_normalization[i]
 
-                linear_plot(self.state_data[user_idx, i, :self.data_idx] * (max_value - min_value) + min_value,
-                            'Episode',
-                            self.state_labels[i],
-                            episode_num,
-                            user_folder + self.state_labels[i].replace(' ', '_'),
-                            palette=single_palette,
-                            plot_format=self.format)
+                self.plots.linear_plot(user_state_data[i] * (max_value - min_value) + min_value,
+                                       'Episode',
+                                       self.state_labels[i],
+                                       episode_num,
+                                       user_folder + self.state_labels[i].replace(' ', '_'),
+                                       palette=single_palette,
+                                       plot_format=self.format)
 
             ### PERFORMANCE PLOT ###
 
             user_folder = data_folder + '/performance/' + str(user_idx) + '/'
 
-            linear_plot(self.chamfer_data[user_idx, :self.data_idx],
-                        'Episode',
-                        'Chamfer Distance',
-                        episode_num,
-                        user_folder + 'chamfer_distances',
-                        palette=single_palette,
-                        plot_format=self.format)
+            self.plots.linear_plot(user_chamfer_data,
+                                   'Episode',
+                                   'Chamfer Distance',
+                                   episode_num,
+                                   user_folder + 'chamfer_distances',
+                                   palette=single_palette,
+                                   plot_format=self.format)
 
-            linear_plot(
-                (self.max_penalty - self.chamfer_data[user_idx, :self.data_idx]) / self.max_penalty,
+            self.plots.linear_plot(
+                (self.max_penalty - user_chamfer_data) / self.max_penalty,
                 'Episode',
                 'QoE',
                 episode_num,
@@ -359,127 +551,147 @@ class CentralizedAgent(object):
 
         # States
 
-        state_data = np.mean(self.state_data, axis=0)
+        state_data = np.mean(states, axis=0)
 
         multi_data = [state_data[i, :self.data_idx] for i in range(self.state_dim) if self.state_mask[i]]
         multi_keys = np.array(self.state_labels)[self.state_mask]
 
-        multi_linear_plot(multi_data,
-                          multi_keys,
-                          'Episode',
-                          'State',
-                          episode_num,
-                          data_folder + 'learn/states',
-                          palette=state_palette,
-                          plot_format=self.format)
+        self.plots.multi_linear_plot(multi_data,
+                                     multi_keys,
+                                     'Episode',
+                                     'State',
+                                     episode_num,
+                                     data_folder + 'learn/states',
+                                     palette=state_palette,
+                                     plot_format=self.format)
 
         # Q values
 
-        q_value_data = np.mean(self.q_value_data, axis=0)
+        q_value_data = np.mean(q_values, axis=0)
 
         multi_data = [q_value_data[i, :self.data_idx] for i in range(self.action_num)]
         multi_keys = self.action_labels
 
-        multi_linear_plot(multi_data,
-                          multi_keys,
-                          'Episode',
-                          'Q value',
-                          episode_num,
-                          data_folder + 'learn/q_values',
-                          palette=action_palette,
-                          plot_format=self.format)
+        self.plots.multi_linear_plot(multi_data,
+                                     multi_keys,
+                                     'Episode',
+                                     'Q value',
+                                     episode_num,
+                                     data_folder + 'learn/q_values',
+                                     palette=action_palette,
+                                     plot_format=self.format)
 
         # Actions
 
-        action_data = np.mean(self.action_data, axis=0)
+        action_data = np.mean(actions, axis=0)
 
         multi_data = [action_data[i, :self.data_idx] for i in range(self.action_num)]
         multi_keys = self.action_labels
 
-        multi_linear_plot(multi_data,
-                          multi_keys,
-                          'Episode',
-                          'Action probability',
-                          episode_num,
-                          data_folder + 'learn/actions',
-                          palette=action_palette,
-                          plot_format=self.format)
+        self.plots.multi_linear_plot(multi_data,
+                                     multi_keys,
+                                     'Episode',
+                                     'Action probability',
+                                     episode_num,
+                                     data_folder + 'learn/actions',
+                                     palette=action_palette,
+                                     plot_format=self.format)
 
         # Rewards
 
-        reward_data = np.mean(self.reward_data, axis=0)
+        reward_data = np.mean(rewards, axis=0)
 
-        linear_plot(reward_data[:self.data_idx],
-                    'Episode',
-                    'Reward',
-                    episode_num,
-                    data_folder + 'learn/rewards',
-                    palette=single_palette,
-                    plot_format=self.format)
+        self.plots.linear_plot(reward_data[:self.data_idx],
+                               'Episode',
+                               'Reward',
+                               episode_num,
+                               data_folder + 'learn/rewards',
+                               palette=single_palette,
+                               plot_format=self.format)
 
         # Loss
 
-        linear_plot(self.loss_data[:self.data_idx],
-                    'Episode',
-                    'Loss',
-                    episode_num,
-                    data_folder + 'learn/losses',
-                    palette=single_palette,
-                    plot_format=self.format)
+        self.plots.linear_plot(self.log.user_data('losses', self.data_idx),
+                               'Episode',
+                               'Loss',
+                               episode_num,
+                               data_folder + 'learn/losses',
+                               palette=single_palette,
+                               plot_format=self.format)
 
         # Temperature
 
-        linear_plot(self.temperature_data[:self.data_idx],
-                    'Episode',
-                    'Temperature',
-                    episode_num,
-                    data_folder + 'learn/temperatures',
-                    palette=single_palette,
-                    plot_format=self.format)
+        self.plots.linear_plot(self.log.user_data('temperatures', self.data_idx),
+                               'Episode',
+                               'Temperature',
+                               episode_num,
+                               data_folder + 'learn/temperatures',
+                               palette=single_palette,
+                               plot_format=self.format)
 
         # Single feature
 
         for i in range(self.state_dim):
             min_value, max_value = self.state_normalization[i]
 
-            state_data = np.mean(self.state_data, axis=0)
-
-            linear_plot(state_data[i, :self.data_idx] * (max_value - min_value) + min_value,
-                        'Episode',
-                        self.state_labels[i],
-                        episode_num,
-                        data_folder + 'state/' + self.state_labels[i].replace(' ', '_'),
-                        palette=single_palette,
-                        plot_format=self.format)
+            self.plots.linear_plot(state_data[i, :self.data_idx] * (max_value - min_value) + min_value,
+                                   'Episode',
+                                   self.state_labels[i],
+                                   episode_num,
+                                   data_folder + 'state/' + self.state_labels[i].replace(' ', '_'),
+                                   palette=single_palette,
+                                   plot_format=self.format)
 
         # QoS
 
-        qos_data = np.mean(self.qos_data, axis=0)
+        qos_data = np.mean(qos, axis=0)
 
-        linear_plot(qos_data[:self.data_idx],
-                    'Episode',
-                    'QoS',
-                    episode_num,
-                    data_folder + 'performance/qos',
-                    palette=single_palette,
-                    plot_format=self.format)
+        self.plots.linear_plot(qos_data[:self.data_idx],
+                               'Episode',
+                               'QoS',
+                               episode_num,
+                               data_folder + 'performance/qos',
+                               palette=single_palette,
+                               plot_format=self.format)
 
         # QoE
 
-        chamfer_data = np.mean(self.chamfer_data, axis=0)
-
-        linear_plot(chamfer_data[:self.data_idx],
-                    'Episode',
-                    'Chamfer Distance',
-                    episode_num,
-                    data_folder + 'performance/chamfer_distances',
-                    palette=single_palette,
-                    plot_format=self.format)
-
-        linear_plot((self.max_penalty - chamfer_data[:self.data_idx]) / self.max_penalty,
-                    'Episode',
-                    'QoE',
-                    episode_num,
-                    data_folder + 'performance/qoe',
-                    palette=single_palette,
-                    plot_format=self.format)
+        chamfer_data = np.mean(chamfer_distances, axis=0)
+
+        self.plots.linear_plot(chamfer_data[:self.data_idx],
+                               'Episode',
+                               'Chamfer Distance',
+                               episode_num,
+                               data_folder + 'performance/chamfer_distances',
+                               palette=single_palette,
+                               plot_format=self.format)
+
+        self.plots.linear_plot((self.max_penalty - chamfer_data[:self.data_idx]) / self.max_penalty,
+                               'Episode',
+                               'QoE',
+                               episode_num,
+                               data_folder + 'performance/qoe',
+                               palette=single_palette,
+                               plot_format=self.format)
+
+        self.plots.collect()
+
+    def wait_plots(self):
+
+        """
+        Wait for the figures of plot_data being rendered
+        """
+
+        self.plots.wait()
+
+    def close(self):
+
+        """
+        Stop the learner thread and the rendering processes (the figures being rendered are completed)
+        """
+
+        if self.learner is not None:
+            self.learner.stop()
+            self.learner = None
+
+        self.plots.close()
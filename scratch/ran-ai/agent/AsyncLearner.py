@@ -0,0 +1,125 @@
+import threading
+from torch.nn import Module
+from agent.DoubleQLearning import DQL
+
+
+class AsyncLearner(threading.Thread):
+    """
+    class AsyncLearner
+    It runs the learning steps of the Double Q Learning algorithm in a background thread,
+    while the actor network used for the inference is periodically synced with the primary network
+
+    """
+
+    def __init__(self,
+                 dql: DQL,
+                 actor_net: Module,
+                 update_ratio: float,
+                 sync_interval: int):
+
+        super(AsyncLearner, self).__init__(daemon=True)
+
+        self.dql: DQL = dql
+        self.actor_net: Module = actor_net
+
+        # Learning steps performed per environment step and learning steps between two weight syncs
+
+        self.update_ratio: float = update_ratio
+        self.sync_interval: int = sync_interval
+
+        # Counters of the environment steps (with a full memory replay) and of the learning steps
+
+        self.data_step: int = 0
+        self.learn_step: int = 0
+
+        # Loss of the last learning step
+
+        self.loss: float = 0
+
+        self.condition = threading.Condition()
+        self.weight_lock = threading.Lock()  # Held while the actor network is used or updated
+        self.stopped: bool = False
+        self.error = None
+
+    def budget(self):
+
+        # Number of learning steps required by the environment steps performed so far
+
+        return int(self.update_ratio * self.data_step)
+
+    def add_data(self):
+
+        """
+        Notify the learner of a new environment step
+        """
+
+        self.check()
+
+        with self.condition:
+            self.data_step += 1
+            self.condition.notify_all()
+
+    def run(self):
+
+        try:
+            while True:
+
+                with self.condition:
+                    while not self.stopped and self.learn_step >= self.budget():
+                        self.condition.wait()
+
+                    if self.stopped:
+                        break
+
+                self.loss = self.dql.step()
+
+                with self.condition:
+                    self.learn_step += 1
+
+                    if self.learn_step % self.sync_interval == 0:
+                        self.sync()
+
+                    self.condition.notify_all()
+
+        except Exception as error:
+            self.error = error
+
+            with self.condition:
+                self.condition.notify_all()
+
+    def sync(self):
+
+        """
+        Copy the weights of the primary network in the actor network
+        """
+
+        with self.weight_lock:
+            self.actor_net.load_state_dict(self.dql.primary_net.state_dict())
+
+    def wait(self):
+
+        """
+        Wait for the pending learning steps and sync the actor network
+        """
+
+        with self.condition:
+            while self.error is None and self.learn_step < self.budget():
+                self.condition.wait()
+
+        self.check()
+        self.sync()
+
+    def stop(self):
+
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+        self.join()
+
+    def check(self):
+
+        # Raise in the caller thread the error of the learner thread
+
+        if self.error is not None:
+            raise RuntimeError("The learner thread failed") from self.error
@@ -1,8 +1,9 @@
 import torch
+import threading
 from torch.nn import Module
 from agent.NeuralNetwork import LinearNeuralNetwork
+from agent.ReplayMemory import ReplayMemory, PrioritizedReplayMemory
 import numpy as np
-import random
 
 
 class DQL(object):
@@ -20,7 +21,11 @@ class DQL(object):
                  gamma: float,
                  batch_size: int,
                  target_replace: int,
-                 memory_capacity: int):
+                 memory_capacity: int,
+                 state_dim: int,
+                 prioritized: bool = False,
+                 priority_alpha: float = 0.6,
+                 priority_beta: float = 0.4):
 
         # Target and evaluation networks used in the training
 
@@ -46,12 +51,19 @@ class DQL(object):
         self.target_replace: int = target_replace
         self.gamma: float = gamma  # Should be close to 1
 
-        # Memory replay
+        # Memory replay (uniform or prioritized)
 
         self.memory_capacity: int = memory_capacity
-        self.memory = []
-        self.memory_probs = []
-        self.memory_indexes = range(self.memory_capacity)
+        self.prioritized: bool = prioritized
+
+        if prioritized:
+            self.memory = PrioritizedReplayMemory(memory_capacity, state_dim, priority_alpha, priority_beta)
+        else:
+            self.memory = ReplayMemory(memory_capacity, state_dim)
+
+        # Held while the memory replay is accessed (the learning steps may run in another thread)
+
+        self.memory_lock = threading.Lock()
 
     def store_transition(self, state: np.ndarray, action: int, reward: float, new_state: np.ndarray):
 
@@ -59,16 +71,22 @@ class DQL(object):
         Insert a new transition (state, action, reward, new state) in the memory replay
         """
 
-        if self.memory_step < self.memory_capacity:
-            self.memory.append([state, action, reward, new_state])  # Transition
-            self.memory_probs.append(0)  # Probability of pick the transition (in case of a prioritize memory replay)
-        else:
-            index: int = int(self.memory_step % self.memory_capacity)  # Index of the transition
-            self.memory[index] = [state, action, reward, new_state]  # Transition
-            self.memory_probs[index] = 0  # Probability of pick the transition (in case of a prioritize memory replay)
+        with self.memory_lock:
+            self.memory.store(state, action, reward, new_state)
 
         self.memory_step += 1  # Increase the number of total transition
 
+    def store_transitions(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, new_states: np.ndarray):
+
+        """
+        Insert a batch of transitions, one per row, in the memory replay
+        """
+
+        with self.memory_lock:
+            self.memory.store_batch(states, actions, rewards, new_states)
+
+        self.memory_step += len(actions)  # Increase the number of total transition
+
     def ready(self):
 
         # Return true if the memory is full
@@ -83,21 +101,13 @@ class DQL(object):
 
         self.learn_step += 1
 
-        # Prioritize memory replay
-        # batch_indexes = random.choices(self.memory_indexes, k=self.batch_size, weights=self.memory_probs)
+        # Sample the indexes of the transitions inserted in the batch used for the training
+        # (the importance sampling weights are None without a prioritized memory replay)
 
-        # Random sampling the indexes of the transition inserted in the batch used for the training
+        with self.memory_lock:
+            batch_indexes, batch_weights = self.memory.sample(self.batch_size)
 
-        batch_transitions = random.sample(self.memory, self.batch_size)
-
-        batch_states = torch.stack(
-            [torch.tensor(transition[0], dtype=torch.float32) for transition in batch_transitions])
-        batch_actions = torch.tensor(
-            [transition[1] for transition in batch_transitions], dtype=torch.int64).view(-1, 1)
-        batch_rewards = torch.tensor(
-            [transition[2] for transition in batch_transitions], dtype=torch.float32)
-        batch_new_states = torch.stack(
-            [torch.tensor(transition[3], dtype=torch.float32) for transition in batch_transitions])
+            batch_states, batch_actions, batch_rewards, batch_new_states = self.memory.get(batch_indexes)
 
         actual_q_values = self.primary_net.forward(batch_states).gather(1, batch_actions).squeeze(1)
 
@@ -107,14 +117,20 @@ class DQL(object):
             next_actions = torch.argmax(next_q_values, dim=1).view(-1, 1)
 
             target_q_values = batch_rewards + self.gamma * \
-                              self.target_net.forward(batch_new_states).gather(1, next_actions).squeeze(
-                                  1).numpy()
+                              self.target_net.forward(batch_new_states).gather(1, next_actions).squeeze(1)
+
+        td_errors = actual_q_values - target_q_values
+        losses = td_errors ** 2
 
-        losses = (actual_q_values - target_q_values) ** 2
+        # Compute the mean loss of the batch, weighted to correct the bias of the prioritized sampling
 
-        # Compute the mean loss of the batch
+        if self.prioritized:
+            loss_mean = (losses * torch.from_numpy(batch_weights)).mean()
 
-        loss_mean = losses.mean()
+            with self.memory_lock:
+                self.memory.update_priorities(batch_indexes, td_errors.detach().numpy())
+        else:
+            loss_mean = losses.mean()
 
         # Optimization step
 
@@ -0,0 +1,217 @@
+import torch
+import numpy as np
+
+
+class ReplayMemory(object):
+    """
+    class ReplayMemory
+    It implements a ring buffer of transitions (state, action, reward, new state)
+    stored in preallocated contiguous arrays
+
+    """
+
+    def __init__(self,
+                 capacity: int,
+                 state_dim: int):
+
+        self.capacity: int = capacity
+        self.state_dim: int = state_dim
+
+        # Number of transitions inserted so far (the oldest ones are overwritten)
+
+        self.step: int = 0
+
+        # Transition arrays
+
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.new_states = np.zeros((capacity, state_dim), dtype=np.float32)
+
+        # Tensors sharing the memory of the arrays
+
+        self.state_tensor = torch.from_numpy(self.states)
+        self.action_tensor = torch.from_numpy(self.actions)
+        self.reward_tensor = torch.from_numpy(self.rewards)
+        self.new_state_tensor = torch.from_numpy(self.new_states)
+
+    def __len__(self):
+
+        return min(self.step, self.capacity)
+
+    def store(self, state: np.ndarray, action: int, reward: float, new_state: np.ndarray):
+
+        """
+        Insert a new transition in the memory replay
+        """
+
+        index: int = self.step % self.capacity
+
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.new_states[index] = new_state
+
+        self.step += 1
+
+        return np.array([index])
+
+    def store_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, new_states: np.ndarray):
+
+        """
+        Insert a batch of transitions in the memory replay
+        """
+
+        indexes = (self.step + np.arange(len(actions))) % self.capacity
+
+        self.states[indexes] = states
+        self.actions[indexes] = actions
+        self.rewards[indexes] = rewards
+        self.new_states[indexes] = new_states
+
+        self.step += len(actions)
+
+        return indexes
+
+    def sample(self, batch_size: int):
+
+        """
+        Uniformly sample the indexes of a batch of distinct transitions (no importance sampling weights)
+        """
+
+        return np.random.choice(len(self), batch_size, replace=False), None
+
+    def get(self, indexes: np.ndarray):
+
+        """
+        Return the tensors (states, actions, rewards, new states) of the given transitions
+        """
+
+        indexes = torch.from_numpy(indexes)
+
+        return self.state_tensor[indexes], self.action_tensor[indexes].view(-1, 1), self.reward_tensor[indexes], \
+            self.new_state_tensor[indexes]
+
+
+class SumTree(object):
+    """
+    class SumTree
+    It implements a binary tree where each node stores the sum of its children,
+    to sample leaves with probability proportional to their value in logarithmic time
+
+    """
+
+    def __init__(self, capacity: int):
+
+        # The root is at index 1 and the leaves at [leaf_num, 2 * leaf_num)
+
+        self.leaf_num: int = 1 << int(np.ceil(np.log2(max(capacity, 2))))
+        self.tree = np.zeros(2 * self.leaf_num, dtype=np.float64)
+
+    def total(self):
+
+        return self.tree[1]
+
+    def get(self, indexes: np.ndarray):
+
+        return self.tree[indexes + self.leaf_num]
+
+    def update(self, indexes: np.ndarray, values: np.ndarray):
+
+        """
+        Set the values of the given leaves and update their ancestors
+        """
+
+        nodes = indexes + self.leaf_num
+        self.tree[nodes] = values
+
+        while nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values: np.ndarray):
+
+        """
+        Return the leaves where the given cumulative values fall (all of them descend the tree together)
+        """
+
+        nodes = np.ones(len(values), dtype=np.int64)
+
+        while nodes[0] < self.leaf_num:
+            left = 2 * nodes
+            left_values = self.tree[left]
+            go_right = (values >= left_values) & (self.tree[left + 1] > 0)
+            values = np.where(go_right, values - left_values, values)
+            nodes = np.where(go_right, left + 1, left)
+
+        return nodes - self.leaf_num
+
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """
+    class PrioritizedReplayMemory
+    It implements a proportional prioritized memory replay:
+    transitions are sampled with probability proportional to priority ** alpha
+    and weighted by (N * probability) ** -beta to correct the bias
+
+    """
+
+    def __init__(self,
+                 capacity: int,
+                 state_dim: int,
+                 alpha: float,
+                 beta: float,
+                 epsilon: float = 1e-6):
+
+        super(PrioritizedReplayMemory, self).__init__(capacity, state_dim)
+
+        self.alpha: float = alpha
+        self.beta: float = beta
+        self.epsilon: float = epsilon  # Minimum priority, so that every transition can be sampled
+
+        # New transitions get the largest priority seen so far
+
+        self.max_priority: float = 1.0
+        self.tree = SumTree(capacity)
+
+    def store(self, state: np.ndarray, action: int, reward: float, new_state: np.ndarray):
+
+        indexes = super(PrioritizedReplayMemory, self).store(state, action, reward, new_state)
+        self.tree.update(indexes, np.full(len(indexes), self.max_priority ** self.alpha))
+
+        return indexes
+
+    def store_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, new_states: np.ndarray):
+
+        indexes = super(PrioritizedReplayMemory, self).store_batch(states, actions, rewards, new_states)
+        self.tree.update(indexes, np.full(len(indexes), self.max_priority ** self.alpha))
+
+        return indexes
+
+    def sample(self, batch_size: int):
+
+        """
+        Sample the indexes of a batch of transitions (one per priority segment) and their importance sampling weights
+        """
+
+        total = self.tree.total()
+
+        values = (np.arange(batch_size) + np.random.uniform(size=batch_size)) * total / batch_size
+        indexes = self.tree.find(values)
+
+        probs = self.tree.get(indexes) / total
+        weights = (len(self) * probs) ** -self.beta
+        weights /= weights.max()
+
+        return indexes, weights.astype(np.float32)
+
+    def update_priorities(self, indexes: np.ndarray, td_errors: np.ndarray):
+
+        """
+        Update the priorities of the sampled transitions with their new temporal difference errors
+        """
+
+        priorities = np.abs(td_errors) + self.epsilon
+
+        self.max_priority = max(self.max_priority, np.max(priorities))
+        self.tree.update(indexes, priorities ** self.alpha)
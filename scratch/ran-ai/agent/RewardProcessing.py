@@ -80,6 +80,59 @@ def reward_process(step_data_per_user,
     return rewards, qos_per_user, cd_per_user
 
 
+def batch_reward_process(step_data: np.ndarray,
+                         prr_num_index: int,
+                         prr_den_index: int,
+                         app_delay_index: int,
+                         app_prr_requirement: float,
+                         app_delay_requirement: float,
+                         last_actions: np.ndarray,
+                         cd_per_action: np.ndarray,
+                         user_num: int,
+                         max_penalty: float,
+                         reward_alpha: float,
+                         qos_bonus: str):
+
+    """
+    Compute the rewards of all the users at once from the (users, env features) step matrix
+    Return the reward, QoS and Chamfer distance vectors
+    """
+
+    step_data = step_data[:user_num]
+
+    # Compute PRR
+
+    num, den = step_data[:, prr_num_index], step_data[:, prr_den_index]
+    prr = np.divide(num, den, out=np.ones_like(num), where=den != 0)
+
+    delay = step_data[:, app_delay_index]
+    cd_per_user = np.asarray(cd_per_action, dtype=float)[np.asarray(last_actions)]
+
+    # Check whether the communication KPI are addressed
+
+    qos_per_user = (delay < app_delay_requirement) & (prr >= app_prr_requirement)
+
+    if qos_bonus == 'delay':
+        qos_penalty = delay / app_delay_requirement
+    elif qos_bonus == 'prr':
+        with np.errstate(divide='ignore'):
+            qos_penalty = app_prr_requirement / prr
+    else:
+        raise ValueError
+
+    cd_penalty = np.where(qos_per_user, cd_per_user / max_penalty, 1)
+    qos_penalty = np.where(qos_per_user, qos_penalty, 1)
+
+    # Assign the reward to the users and normalize it in [-1, +1]
+
+    rewards = 1 - reward_alpha * cd_penalty - (1 - reward_alpha) * qos_penalty
+
+    rewards -= 0.5
+    rewards *= 2
+
+    return rewards, qos_per_user.astype(int), cd_per_user
+
+
 def get_reward_per_action(penalty_per_action: [float], reward_penalty: float):
     reward_penalty += np.max(penalty_per_action)
 
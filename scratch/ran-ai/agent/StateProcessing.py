@@ -63,3 +63,34 @@ def state_process(step_data_per_user,
             states[user_idx][state_idx + feature_num] = feature
 
     return states, imsi_list
+
+
+def batch_state_process(step_data: np.ndarray,
+                        feature_indexes: np.ndarray,
+                        combination_num_indexes: np.ndarray,
+                        combination_den_indexes: np.ndarray,
+                        bounds: np.ndarray,
+                        user_num: int):
+
+    """
+    Compute the states of all the users at once from the (users, env features) step matrix
+    Return the (user_num, state_dim) state matrix and the IMSI of each user
+    """
+
+    step_data = step_data[:user_num]
+
+    imsis = step_data[:, 0].astype(int)
+
+    # PRR values (1 if nothing has been transmitted)
+
+    num, den = step_data[:, combination_num_indexes], step_data[:, combination_den_indexes]
+    ratios = np.divide(num, den, out=np.ones_like(num), where=~(den <= 0))
+
+    # Clip and normalize all the features
+
+    features = np.concatenate((step_data[:, feature_indexes], ratios), axis=1)
+
+    min_values, max_values = bounds[:, 0], bounds[:, 1]
+    states = (np.clip(features, min_values, max_values) - min_values) / (max_values - min_values)
+
+    return states, imsis
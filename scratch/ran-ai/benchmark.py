@@ -0,0 +1,744 @@
+from agent.StateProcessing import state_process, batch_state_process
+from agent.RewardProcessing import reward_process, batch_reward_process
+from agent.Agent import CentralizedAgent
+from agent.DoubleQLearning import DQL
+from utils.OnlineRun import run_vec_online_episode
+from utils.OfflineRun import run_offline_episode
+from settings.GeneralSettings import *
+from settings.StateSettings import *
+from utils.SyntheticData import action_labels, random_step_data, random_episode, build_agent
+from py_interface import Init, FreeMemory, Ns3AIRL, BLOCK_WAIT, Experiment, WarmExperiment
+import subprocess
+import multiprocessing
+import tempfile
+import os
+import sys
+import argparse
+import timeit
+import time
+import random
+import torch
+import numpy as np
+
+parser = argparse.ArgumentParser()
+
+# Benchmark the state and reward processing of a single step
+parser.add_argument('-processing', '--processing', action='store_const', const=True, default=False)
+# Benchmark the agent inference of a single step
+parser.add_argument('-inference', '--inference', action='store_const', const=True, default=False)
+# Benchmark the learning steps with a full memory replay
+parser.add_argument('-replay', '--replay', action='store_const', const=True, default=False)
+# Benchmark the episode duration with synchronous and asynchronous learning
+parser.add_argument('-learner', '--learner', action='store_const', const=True, default=False)
+# Benchmark the episodes per hour with 1 to N concurrent (emulated) ns-3 simulations
+parser.add_argument('-envs', '--env_num', type=int, default=0)
+# Benchmark the startup of the episodes with cold and warm started (emulated) ns-3 scripts
+parser.add_argument('-warm', '--warm', action='store_const', const=True, default=False)
+# Benchmark the offline episodes (step loop and whole episode at once) over 50 vehicles x 3 actions
+parser.add_argument('-offline', '--offline', action='store_const', const=True, default=False)
+# Benchmark plot_data (rendered by the caller and in the background) after N episodes
+parser.add_argument('-plot', '--plot_episode_num', type=int, default=0)
+# Benchmark the checkpoints of the learning data (whole arrays and training log) over N episodes
+parser.add_argument('-log', '--log_episode_num', type=int, default=0)
+# Benchmark the reductions of multi_plot over 10 test folders of N episodes (agents, read-only results, summaries)
+parser.add_argument('-results', '--results_episode_num', type=int, default=0)
+
+parser.add_argument('-user', '--user_num', type=int, default=50)  # Number of users
+parser.add_argument('-repeat', '--repeat', type=int, default=1000)  # Number of repetitions
+parser.add_argument('-work', '--work', type=float, default=2)  # ns-3 time per step [ms]
+parser.add_argument('-startup', '--startup', type=float, default=500)  # ns-3 library loading time [ms]
+args = vars(parser.parse_args())
+
+user_num: int = args['user_num']
+repeat: int = args['repeat']
+rng = np.random.default_rng(0)  # Random data of the benchmarks
+action_penalties = [cf_mean_per_action[action] for action in action_labels]
+max_penalty = 10 + np.max(action_penalties)
+
+
+def per_user_get_action(agent: CentralizedAgent, states: [np.ndarray], temp: float):
+
+    """
+    Reference implementation: one forward pass and one random draw per user
+    """
+
+    actions, q_values = [], []
+
+    for state in states:
+
+        x = torch.tensor(state[agent.state_mask], dtype=torch.float32)
+
+        with torch.no_grad():
+            user_q_values = agent.primary_net.forward(x).detach().numpy()
+
+        if np.random.uniform() - temp > 0:
+            user_action = np.argmax(user_q_values, 0)
+        else:
+            user_action = np.random.randint(0, agent.action_num)
+
+        actions.append(user_action)
+        q_values.append(user_q_values)
+
+    return actions, q_values
+
+
+def list_replay_step(dql: DQL, memory: []):
+
+    """
+    Reference implementation: learning step on a list of [state, action, reward, new state] transitions
+    """
+
+    batch_transitions = random.sample(memory, dql.batch_size)
+
+    batch_states = torch.stack(
+        [torch.tensor(transition[0], dtype=torch.float32) for transition in batch_transitions])
+    batch_actions = torch.tensor(
+        [transition[1] for transition in batch_transitions], dtype=torch.int64).view(-1, 1)
+    batch_rewards = torch.tensor(
+        [transition[2] for transition in batch_transitions], dtype=torch.float32)
+    batch_new_states = torch.stack(
+        [torch.tensor(transition[3], dtype=torch.float32) for transition in batch_transitions])
+
+    actual_q_values = dql.primary_net.forward(batch_states).gather(1, batch_actions).squeeze(1)
+
+    with torch.no_grad():
+        next_actions = torch.argmax(dql.primary_net.forward(batch_new_states), dim=1).view(-1, 1)
+        target_q_values = batch_rewards + dql.gamma * \
+            dql.target_net.forward(batch_new_states).gather(1, next_actions).squeeze(1).numpy()
+
+    loss_mean = ((actual_q_values - target_q_values) ** 2).mean()
+
+    dql.optimizer.zero_grad()
+    loss_mean.backward()
+    dql.optimizer.step()
+
+    return loss_mean.item()
+
+
+def loop_offline_episode(agent: CentralizedAgent, episode_data: np.ndarray, default_action_index: int,
+                         train: bool):
+
+    """
+    Reference implementation: offline episode processed step by step
+    """
+
+    action_indexes = [default_action_index] * user_num
+
+    for step in range(len(episode_data)):
+
+        step_data = episode_data[step]
+
+        new_states, _ = batch_state_process(step_data, state_feature_index_array, combination_num_index_array,
+                                            combination_den_index_array, state_bounds, user_num)
+        rewards, qos_per_user, cd_per_user = batch_reward_process(step_data, app_pdr_num_index, app_pdr_den_index,
+                                                                  app_max_delay_index, teleoperated_prr_requirement,
+                                                                  teleoperated_delay_requirement, action_indexes,
+                                                                  action_penalties, user_num, max_penalty, 0.5,
+                                                                  qos_bonus='delay')
+
+        states = [np.copy(new_state) for new_state in new_states]
+        _, q_values = agent.get_action(states, 0)
+
+        agent.update(action_indexes, q_values, rewards, states, qos_per_user, cd_per_user, 0, train)
+
+
+def dense_data_run(episode_num: int, step_num: int, data_folder: str):
+
+    """
+    Reference implementation: learning data preallocated for all the steps, saved as whole arrays at each checkpoint
+    """
+
+    total_step_num = step_num * episode_num
+    data = {'states': np.zeros((user_num, state_dim, total_step_num), dtype=np.float32),
+            'actions': np.zeros((user_num, len(action_labels), total_step_num), dtype=np.float32),
+            'q_values': np.zeros((user_num, len(action_labels), total_step_num), dtype=np.float32),
+            'chamfer_distances': np.zeros((user_num, total_step_num), dtype=np.float32),
+            'qos': np.zeros((user_num, total_step_num), dtype=np.float32),
+            'rewards': np.zeros((user_num, total_step_num), dtype=np.float32),
+            'temperatures': np.zeros(total_step_num, dtype=np.float32),
+            'losses': np.zeros(total_step_num, dtype=np.float32)}
+
+    save_time, written = 0, 0
+
+    for episode in range(episode_num):
+
+        if episode > 0 and episode % int(episode_num / 10) == 0:
+            start_time = time.time()
+            for name, array in data.items():
+                np.save(data_folder + name + '.npy', array)
+                written += os.path.getsize(data_folder + name + '.npy')
+            save_time += time.time() - start_time
+
+        action_indexes, q_values, rewards, states, qos, cds = random_episode(rng, user_num, step_num)
+        steps = slice(episode * step_num, (episode + 1) * step_num)
+
+        data['temperatures'][steps] = 0.5
+        data['actions'][:, :, steps] = np.eye(len(action_labels))[action_indexes].transpose(1, 2, 0)
+        data['q_values'][:, :, steps] = q_values.transpose(1, 2, 0)
+        data['rewards'][:, steps] = rewards.T
+        data['states'][:, :, steps] = states.transpose(1, 2, 0)
+        data['qos'][:, steps] = qos.T
+        data['chamfer_distances'][:, steps] = cds.T
+
+    return save_time, written
+
+
+def log_data_run(episode_num: int, step_num: int, data_folder: str):
+
+    """
+    Learning data of the agent, logged in the data folder
+    """
+
+    agent = build_agent(user_num, episode_num=episode_num)
+    agent.open_data(data_folder)
+
+    save_time = 0
+
+    for episode in range(episode_num):
+
+        if episode > 0 and episode % int(episode_num / 10) == 0:
+            start_time = time.time()
+            agent.save_data(data_folder)
+            save_time += time.time() - start_time
+
+        agent.update_episode(*random_episode(rng, user_num, step_num), 0.5, False)
+
+    # Each step is written once, at a checkpoint or when the buffers are full
+
+    return save_time, sum(os.path.getsize(agent.log.path(name)) for name in agent.log.shapes)
+
+
+def agent_results_run(test_folders: [str], episode_num: int):
+
+    """
+    Reference implementation: an agent per test folder, with the learning data of the whole test in memory
+    """
+
+    agents = []
+
+    for test_folder in test_folders:
+        agent = build_agent(user_num, episode_num=episode_num)
+        agent.load_data(test_folder)
+        agents.append(agent)
+
+    data_idx = agents[0].data_idx
+
+    state_data = [[np.mean(agent.state_data, axis=0)[i, :data_idx] for agent in agents] for i in range(state_dim)]
+    reward_data = [agent.reward_data.flatten()[:data_idx] for agent in agents]
+    chamfer_data = [agent.chamfer_data.flatten()[:data_idx] for agent in agents]
+
+    return state_data, reward_data, chamfer_data
+
+
+def test_results_run(test_folders: [str], episode_num: int):
+
+    """
+    Learning data of the test folders read by TestResults
+    """
+
+    results = [TestResults(test_folder) for test_folder in test_folders]
+
+    data_idx = results[0].data_idx
+
+    state_data = [[result.user_mean('states', data_idx, i) for result in results] for i in range(state_dim)]
+    reward_data = [result.user_values('rewards', data_idx) for result in results]
+    chamfer_data = [result.user_values('chamfer_distances', data_idx) for result in results]
+
+    return state_data, reward_data, chamfer_data
+
+
+def full_series_plot(values: np.ndarray, max_time: int, output_file: str):
+
+    """
+    Reference implementation: linear plot handing the whole series to seaborn
+    """
+
+    import pandas as pd
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    ax = plt.figure().add_subplot(111)
+
+    times = (np.arange(0, len(values)) * 100 / len(values)).astype(int) * max_time / 100 + 1
+
+    sns.lineplot(data=pd.DataFrame({'Value': values, 'Time': times}), ax=ax, x='Time', y='Value',
+                 hue=['Mean'] * len(values), markers=True, dashes=False, ci=None)
+
+    plt.savefig(output_file + '.png', bbox_inches='tight')
+    plt.close()
+
+
+def report(label: str, times: [float]):
+
+    print(label, "; mean [us]", np.mean(times) * 1e6, "; min [us]", np.min(times) * 1e6)
+
+
+def report_rate(label: str, times: [float]):
+
+    print(label, "; learning steps/s", 1 / np.mean(times), "; mean [us]", np.mean(times) * 1e6)
+
+
+if args['processing']:
+
+    step_data = random_step_data(rng, user_num)
+    last_actions = np.random.randint(0, len(action_labels), user_num)
+
+    def current():
+        state_process(step_data, state_feature_indexes, state_feature_normalization, combination_feature_indexes,
+                      combination_feature_normalization, state_dim, user_num, online=True)
+        reward_process(step_data, app_pdr_indexes, app_max_delay_index, teleoperated_prr_requirement,
+                       teleoperated_delay_requirement, last_actions, action_penalties, user_num, max_penalty, 0.5,
+                       online=True, qos_bonus='delay')
+
+    def batch():
+        batch_state_process(step_data, state_feature_index_array, combination_num_index_array,
+                            combination_den_index_array, state_bounds, user_num)
+        batch_reward_process(step_data, app_pdr_num_index, app_pdr_den_index, app_max_delay_index,
+                             teleoperated_prr_requirement, teleoperated_delay_requirement, last_actions,
+                             action_penalties, user_num, max_penalty, 0.5, qos_bonus='delay')
+
+    # Both implementations give the same results (tests/test_processing.py)
+
+    print("State and reward processing per step; users", user_num)
+    report("Current", timeit.repeat(current, number=1, repeat=repeat))
+    report("Batch", timeit.repeat(batch, number=1, repeat=repeat))
+
+if args['inference']:
+
+    agent = build_agent(user_num)
+    states = list(np.random.uniform(0, 1, (user_num, state_dim)))
+
+    print("Agent inference per step; users", user_num)
+    report("Per user", timeit.repeat(lambda: per_user_get_action(agent, states, 0.5), number=1, repeat=repeat))
+    report("Batch", timeit.repeat(lambda: agent.get_action(states, 0.5), number=1, repeat=repeat))
+
+if args['replay']:
+
+    memory_capacity = 10000
+    transition_num = memory_capacity + 1000
+
+    old_states = np.random.uniform(0, 1, (transition_num, int(np.sum(state_mask)))).astype(np.float32)
+    new_states = np.random.uniform(0, 1, (transition_num, int(np.sum(state_mask)))).astype(np.float32)
+    actions = np.random.randint(0, len(action_labels), transition_num)
+    rewards = np.random.uniform(-1, 1, transition_num)
+
+    list_memory = [[old_states[idx], actions[idx], rewards[idx], new_states[idx]]
+                   for idx in range(memory_capacity)]
+
+    print("Learning steps with a full memory replay; capacity", memory_capacity)
+
+    agent = build_agent(user_num, memory_capacity)
+    report_rate("List", timeit.repeat(lambda: list_replay_step(agent.dql, list_memory), number=1, repeat=repeat))
+
+    for label, prioritized_replay in [("Ring buffer", False), ("Prioritized", True)]:
+
+        agent = build_agent(user_num, memory_capacity, prioritized_replay)
+
+        # Fill the memory replay one user batch at a time, wrapping around the ring buffer
+
+        for start in range(0, transition_num, user_num):
+            end = min(start + user_num, transition_num)
+            agent.dql.store_transitions(old_states[start:end], actions[start:end], rewards[start:end],
+                                        new_states[start:end])
+
+        assert agent.dql.ready() and len(agent.dql.memory) == memory_capacity
+        assert np.array_equal(agent.dql.memory.states[0], old_states[memory_capacity])  # Oldest overwritten
+
+        report_rate(label, timeit.repeat(agent.dql.step, number=1, repeat=repeat))
+
+if args['learner']:
+
+    step_num = repeat
+    work = args['work'] / 1000
+
+    print("Episode with a full memory replay; users", user_num, "; steps", step_num, "; ns-3 time per step [ms]",
+          args['work'])
+
+    for label, async_learning in [("Synchronous", False), ("Asynchronous", True)]:
+
+        np.random.seed(0)
+        torch.manual_seed(0)
+        agent = build_agent(user_num, 1000, async_learning=async_learning)
+
+        transitions = np.random.uniform(0, 1, (2, 1000, int(np.sum(state_mask))))
+        agent.dql.store_transitions(transitions[0], np.random.randint(0, len(action_labels), 1000),
+                                    np.random.uniform(-1, 1, 1000), transitions[1])
+
+        episode_start_time = time.time()
+
+        for step in range(step_num):
+
+            time.sleep(work)  # ns-3 simulates the step while the agent waits on the shared memory
+
+            states = list(np.random.uniform(0, 1, (user_num, state_dim)))
+            actions, q_values = agent.get_action(states, 0.5)
+            agent.update(actions, q_values, np.random.uniform(-1, 1, user_num), states, np.zeros(user_num),
+                         np.zeros(user_num), 0.5, True)
+
+        agent_time = time.time() - episode_start_time
+        agent.synchronize()
+        episode_time = time.time() - episode_start_time
+
+        print(label, "; episode [s]", episode_time, "; loop [s]", agent_time, "; learning steps", agent.dql.learn_step)
+
+        agent.close()
+
+# Python process playing the ns-3 side of a RAN-AI simulation: it "simulates" each step for a while
+# (sleeping, as if ns-3 ran on another core), writes random statistics and waits for the actions
+
+ns3_peer = """
+import sys, time
+import numpy as np
+from py_interface import Init, Ns3AIRL, BLOCK_WAIT
+from settings.GeneralSettings import Env, Act
+key, size, block, user_num, step_num, work = [float(arg) for arg in sys.argv[1:]]
+Init(int(key), int(size))
+rl = Ns3AIRL(int(block), Env, Act, waitMode=BLOCK_WAIT)
+rl.SetCond(2, 0)
+stats = rl.env_array()
+for step in range(int(step_num)):
+    time.sleep(work)
+    with rl:
+        stats[:int(user_num)] = np.random.uniform(0, 1, (int(user_num), stats.shape[1]))
+        stats[:int(user_num), 0] = np.arange(1, user_num + 1)
+rl.m_obj.isFinish = True
+"""
+
+if args['env_num']:
+
+    step_num = repeat
+    work = args['work'] / 1000
+    env_nums = sorted({1, *[2 ** exp for exp in range(int(np.log2(args['env_num'])) + 1)], args['env_num']})
+
+    print("Concurrent episodes; users per environment", user_num, "; steps", step_num,
+          "; ns-3 time per step [ms]", args['work'])
+
+    Init(mempool_key, mem_size * args['env_num'] * len(env_nums))
+    block_key = memblock_key
+
+    for env_num in env_nums:
+
+        agent = build_agent(user_num * env_num, 1000)
+
+        rls = [Ns3AIRL(block_key + env_idx, Env, Act, waitMode=BLOCK_WAIT) for env_idx in range(env_num)]
+
+        episode_start_time = time.time()
+
+        peers = [subprocess.Popen([sys.executable, '-c', ns3_peer, str(mempool_key),
+                                   str(mem_size * args['env_num'] * len(env_nums)), str(block_key + env_idx),
+                                   str(user_num), str(step_num), str(work)]) for env_idx in range(env_num)]
+
+        run_vec_online_episode(len(action_labels), user_num, state_dim, max_penalty, 0.5, 0.5, 'dql', 0,
+                               action_labels, action_penalties, teleoperated_prr_requirement,
+                               teleoperated_delay_requirement, True, agent, rls, 'delay', step_num=step_num)
+
+        for peer in peers:
+            peer.wait()
+
+        episode_time = time.time() - episode_start_time
+        block_key += env_num
+
+        print("Environments", env_num, "; round [s]", episode_time, "; episodes/hour", env_num * 3600 / episode_time,
+              "; steps", agent.data_idx + 1)
+
+    FreeMemory()
+
+# Executable playing a warm or cold started ran-ai script: it sleeps for the library loading,
+# takes the episode parameters from the shared memory (warm start) and simulates the steps
+
+ns3_script = """#!{python}
+import os, sys, time
+sys.path.insert(0, {path!r})
+args = dict(arg[2:].split('=', 1) for arg in sys.argv[1:])
+time.sleep(float(args['startup']) / 1000)
+from ctypes import sizeof
+from py_interface import *
+from settings.GeneralSettings import Env, Act, Params, memblock_key
+values = dict(value.split('=') for value in os.environ['NS_GLOBAL_VALUE'].strip(';').split(';'))
+Init(int(values['SharedMemoryKey']), int(values['SharedMemoryPoolSize']))
+if 'paramBlockKey' in args:
+    key = int(args['paramBlockKey'])
+    params = Params.from_address(RegisterMemory(key, sizeof(Params)))
+    WaitMemoryCond(key, 2, 1)
+    AcquireMemoryCond(key, 2, 1)
+    first_vehicle_index = params.firstVehicleIndex
+    ReleaseMemory(key)
+rl = Ns3AIRL(memblock_key, Env, Act, waitMode=BLOCK_WAIT)
+rl.SetCond(2, 0)
+for step in range(int(args['steps'])):
+    time.sleep(float(args['work']) / 1000)
+    with rl:
+        pass
+rl.m_obj.isFinish = True
+"""
+
+if args['warm']:
+
+    episode_num = 10
+    step_num = repeat
+
+    print("Episode startup; episodes", episode_num, "; steps", step_num, "; ns-3 time per step [ms]", args['work'],
+          "; ns-3 library loading [ms]", args['startup'])
+
+    with tempfile.TemporaryDirectory() as ns3_path:
+
+        os.makedirs(os.path.join(ns3_path, 'build', 'scratch'))
+        script_path = os.path.join(ns3_path, 'build', 'scratch', 'ran-ai')
+
+        with open(script_path, 'w') as script:
+            script.write(ns3_script.format(python=sys.executable, path=os.path.abspath('.')))
+
+        os.chmod(script_path, 0o755)
+
+        setting = {'steps': step_num, 'work': args['work'], 'startup': args['startup']}
+
+        def startup_phase(label: str, warm: bool):
+
+            if warm:
+                experiment = WarmExperiment(mempool_key, mem_size, 'ran-ai', ns3_path, Params, param_block_key)
+            else:
+                experiment = Experiment(mempool_key, mem_size, 'ran-ai', ns3_path)
+
+            experiment.dirty = False  # Nothing to build
+
+            startup_times, episode_times = [], []
+
+            for episode in range(episode_num):
+
+                experiment.reset()
+                rl = Ns3AIRL(memblock_key, Env, Act, waitMode=BLOCK_WAIT)
+
+                episode_start_time = time.time()
+
+                if warm:
+                    experiment.run(setting, params={'firstVehicleIndex': episode + 1, 'rngRun': 1})
+                else:
+                    experiment.run(setting)
+
+                step = 0
+
+                while not rl.isFinish():
+                    with rl as data:
+                        if data is None:
+                            break
+                        if step == 0:
+                            startup_times.append(time.time() - episode_start_time)
+                        step += 1
+
+                experiment.proc.wait()  # ns-3 terminates after the last step
+                episode_times.append(time.time() - episode_start_time)
+
+            print(label, "; startup per episode [ms]", np.mean(startup_times) * 1e3, "; episode [s]",
+                  np.mean(episode_times))
+
+            experiment.kill()
+            del experiment
+
+        # The memory pool can be initialized once per process: each experiment runs in its own process
+
+        for label, warm in [("Cold", False), ("Warm", True)]:
+            phase = multiprocessing.get_context('fork').Process(target=startup_phase, args=(label, warm))
+            phase.start()
+            phase.join()
+
+if args['offline']:
+
+    vehicle_num, step_num = 50, 800
+
+    print("Offline episodes; vehicles", vehicle_num, "; actions", len(action_labels), "; users", user_num,
+          "; steps", step_num)
+
+    episode_data = np.stack([random_step_data(rng, user_num) for _ in range(step_num)]).astype(np.float32)
+
+    for train in [False, True]:
+
+        # The step loop is timed on a few episodes only (and so are the learning steps, with a full memory replay)
+
+        for label, episode_num in [("Step loop", 3), ("Whole episode", 3 if train else vehicle_num * len(action_labels))]:
+
+            np.random.seed(0)
+            torch.manual_seed(0)
+            agent = build_agent(user_num, 10000, episode_num=episode_num)
+
+            if train:
+                transitions = np.random.uniform(0, 1, (2, 10000, int(np.sum(state_mask))))
+                agent.dql.store_transitions(transitions[0], np.random.randint(0, len(action_labels), 10000),
+                                            np.random.uniform(-1, 1, 10000), transitions[1])
+
+            start_time = time.time()
+
+            for episode in range(episode_num):
+                action_index = episode % len(action_labels)
+                if label == "Step loop":
+                    loop_offline_episode(agent, episode_data, action_index, train)
+                else:
+                    run_offline_episode(user_num, state_dim, max_penalty, 0.5, action_index, action_penalties,
+                                        teleoperated_prr_requirement, teleoperated_delay_requirement, train, agent,
+                                        episode_data, 'delay')
+
+            episode_time = (time.time() - start_time) / episode_num
+
+            print(label, "; training", train, "; episode [ms]", episode_time * 1e3, "; 150 episodes [s]",
+                  episode_time * vehicle_num * len(action_labels), "; learning steps", agent.dql.learn_step)
+
+if args['plot_episode_num']:
+
+    from plot.Linearplot import linear_plot, decimation_methods
+    from plot.PlotEngine import PlotEngine
+
+    episode_num, step_num = args['plot_episode_num'], 800
+
+    print("Learning plots; users", user_num, "; episodes", episode_num, "; steps", step_num)
+
+    np.random.seed(0)
+    torch.manual_seed(0)
+    agent = build_agent(user_num, episode_num=episode_num)
+    agent.max_penalty = max_penalty
+
+    with tempfile.TemporaryDirectory() as plot_folder:
+
+        plot_folder += '/'
+
+        for folder in ['learn', 'state', 'performance']:
+            for user_idx in range(user_num):
+                os.makedirs(plot_folder + folder + '/' + str(user_idx))
+
+        agent.open_data(plot_folder)
+
+        for episode in range(episode_num):
+            agent.update_episode(*random_episode(rng, user_num, step_num), np.random.uniform(), False)
+
+        agent.save_data(plot_folder)
+
+        # A single figure, with the whole series and with the mean of each time bin
+
+        start_time = time.time()
+        full_series_plot(agent.reward_data[0, :agent.data_idx], episode_num, plot_folder + 'full')
+        print("Single figure, whole series [s]", time.time() - start_time)
+
+        start_time = time.time()
+        linear_plot(agent.reward_data[0, :agent.data_idx], 'Episode', 'Reward', episode_num, plot_folder + 'binned',
+                    plot_format=None)
+        print("Single figure, time bins [s]", time.time() - start_time)
+
+        # Rendering time and tikz file size of each decimation method, after a tenth of the run and the whole run
+
+        for method in decimation_methods:
+            for run_episode_num in [episode_num // 10, episode_num]:
+                start_time = time.time()
+                linear_plot(agent.reward_data[0, :run_episode_num * step_num], 'Episode', 'Reward', run_episode_num,
+                            plot_folder + method, plot_format='tex', decimation=method)
+                print("Decimation", method, "; episodes", run_episode_num, "; time [s]", time.time() - start_time,
+                      "; tex size [kB]", os.path.getsize(plot_folder + method + '.tex') / 1e3)
+
+        # plot_data: time blocking the caller, time until all the figures are rendered, time with unchanged data
+
+        for label, worker_num in [("Caller", 0), ("Background", 1)]:
+
+            if os.path.isfile(plot_folder + 'plot_hashes.json'):
+                os.remove(plot_folder + 'plot_hashes.json')  # Render all the figures again
+
+            agent.plots = PlotEngine(worker_num)
+
+            start_time = time.time()
+            agent.plot_data(plot_folder, episode_num)
+            return_time = time.time() - start_time
+            agent.wait_plots()
+            render_time = time.time() - start_time
+
+            start_time = time.time()
+            agent.plot_data(plot_folder, episode_num)
+            agent.wait_plots()
+            unchanged_time = time.time() - start_time
+
+            agent.plots.close()
+
+            print(label, "; plot_data return [s]", return_time, "; all figures [s]", render_time,
+                  "; unchanged data [s]", unchanged_time)
+
+if args['log_episode_num']:
+
+    import tracemalloc
+
+    episode_num, step_num = args['log_episode_num'], 800
+
+    print("Learning data checkpoints; users", user_num, "; episodes", episode_num, "; steps", step_num)
+
+    build_agent(user_num)  # Load the modules imported by the first agent, before the timings
+
+    for label, function in [("Whole arrays", dense_data_run), ("Training log", log_data_run)]:
+
+        with tempfile.TemporaryDirectory() as data_folder:
+
+            np.random.seed(0)
+            tracemalloc.start()
+            start_time = time.time()
+            save_time, written = function(episode_num, step_num, data_folder + '/')
+            run_time = time.time() - start_time
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(label, "; run [s]", run_time, "; checkpoints [s]", save_time, "; written [MB]", written / 1e6,
+                  "; peak memory [MB]", peak / 1e6)
+
+if args['results_episode_num']:
+
+    import tracemalloc
+    from utils.TestResults import TestResults
+
+    episode_num, step_num, test_num = args['results_episode_num'], 800, 10
+
+    print("Test results; tests", test_num, "; users", user_num, "; episodes", episode_num, "; steps", step_num)
+
+    with tempfile.TemporaryDirectory() as results_folder:
+
+        test_folders = [results_folder + '/' + str(test_idx) + '/' for test_idx in range(test_num)]
+
+        np.random.seed(0)
+
+        for test_folder in test_folders:
+            agent = build_agent(user_num, episode_num=episode_num)
+            agent.open_data(test_folder)
+            for episode in range(episode_num):
+                agent.update_episode(*random_episode(rng, user_num, step_num), 0.5, False)
+            agent.save_data(test_folder)
+
+        outputs = []
+
+        for label, function in [("Agents", agent_results_run), ("TestResults", test_results_run)]:
+
+            tracemalloc.start()
+            start_time = time.time()
+            outputs.append(function(test_folders, episode_num))
+            run_time = time.time() - start_time
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(label, "; time [s]", run_time, "; peak memory [MB]", peak / 1e6)
+
+        # Both give the same series (tests/test_test_results.py)
+
+        # Summaries of the series, computed and cached in the test folders, then read from the cache
+
+        for label in ["Summaries, computed", "Summaries, cached"]:
+
+            start_time = time.time()
+            results = [TestResults(test_folder) for test_folder in test_folders]
+            data_idx = results[0].data_idx
+            summaries = [[result.summary('rewards', data_idx)] +
+                         [result.summary('states', data_idx, i) for i in range(state_dim)] for result in results]
+            print(label, "; time [s]", time.time() - start_time)
+
+        # Violin plot of the rewards of the tests, with all the values and with their quantiles
+
+        from plot.Violinplot import multi_violinplot
+
+        quantile_data = [np.array(test_summaries[0]['quantiles'], dtype=np.float32) for test_summaries in summaries]
+
+        for label, data in [("All the values", outputs[1][1]), ("Quantiles", quantile_data)]:
+
+            start_time = time.time()
+            multi_violinplot(data, [str(test_idx // 2) for test_idx in range(test_num)],
+                             [str(test_idx % 2) for test_idx in range(test_num)], 'Reward', 'Test', 'Run',
+                             results_folder + '/violin', plot_format='png')
+            print("Violin plot,", label, "; values per test", len(data[0]), "; time [s]", time.time() - start_time)
@@ -39,6 +39,7 @@
 #include "ns3/burst-sink-helper.h"
 #include "ns3/bursty-app-stats-calculator.h"
 #include "ns3/kitti-trace-burst-generator.h"
+#include "ns3/ns3-ai-module.h"
 
 using namespace ns3;
 using namespace mmwave;
@@ -47,6 +48,13 @@ NS_LOG_COMPONENT_DEFINE ("GemvIntegrationExample");
 
 #define MAX_NUM_USERS 50 // maximum number of users
 
+// Parameters of the episode, written by the python script when the simulation is warm started
+struct ranAIParams
+{
+  uint32_t firstVehicleIndex;
+  uint32_t rngRun;
+} Packed;
+
 static void
 RxBurstCallback (uint32_t nodeId, Ptr<BurstyAppStatsCalculator> statsCalculator, Ptr<const Packet> burst, const Address &from,
          const Address &to, const SeqTsSizeFragHeader &header)
@@ -82,6 +90,8 @@ main (int argc, char *argv[])
   bool idealActionUpdate = true;
   bool useFakeRanAi = false;
   bool additionalDelay = true;
+  uint16_t memBlockKey = 2333;
+  uint16_t paramBlockKey = 0;
 
   CommandLine cmd;
   cmd.AddValue ("numUes", "Number of UE nodes", numUes);
@@ -103,7 +113,23 @@ main (int argc, char *argv[])
   cmd.AddValue ("idealActionUpdate", "Decide whether or not to send a real packet to communicate the action from the RAN-AI", idealActionUpdate);
   cmd.AddValue ("useFakeRanAi", "Use a fake RAN AI", useFakeRanAi);
   cmd.AddValue ("additionalDelay", "True in case you want to account for encoding/decoding delay", additionalDelay);
+  cmd.AddValue ("memBlockKey", "Key of the RAN-AI shared memory block, unique among concurrent simulations", memBlockKey);
+  cmd.AddValue ("paramBlockKey", "Key of the shared memory block with the episode parameters (warm start), "
+                                 "0 to take them from the command line", paramBlockKey);
   cmd.Parse (argc, argv);
+
+  if (paramBlockKey != 0)
+    {
+      // Warm start: the process is launched ahead of the episode and, with all the
+      // libraries loaded, sleeps until the python script writes the episode parameters
+      SharedMemoryPool *pool = SharedMemoryPool::Get ();
+      ranAIParams *params = (ranAIParams *) pool->RegisterMemory (paramBlockKey, sizeof (ranAIParams));
+      pool->WaitMemoryCond (paramBlockKey, 2, 1);
+      pool->AcquireMemoryCond (paramBlockKey, 2, 1);
+      firstVehicleIndex = params->firstVehicleIndex;
+      RngSeedManager::SetRun (params->rngRun);
+      pool->ReleaseMemory (paramBlockKey);
+    }
   
   Config::SetDefault ("ns3::MmWaveBearerStatsCalculator::AggregatedStats", BooleanValue (true));
   Config::SetDefault ("ns3::MmWaveBearerStatsCalculator::EpochDuration", TimeValue (Seconds (0.1)));
@@ -381,7 +407,7 @@ main (int argc, char *argv[])
     {
       if (!useFakeRanAi)
       {
-        mmWaveHelper->InstallRanAI (rsuDevs, imsiApplication, statsCalculator);        
+        mmWaveHelper->InstallRanAI (rsuDevs, imsiApplication, statsCalculator, memBlockKey);
       }
       else
       {
@@ -1,10 +1,14 @@
 import sem
 import pandas as pd
+import numpy as np
+import multiprocessing
 import os
 import sys
 import argparse
 sys.path.insert(1, '../../')
 from scripts.mmwavePlotUtils import read_ran_ai
+from utils.OfflineDataset import convert_offline_dataset, episode_array, episode_file
+from settings.StateSettings import env_features
 
 parser = argparse.ArgumentParser()
 
@@ -15,9 +19,36 @@ parser.add_argument('-rep', '--repetition', type=int, default=1) # Repetition pe
 parser.add_argument('-sim_duration', '--sim_duration', type=int, default=85) # Simulation duration
 parser.add_argument('-ideal_update', '--ideal_update', action='store_const', const=True, default=False) # Ideal or real update of the agent action
 parser.add_argument('-add_delay', '--add_delay', action='store_const', const=True, default=False)  # Consider the additional delay due to data encoding
+parser.add_argument('-workers', '--workers', type=int, default=os.cpu_count())  # Processes parsing the simulation outputs
 
 args = vars(parser.parse_args())
 
+
+def process_episode(job: ()):
+
+    """
+    Parse the RanAiStats.txt file of an episode and save its (step, user, env feature) array
+    """
+
+    source, target = job
+
+    with open(source) as file:
+        rows = read_ran_ai({'output': {'RanAiStats.txt': file.read()}})
+
+    # The first column is the time, the others are the environment features
+
+    episode_data = pd.DataFrame(np.asarray(rows, dtype=np.float32)[:, 1:], columns=env_features)
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    with open(target + '.tmp', 'wb') as file:
+        np.save(file, episode_array(episode_data))
+
+    os.replace(target + '.tmp', target)
+
+    return target
+
+
 pd.set_option("display.max_rows", 100000, "display.max_columns", 100000)
 
 campaign_name = 'trial'
@@ -84,9 +115,25 @@ overall_list = sem.list_param_combinations(params_grid)
 if args['run']:
     campaign.run_missing_simulations(overall_list)
 
+# Process the data of the ns3 simulations: the campaign database is read once and
+# the RanAiStats.txt file of each episode is parsed in a pool of processes
+
 results = campaign.db.get_results()
 
-# Process the data of the ns3 simulations
+fixed_params = {key: value for key, value in params_grid.items() if not isinstance(value, list)}
+
+episode_results = {}
+
+for result in results:
+
+    params = result['params']
+
+    if any(params.get(key) != value for key, value in fixed_params.items()):
+        continue
+
+    episode_results.setdefault((params['RngRun'], params['firstVehicleIndex'], params['kittiModel']), result)
+
+jobs = []
 
 run = -1
 
@@ -98,19 +145,28 @@ for rng in rng_range:
 
         for kittiModel in application_range:
 
-            params_grid["firstVehicleIndex"] = vehicleIndex
-            params_grid["kittiModel"] = kittiModel
+            result = episode_results.get((rng, vehicleIndex, kittiModel))
+
+            if result is None:
+                print("Missing simulation: RngRun", rng, "; firstVehicleIndex", vehicleIndex, "; kittiModel", kittiModel)
+                continue
+
+            source = campaign.db.get_result_files(result)['RanAiStats.txt']
+            target = process_path + str(run) + '/' + str(kittiModel) + '/' + episode_file
+
+            # Skip the episodes already processed after their simulation
+
+            if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+                continue
 
-            overall_list = sem.list_param_combinations(params_grid)
+            jobs.append((source, target))
 
-            results = campaign.get_results_as_dataframe(read_ran_ai,
-                                                        params=overall_list,
-                                                        verbose=True,
-                                                        parallel_parsing=False)
+print("Episodes to process", len(jobs), "; up to date", len(episode_results) - len(jobs))
 
-            new_outputs_path = process_path + str(run) + '/' + str(kittiModel) + '/'
+with multiprocessing.Pool(args['workers']) as pool:
+    for done, target in enumerate(pool.imap_unordered(process_episode, jobs)):
+        print("Processed", done + 1, "/", len(jobs), ":", target)
 
-            if not os.path.exists(new_outputs_path):
-                os.makedirs(new_outputs_path)
+# Store the episodes of the scenario in the columnar offline dataset
 
-            results.to_pickle(new_outputs_path + 'data.pkl')
+convert_offline_dataset(process_path)
@@ -1,4 +1,4 @@
-from agent.Agent import CentralizedAgent
+from utils.TestResults import TestResults
 from plot.Boxplot import multi_boxplot
 from plot.Violinplot import multi_violinplot
 from plot.Histplot import multi_histplot
@@ -26,6 +26,8 @@ parser.add_argument('-power', '--power', type=int, default=23)
 parser.add_argument('-alpha', '--alpha', type=float, default=1.0)
 parser.add_argument('-update', '--update', type=str, default='real')
 parser.add_argument('-format', '--format', type=str, default='png')
+# Plot the distributions of all the values, instead of their quantiles (cached in the test folders)
+parser.add_argument('-full', '--full', action='store_const', const=True, default=False)
 args = vars(parser.parse_args())
 
 plot_points: int = 100
@@ -176,32 +178,27 @@ for data_type in ['state', 'performance']:
         os.makedirs(output_folder + data_type + '/')
 
 test_num = len(test_folders)
-agents = []
 max_penalty = reward_penalty + np.max([cf_mean_per_action[action] for action in action_labels])
 
-for i, user_num in enumerate(user_per_test):
-    agent = CentralizedAgent(step_num,
-                             episode_num,
-                             state_dim,
-                             action_num,
-                             user_num,
-                             state_full_labels,
-                             action_labels,
-                             state_normalization,
-                             state_mask=state_mask,
-                             gamma=1,
-                             batch_size=1,
-                             target_replace=1,
-                             memory_capacity=1,
-                             learning_rate=1,
-                             eps=1,
-                             weight_decay=1)
-
-    agent.load_data(test_folders[i])
-
-    agent.max_penalty = max_penalty
-
-    agents.append(agent)
+# The learning data of the tests is read lazily, and reduced when plotted
+
+results = [TestResults(test_folder) for test_folder in test_folders]
+
+
+def plotted_values(result: TestResults, name: str, value_num: int, index: int = None):
+
+    """
+    Values of a distribution plot: the quantiles of the series, or the whole series (see TestResults.summary)
+    """
+
+    if args['full'] and index is not None:
+        return result.user_mean(name, value_num, index)
+
+    if args['full']:
+        return result.user_values(name, value_num)
+
+    return np.array(result.summary(name, value_num, index)['quantiles'], dtype=np.float32)
+
 
 # States
 
@@ -216,16 +213,16 @@ if plot_state:
         state_full_label = state_full_labels[i]
         min_value, max_value = state_normalization[i]
 
-        data_idx = agents[0].data_idx
+        data_idx = results[0].data_idx
 
         for j in range(test_num):
-            agent = agents[j]
+            result = results[j]
             label = label_per_test[j]
             legend = legend_per_test[j]
 
-            state_data = np.mean(agent.state_data, axis=0) * (max_value - min_value) + min_value
+            state_data = plotted_values(result, 'states', data_idx, i) * (max_value - min_value) + min_value
 
-            multi_data.append(state_data[i, :data_idx])
+            multi_data.append(state_data)
 
             multi_labels.append(label)
             multi_legends.append(legend)
@@ -260,16 +257,16 @@ if plot_perf:
     multi_labels = []
     multi_legends = []
 
-    data_idx = agents[0].data_idx
+    data_idx = results[0].data_idx
 
     for j in range(test_num):
-        agent = agents[j]
+        result = results[j]
         label = label_per_test[j]
         legend = legend_per_test[j]
 
-        reward_data = agent.reward_data.flatten()
+        reward_data = plotted_values(result, 'rewards', data_idx)
 
-        multi_data.append(reward_data[:data_idx])
+        multi_data.append(reward_data)
         multi_labels.append(label)
         multi_legends.append(legend)
 
@@ -299,16 +296,16 @@ if plot_perf:
     multi_labels = []
     multi_legends = []
 
-    data_idx = agents[0].data_idx
+    data_idx = results[0].data_idx
 
     for j in range(test_num):
-        agent = agents[j]
+        result = results[j]
         label = label_per_test[j]
         legend = legend_per_test[j]
 
-        qos_data = agent.qos_data.flatten()
+        qos_data = plotted_values(result, 'qos', data_idx)
 
-        multi_data.append(qos_data[:data_idx])
+        multi_data.append(qos_data)
         multi_labels.append(label)
         multi_legends.append(legend)
 
@@ -338,16 +335,16 @@ if plot_perf:
     multi_labels = []
     multi_legends = []
 
-    data_idx = agents[0].data_idx
+    data_idx = results[0].data_idx
 
     for j in range(test_num):
-        agent = agents[j]
+        result = results[j]
         label = label_per_test[j]
         legend = legend_per_test[j]
 
-        chamfer_data = agent.chamfer_data.flatten()
+        chamfer_data = plotted_values(result, 'chamfer_distances', data_idx)
 
-        multi_data.append(chamfer_data[:data_idx])
+        multi_data.append(chamfer_data)
         multi_labels.append(label)
         multi_legends.append(legend)
 
@@ -377,16 +374,16 @@ if plot_perf:
     multi_labels = []
     multi_legends = []
 
-    data_idx = agents[0].data_idx
+    data_idx = results[0].data_idx
 
     for j in range(test_num):
-        agent = agents[j]
+        result = results[j]
         label = label_per_test[j]
         legend = legend_per_test[j]
 
-        qoe_data = (max_penalty - agent.chamfer_data.flatten()) / max_penalty
+        qoe_data = (max_penalty - plotted_values(result, 'chamfer_distances', data_idx)) / max_penalty
 
-        multi_data.append(qoe_data[:data_idx])
+        multi_data.append(qoe_data)
         multi_labels.append(label)
         multi_legends.append(legend)
 
@@ -1,4 +1,5 @@
 import numpy as np
+from collections import namedtuple
 import pandas as pd
 import seaborn as sns
 import tikzplotlib
@@ -12,6 +13,111 @@ matplotlib.rcParams['figure.figsize'] = 64/9, 4
 import matplotlib.pyplot as plt
 plt.title(r'ABC123 vs $\mathrm{ABC123}^{123}$')
 
+# Number of bins of the time axis: the values of a bin are plotted as their mean
+
+time_bin_num = 100
+
+# Decimation methods: the mean of each bin ('mean'), the mean with the range of the values of the bin ('minmax'),
+# or the points chosen by the Largest-Triangle-Three-Buckets algorithm ('lttb')
+
+decimation_methods = ['mean', 'minmax', 'lttb']
+
+# Decimated series: times and values of the points to plot, with the lower and upper bounds of their bins ('minmax')
+
+DecimatedSeries = namedtuple('DecimatedSeries', ['times', 'values', 'lower', 'upper'])
+
+
+def lttb_indexes(data_values: np.ndarray, point_num: int):
+
+    """
+    Indexes of the point_num values chosen by Largest-Triangle-Three-Buckets: the first and the last value,
+    and in each bucket the value forming the largest triangle with the previous point and the mean of the next bucket
+    """
+
+    value_num = len(data_values)
+
+    bounds = (np.arange(0, point_num - 1) * (value_num - 2) / (point_num - 2)).astype(int) + 1
+    bounds[-1] = value_num - 1
+
+    indexes = np.zeros(point_num, dtype=int)
+    indexes[-1] = value_num - 1
+
+    for bucket in range(point_num - 2):
+        start, end = bounds[bucket], bounds[bucket + 1]
+
+        if bucket + 2 < len(bounds):
+            next_start, next_end = end, bounds[bucket + 2]
+        else:
+            next_start, next_end = value_num - 1, value_num
+
+        next_x, next_y = (next_start + next_end - 1) / 2, np.mean(data_values[next_start:next_end])
+        prev_x, prev_y = indexes[bucket], data_values[indexes[bucket]]
+
+        areas = np.abs((prev_x - next_x) * (data_values[start:end] - prev_y) -
+                       (prev_x - np.arange(start, end)) * (next_y - prev_y))
+
+        indexes[bucket + 1] = start + np.argmax(areas)
+
+    return indexes
+
+
+def decimate(distribution_data: np.ndarray, max_time: int, point_num: int = time_bin_num, method: str = 'mean'):
+
+    """
+    Reduce a series to at most point_num points on the time axis [1, max_time + 1), before plotting.
+    With 'mean', the values of each bin are averaged, as seaborn does with the values that have the same time:
+    the figure is the same, but seaborn gets one value per bin instead of the whole series
+    """
+
+    if method not in decimation_methods:
+        raise ValueError('Unknown decimation method ' + str(method))
+
+    data_values = np.asarray(distribution_data, dtype=np.float64)
+
+    value_num = len(data_values)
+
+    if method == 'lttb':
+
+        if value_num > point_num > 2:
+            indexes = lttb_indexes(data_values, point_num)
+        else:
+            indexes = np.arange(0, value_num)
+
+        return DecimatedSeries(indexes * max_time / max(value_num, 1) + 1, data_values[indexes], None, None)
+
+    bins = (np.arange(0, value_num) * point_num / max(value_num, 1)).astype(int)
+
+    if value_num <= point_num:
+        return DecimatedSeries(bins * max_time / point_num + 1, data_values, None, None)  # One value per bin
+
+    # Every bin has at least a value
+
+    valid = ~np.isnan(data_values)
+
+    with np.errstate(invalid='ignore'):
+        means = (np.bincount(bins[valid], weights=data_values[valid], minlength=point_num) /
+                 np.bincount(bins[valid], minlength=point_num))
+
+    times = np.arange(0, point_num) * max_time / point_num + 1
+
+    if method == 'mean':
+        return DecimatedSeries(times, means, None, None)
+
+    starts = np.searchsorted(bins, np.arange(0, point_num))
+
+    return DecimatedSeries(times, means, np.fmin.reduceat(data_values, starts), np.fmax.reduceat(data_values, starts))
+
+
+def plot_ranges(ax, series: [DecimatedSeries], palette):
+
+    # Range of the values of each bin, in the color of the line of the series
+
+    colors = sns.color_palette(palette, n_colors=len(series))
+
+    for values, color in zip(series, colors):
+        if values.lower is not None:
+            ax.fill_between(values.times, values.lower, values.upper, color=color, alpha=0.3, linewidth=0)
+
 
 def linear_plot(distribution_data: np.ndarray,
                 x_label: str,
@@ -21,7 +127,9 @@ def linear_plot(distribution_data: np.ndarray,
                 palette=None,
                 lim: [] = None,
                 plot_format='eps',
-                plot_sizes=None):
+                plot_sizes=None,
+                decimation='mean',
+                point_num=time_bin_num):
 
     if plot_sizes is not None:
         fig = plt.figure(figsize=plot_sizes)
@@ -30,16 +138,16 @@ def linear_plot(distribution_data: np.ndarray,
 
     ax = fig.add_subplot(111)
 
-    data_values = np.array(distribution_data, dtype=np.float32)
+    # The series can be decimated by the caller
 
-    value_num = len(data_values)
+    if not isinstance(distribution_data, DecimatedSeries):
+        distribution_data = decimate(distribution_data, max_time, point_num, decimation)
 
-    data_times = (np.arange(0, value_num) * 100 / value_num).astype(np.int) * max_time / 100
-    data_hues = ['Mean'] * len(data_values)
+    data_hues = ['Mean'] * len(distribution_data.values)
 
-    data_times += 1
+    data = pd.DataFrame({'Value': distribution_data.values, 'Time': distribution_data.times})
 
-    data = pd.DataFrame({'Value': data_values, 'Time': data_times})
+    plot_ranges(ax, [distribution_data], palette)
 
     sns.lineplot(data=data, ax=ax, x='Time', y='Value', hue=data_hues, markers=True, dashes=False, ci=None, palette=palette)
 
@@ -73,7 +181,9 @@ def multi_linear_plot(distribution_data: [np.ndarray],
                       palette=None,
                       lim: [] = None,
                       plot_format='eps',
-                      plot_sizes=None):
+                      plot_sizes=None,
+                      decimation='mean',
+                      point_num=time_bin_num):
 
     if plot_sizes is not None:
         fig = plt.figure(figsize=plot_sizes)
@@ -82,28 +192,29 @@ def multi_linear_plot(distribution_data: [np.ndarray],
 
     ax = fig.add_subplot(111)
 
+    # The series can be decimated by the caller
+
+    distribution_data = [values if isinstance(values, DecimatedSeries) else
+                         decimate(values, max_time, point_num, decimation) for values in distribution_data]
+
     data_values = np.array([], dtype=np.float32)
 
     data_labels = []
 
-    data_times = np.array([], dtype=np.int)
+    data_times = np.array([], dtype=np.float64)
 
     for values, label in zip(distribution_data, distribution_labels):
 
-        value_num = len(values)
-
-        data_values = np.concatenate((data_values, values))
+        data_values = np.concatenate((data_values, values.values))
 
-        data_labels += [str(label)] * value_num
+        data_labels += [str(label)] * len(values.values)
 
-        times = (np.arange(0, value_num) * 100 / value_num).astype(np.int) * max_time / 100
-
-        times += 1
-
-        data_times = np.concatenate((data_times, times))
+        data_times = np.concatenate((data_times, values.times))
 
     data = pd.DataFrame({'Value': data_values, 'Label': data_labels, 'Time': data_times})
 
+    plot_ranges(ax, distribution_data, palette)
+
     plot = sns.lineplot(data=data, ax=ax, x='Time', y='Value', hue='Label', markers=True, dashes=False, ci=None, palette=palette)
 
     ax.grid(b=True, color='darkgrey', linestyle='-')
@@ -0,0 +1,208 @@
+import os
+import json
+import hashlib
+import multiprocessing
+import concurrent.futures
+import numpy as np
+from plot.Linearplot import linear_plot, multi_linear_plot, decimate, time_bin_num
+
+hash_file = 'plot_hashes.json'  # Data hashes of the figures of a data folder
+
+# Rendering processes, shared by the plot engines of the process
+
+render_pool = None
+
+
+def get_render_pool(worker_num: int):
+
+    """
+    Create the rendering processes on the first call and fork them at once: the first plot engine is created
+    before the agent starts its learner thread and runs torch, and forking a multithreaded process can deadlock
+    the child (the spawn and forkserver methods would run again the unguarded scripts in each process)
+    """
+
+    global render_pool
+
+    if render_pool is None:
+        render_pool = concurrent.futures.ProcessPoolExecutor(worker_num,
+                                                             mp_context=multiprocessing.get_context('fork'))
+        concurrent.futures.wait([render_pool.submit(os.getpid) for _ in range(worker_num)])
+
+    return render_pool
+
+
+def update_hash(digest, value):
+
+    # Arrays by content, sequences item by item, anything else by representation
+
+    if isinstance(value, np.ndarray):
+        digest.update((str(value.dtype) + str(value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            update_hash(digest, item)
+        digest.update(b']')
+
+    else:
+        digest.update(repr(value).encode())
+
+
+def data_hash(*args, **kwargs) -> str:
+
+    """
+    Hash of the arguments of a plot function
+    """
+
+    digest = hashlib.sha1()
+
+    update_hash(digest, args)
+    update_hash(digest, sorted(kwargs.items()))
+
+    return digest.hexdigest()
+
+
+class PlotEngine(object):
+    """
+    class PlotEngine
+    It renders the figures in a pool of background processes, so that the caller does not wait for them.
+    The series are decimated before leaving the caller, and a figure is rendered again only if
+    its data changed since the last time (the hashes are kept in the data folder)
+
+    """
+
+    def __init__(self, worker_num: int = 1, decimation: str = 'mean', point_num: int = time_bin_num):
+
+        # Number of rendering processes (0: the figures are rendered by the caller)
+
+        self.worker_num: int = worker_num
+        self.executor = get_render_pool(worker_num) if worker_num > 0 else None
+
+        # Decimation method and maximum number of points of the series (see decimate)
+
+        self.decimation: str = decimation
+        self.point_num: int = point_num
+
+        self.data_folder: str = None
+        self.hashes: dict = {}  # Output file -> data hash of the figure rendered
+        self.pending: dict = {}  # Output file -> (future, data hash) of the figures being rendered
+
+    def open(self, data_folder: str):
+
+        """
+        Start plotting in a data folder, loading the hashes of its figures
+        """
+
+        if data_folder == self.data_folder:
+            self.collect()
+            return
+
+        self.wait()
+
+        self.data_folder = data_folder
+        self.hashes = {}
+
+        if os.path.isfile(os.path.join(data_folder, hash_file)):
+            with open(os.path.join(data_folder, hash_file)) as file:
+                self.hashes = json.load(file)
+
+    def submit(self, function, output_file: str, *args, **kwargs):
+
+        """
+        Render a figure (output_file is the output file of the plot function, also in args or kwargs)
+        """
+
+        output_file = output_file.replace(" ", "_")
+        digest = data_hash(function.__name__, *args, **kwargs)
+
+        if output_file in self.pending:
+
+            future, pending_digest = self.pending[output_file]
+
+            if pending_digest == digest:
+                return
+
+            # Replace the figure not rendered yet, or let the one being rendered finish first
+
+            if future.cancel():
+                del self.pending[output_file]
+            else:
+                concurrent.futures.wait([future])
+                self.collect()
+
+        if self.hashes.get(output_file) == digest and os.path.isfile(output_file + '.png'):
+            return
+
+        if self.worker_num == 0:
+            function(*args, **kwargs)
+            self.hashes[output_file] = digest
+            return
+
+        self.pending[output_file] = (self.executor.submit(function, *args, **kwargs), digest)
+
+    def linear_plot(self, distribution_data: np.ndarray, x_label: str, y_label: str, max_time: int,
+                    output_file: str, **kwargs):
+
+        self.submit(linear_plot, output_file, decimate(distribution_data, max_time, self.point_num, self.decimation),
+                    x_label, y_label, max_time, output_file, **kwargs)
+
+    def multi_linear_plot(self, distribution_data: [np.ndarray], distribution_labels: [str], x_label: str,
+                          y_label: str, max_time: int, output_file: str, **kwargs):
+
+        self.submit(multi_linear_plot, output_file,
+                    [decimate(values, max_time, self.point_num, self.decimation) for values in distribution_data],
+                    list(distribution_labels), x_label, y_label, max_time, output_file, **kwargs)
+
+    def collect(self):
+
+        """
+        Record the figures rendered so far, raising in the caller the errors of the rendering processes
+        """
+
+        for output_file, (future, digest) in list(self.pending.items()):
+
+            if not future.done():
+                continue
+
+            del self.pending[output_file]
+
+            if future.cancelled():
+                continue
+
+            if future.exception() is not None:
+                raise RuntimeError("The plot of " + output_file + " failed") from future.exception()
+
+            self.hashes[output_file] = digest
+
+        self.save()
+
+    def wait(self):
+
+        """
+        Wait for the figures being rendered
+        """
+
+        concurrent.futures.wait([future for future, _ in self.pending.values()])
+
+        self.collect()
+
+    def save(self):
+
+        if self.data_folder is None:
+            return
+
+        tmp_path = os.path.join(self.data_folder, hash_file + '.tmp')
+
+        with open(tmp_path, 'w') as file:
+            json.dump(self.hashes, file)
+
+        os.replace(tmp_path, os.path.join(self.data_folder, hash_file))
+
+    def close(self):
+
+        """
+        Wait for the figures being rendered (the rendering processes are kept for the next engines)
+        """
+
+        self.wait()
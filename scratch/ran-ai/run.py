@@ -1,8 +1,10 @@
-from py_interface import FreeMemory, Experiment
+from py_interface import FreeMemory, Experiment, VecExperiment, WarmExperiment
 from utils.Simulation import get_input, initialize_simulation
-from utils.Episode import initialize_online_episode, initialize_offline_episode, finalize_episode
-from utils.OnlineRun import run_online_episode
+from utils.Episode import initialize_online_episode, initialize_vec_online_episode, initialize_offline_episode, \
+    finalize_episode
+from utils.OnlineRun import run_online_episode, run_vec_online_episode
 from utils.OfflineRun import run_offline_episode
+from utils.OfflineDataset import load_offline_dataset
 from agent.Agent import CentralizedAgent
 from settings.GeneralSettings import *
 from settings.StateSettings import state_dim, state_full_labels, state_normalization, state_mask
@@ -56,13 +58,29 @@ parser.add_argument('-update', '--update', type=str, default='real') # Ideal/rea
 parser.add_argument('-delay', '--delay', type=str, default='none') # Additional delay for data encoding
 parser.add_argument('-offline', '--offline', action='store_const', const=True, default=False) # Dermine wheter run an offline simulation
 parser.add_argument('-format', '--format', type=str, default=None) # Format of the output plots
+parser.add_argument('-prioritized', '--prioritized_replay', action='store_const', const=True, default=False) # Prioritized memory replay
+parser.add_argument('-async', '--async_learning', action='store_const', const=True, default=False) # Learning steps in a background thread
+parser.add_argument('-update_ratio', '--update_ratio', type=float, default=1.0) # Learning steps per environment step
+parser.add_argument('-sync_interval', '--sync_interval', type=int, default=100) # Learning steps between two weight syncs
+parser.add_argument('-env', '--env_num', type=int, default=1) # Number of concurrent ns-3 simulations (online only)
+parser.add_argument('-warm', '--warm_num', type=int, default=0) # Number of ns-3 scripts launched ahead of the episodes (online only)
+parser.add_argument('-plot_workers', '--plot_workers', type=int, default=1) # Processes rendering the plots (0: no background rendering)
+parser.add_argument('-decimation', '--decimation', type=str, default='mean') # Decimation of the learning plots (mean, minmax or lttb)
+parser.add_argument('-plot_points', '--plot_points', type=int, default=100) # Maximum number of points of a learning plot series
 
 # Get input parameters
 
+args = vars(parser.parse_args())
+prioritized_replay = args['prioritized_replay']
+async_learning, update_ratio, sync_interval = args['async_learning'], args['update_ratio'], args['sync_interval']
+env_num = args['env_num']
+warm_num = args['warm_num']
+plot_workers, plot_decimation, plot_point_num = args['plot_workers'], args['decimation'], args['plot_points']
+
 algorithm_training, algorithm_testing, agent_policy, running, offline_folder, transfer, \
     user_num, tx_power, reward_penalty, multi_reward_alpha, episode_num, step_num, ideal_update, additional_delay, offline_running, \
     input_user_num, input_tx_power, input_reward_penalty, input_multi_reward_alpha, input_episode_num, input_step_num, \
-    input_ideal_update, input_additional_delay, input_offline_running, plot_format, mode = get_input(vars(parser.parse_args()))
+    input_ideal_update, input_additional_delay, input_offline_running, plot_format, mode = get_input(args)
 
 # Determine the KPI of the communication services
 
@@ -77,6 +95,14 @@ elif mode == 'mapsharing':
 else:
     raise ValueError
 
+# With concurrent simulations, the agent controls the users of all the environments
+# and each of its episodes gathers env_num simulated episodes
+
+assert env_num == 1 or not offline_running
+assert warm_num == 0 or env_num == 1
+agent_user_num = user_num * env_num
+agent_episode_num = -(-episode_num // env_num)
+
 for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_reward_alpha):
 
     # Action space
@@ -93,8 +119,8 @@ for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_rewa
     agent = CentralizedAgent(state_dim=state_dim,
                              action_num=action_num,
                              step_num=step_num,
-                             episode_num=episode_num,
-                             user_num=user_num,
+                             episode_num=agent_episode_num,
+                             user_num=agent_user_num,
                              state_labels=state_full_labels,
                              action_labels=action_labels,
                              state_normalization=state_normalization,
@@ -106,6 +132,13 @@ for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_rewa
                              learning_rate=0.00001,
                              eps=0.001,
                              weight_decay=0.0001,
+                             prioritized_replay=prioritized_replay,
+                             async_learning=async_learning,
+                             update_ratio=update_ratio,
+                             sync_interval=sync_interval,
+                             plot_workers=plot_workers,
+                             plot_decimation=plot_decimation,
+                             plot_point_num=plot_point_num,
                              format=plot_format)
 
     # Initialize simulation
@@ -156,15 +189,26 @@ for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_rewa
                            'idealActionUpdate': ideal_update,
                            'additionalDelay': additional_delay}
 
-            experiment = Experiment(mempool_key, mem_size, 'ran-ai', '../../')
+            if warm_num > 0:
+                experiment = WarmExperiment(mempool_key, mem_size, 'ran-ai', '../../', Params, param_block_key,
+                                            poolSize=warm_num)
+            elif env_num == 1:
+                experiment = Experiment(mempool_key, mem_size, 'ran-ai', '../../')
+            else:
+                experiment = VecExperiment(mempool_key, mem_size * env_num, 'ran-ai', '../../')
 
         print("Running...")
 
+        # Log the learning data in the data folder as the episodes complete
+
+        agent.open_data(data_folder)
+
         if offline_running:
 
             # Collect the offline data and organize the data into episodes
 
-            data_folders = os.listdir(offline_folder)
+            dataset = load_offline_dataset(offline_folder)
+            data_folders = list(dataset.vehicles)
 
             vehicle_folders = []
 
@@ -205,7 +249,7 @@ for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_rewa
 
                     if episode < episode_num:
 
-                        episode_data = offline_folder + '/' + vehicle_folder + '/' + str(action) + '/data.pkl'
+                        episode_data = dataset.get(vehicle_folder, action)
 
                         # Initialize the new episode
 
@@ -232,28 +276,58 @@ for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_rewa
             # Exploit the ns3-ai interface to perform an online simulation
 
             try:
-                for episode in range(episode_num):
-                    
-                    # Initialize the new episode
+                if env_num == 1:
 
-                    temp, episode_start_time, rl, pro = initialize_online_episode(episode,
-                                                                                  episode_num,
-                                                                                  agent,
-                                                                                  data_folder,
-                                                                                  algorithm_training,
-                                                                                  temperatures,
-                                                                                  experiment,
-                                                                                  ns3Settings)
+                    for episode in range(episode_num):
 
-                    # Run the simulation
+                        # Initialize the new episode
+
+                        temp, episode_start_time, rl, pro = initialize_online_episode(episode,
+                                                                                      episode_num,
+                                                                                      agent,
+                                                                                      data_folder,
+                                                                                      algorithm_training,
+                                                                                      temperatures,
+                                                                                      experiment,
+                                                                                      ns3Settings)
+
+                        # Run the simulation
 
-                    run_online_episode(action_num, user_num, state_dim, max_penalty, reward_alpha, temp, agent_policy,
-                                       default_action_index, action_labels, action_penalties,
-                                       prr_requirement, delay_requirement, algorithm_training, agent, rl, qos_bonus, step_num=step_num)
+                        run_online_episode(action_num, user_num, state_dim, max_penalty, reward_alpha, temp, agent_policy,
+                                           default_action_index, action_labels, action_penalties,
+                                           prr_requirement, delay_requirement, algorithm_training, agent, rl, qos_bonus, step_num=step_num)
 
-                    # Terminate the episode
+                        # Terminate the episode
 
-                    simulation_time = finalize_episode(episode_start_time, simulation_time, episode, episode_num)
+                        simulation_time = finalize_episode(episode_start_time, simulation_time, episode, episode_num)
+
+                else:
+
+                    for agent_episode in range(agent_episode_num):
+
+                        # Initialize env_num new episodes, simulated concurrently
+
+                        temp, episode_start_time, rls, pros = initialize_vec_online_episode(agent_episode * env_num,
+                                                                                            episode_num,
+                                                                                            env_num,
+                                                                                            agent,
+                                                                                            data_folder,
+                                                                                            algorithm_training,
+                                                                                            temperatures,
+                                                                                            experiment,
+                                                                                            ns3Settings)
+
+                        # Run the simulations
+
+                        run_vec_online_episode(action_num, user_num, state_dim, max_penalty, reward_alpha, temp,
+                                               agent_policy, default_action_index, action_labels, action_penalties,
+                                               prr_requirement, delay_requirement, algorithm_training, agent, rls,
+                                               qos_bonus, step_num=step_num)
+
+                        # Terminate the episodes
+
+                        simulation_time = finalize_episode(episode_start_time, simulation_time, agent_episode,
+                                                           agent_episode_num)
 
             finally:
                 experiment.kill()
@@ -270,4 +344,9 @@ for reward_alpha, input_reward_alpha in zip(multi_reward_alpha, input_multi_rewa
     # Plot the data of the simulation
 
     agent.load_data(data_folder)
-    agent.plot_data(data_folder, episode_num)
+    agent.plot_data(data_folder, agent_episode_num)
+    agent.wait_plots()
+
+    # Release the learner thread and the plot processes before the agent of the next alpha
+
+    agent.close()
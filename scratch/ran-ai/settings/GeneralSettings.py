@@ -22,9 +22,21 @@ class Act(Structure):
     ]
 
 
+# The parameters of an episode are put to a warm started
+# ns-3 script with the shared memory.
+
+class Params(Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('firstVehicleIndex', c_uint32),
+        ('rngRun', c_uint32)
+    ]
+
+
 mempool_key = 1234  # memory pool key, arbitrary integer large than 1000
 mem_size = 40960  # memory pool size in bytes
 memblock_key = 2333  # memory block key, need to keep the same in the ns-3 script
+param_block_key = 3333  # first key of the parameter blocks of the warm started ns-3 scripts
 
 
 step_duration = 100  # Duration of a step [ms]
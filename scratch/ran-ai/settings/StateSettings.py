@@ -131,3 +131,14 @@ app_mean_delay_label = 'APP avg delay'
 
 app_max_delay_index = env_features.index(app_max_delay_label)
 app_mean_delay_index = env_features.index(app_mean_delay_label)
+
+# Index arrays and bounds used to process all the users at once (see batch_state_process)
+
+state_feature_index_array = np.array(state_feature_indexes)
+
+combination_num_index_array = np.array([num for num, _ in combination_feature_indexes])
+combination_den_index_array = np.array([den for _, den in combination_feature_indexes])
+
+state_bounds = np.array(state_feature_normalization + combination_feature_normalization, dtype=float)
+
+app_pdr_num_index, app_pdr_den_index = app_pdr_indexes[0]
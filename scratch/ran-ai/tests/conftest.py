@@ -0,0 +1,64 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The ran-ai modules are imported as top level packages (agent, plot, settings, utils), as in run.py
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.SyntheticData import random_step_data, build_agent as build_scenario_agent
+
+
+def build_agent(user_num: int = 5, step_num: int = 20, memory_capacity: int = 50, async_learning: bool = False,
+                seed: int = 0):
+
+    """
+    Build a small agent with a seeded network initialization (torch is only imported by the tests building agents)
+    """
+
+    import torch
+
+    torch.manual_seed(seed)
+
+    return build_scenario_agent(user_num,
+                                memory_capacity=memory_capacity,
+                                async_learning=async_learning,
+                                step_num=step_num,
+                                target_replace=30,
+                                learning_rate=0.001,
+                                plot_workers=0)
+
+
+@pytest.fixture
+def make_episode_data():
+
+    """
+    Factory of (step, user, env feature) episode arrays, as in the offline dataset
+    """
+
+    def make(step_num: int, user_num: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        return np.stack([random_step_data(rng, user_num) for _ in range(step_num)]).astype(np.float32)
+
+    return make
+
+
+@pytest.fixture
+def make_agent():
+
+    """
+    Agent factory, the agents are closed at the end of the test
+    """
+
+    agents = []
+
+    def make(*args, **kwargs):
+        agents.append(build_agent(*args, **kwargs))
+        return agents[-1]
+
+    yield make
+
+    for agent in agents:
+        agent.close()
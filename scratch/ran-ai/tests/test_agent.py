@@ -0,0 +1,58 @@
+import numpy as np
+import torch
+
+
+def per_user_get_action(agent, states, temp):
+
+    """
+    Reference policy: one forward pass and one random draw per user
+    """
+
+    actions, q_values = [], []
+
+    for state in states:
+
+        with torch.no_grad():
+            user_q_values = agent.primary_net.forward(torch.tensor(state[agent.state_mask],
+                                                                   dtype=torch.float32)).numpy()
+
+        if np.random.uniform() - temp > 0:
+            actions.append(np.argmax(user_q_values, 0))
+        else:
+            actions.append(np.random.randint(0, agent.action_num))
+
+        q_values.append(user_q_values)
+
+    return actions, q_values
+
+
+def test_get_action_matches_per_user_policy(make_agent):
+
+    agent = make_agent(user_num=20)
+    states = list(np.random.default_rng(0).uniform(0, 1, (20, agent.state_dim)))
+
+    for temp in [0, 0.5, 1]:
+
+        np.random.seed(1)
+        actions, q_values = per_user_get_action(agent, states, temp)
+        next_draw = np.random.uniform()
+
+        np.random.seed(1)
+        batch_actions, batch_q_values = agent.get_action(states, temp)
+
+        assert np.array_equal(actions, batch_actions)
+        assert np.allclose(q_values, batch_q_values, atol=1e-6)
+        assert np.random.uniform() == next_draw  # Same random stream consumed
+
+
+def test_close_stops_the_learner_thread(make_agent):
+
+    agent = make_agent(async_learning=True)
+    learner = agent.learner
+
+    assert learner.is_alive()
+
+    agent.close()
+
+    assert not learner.is_alive()
+    assert agent.learner is None
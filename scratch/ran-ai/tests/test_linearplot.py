@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from plot.Linearplot import decimate, decimation_methods, time_bin_num
+
+
+def full_series_means(values: np.ndarray, max_time: int):
+
+    """
+    Reference: the mean of the values with the same time, as seaborn plots the whole series
+    """
+
+    times = (np.arange(0, len(values)) * 100 / len(values)).astype(int) * max_time / 100 + 1
+    means = pd.DataFrame({'Value': values, 'Time': times}).groupby('Time')['Value'].mean()
+
+    return means.index.values, means.values
+
+
+def reference_lttb_indexes(values: np.ndarray, point_num: int):
+
+    """
+    Reference: Largest-Triangle-Three-Buckets, one point at a time
+    """
+
+    every = (len(values) - 2) / (point_num - 2)
+    indexes = [0]
+
+    for bucket in range(point_num - 2):
+        start, end = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        next_start, next_end = end, min(int((bucket + 2) * every) + 1, len(values))
+
+        next_x = np.mean(np.arange(next_start, next_end))
+        next_y = np.mean(values[next_start:next_end])
+        prev_x, prev_y = indexes[-1], values[indexes[-1]]
+
+        best_area, best_index = -1, None
+
+        for index in range(start, end):
+            area = abs((prev_x - next_x) * (values[index] - prev_y) - (prev_x - index) * (next_y - prev_y))
+            if area > best_area:
+                best_area, best_index = area, index
+
+        indexes.append(best_index)
+
+    return indexes + [len(values) - 1]
+
+
+@pytest.mark.parametrize('value_num', [100, 1000, 12345])
+def test_mean_decimation_matches_the_full_series(value_num):
+
+    values = np.random.default_rng(value_num).normal(0, 1, value_num)
+    values[::17] = np.nan  # Missing values are skipped
+
+    times, means = full_series_means(values, 30)
+    series = decimate(values, 30, method='mean')
+
+    assert np.allclose(series.times, times)
+    assert np.allclose(series.values, means, equal_nan=True)
+
+
+@pytest.mark.parametrize('value_num', [1000, 12345])
+def test_minmax_decimation_bounds_each_bin(value_num):
+
+    values = np.random.default_rng(value_num).normal(0, 1, value_num)
+    bins = (np.arange(0, value_num) * time_bin_num / value_num).astype(int)
+
+    series = decimate(values, 30, method='minmax')
+
+    for time_bin in range(time_bin_num):
+        assert series.lower[time_bin] == np.min(values[bins == time_bin])
+        assert series.upper[time_bin] == np.max(values[bins == time_bin])
+        assert np.isclose(series.values[time_bin], np.mean(values[bins == time_bin]))
+
+
+@pytest.mark.parametrize('value_num,point_num', [(1000, 100), (12345, 100), (103, 10), (50, 3)])
+def test_lttb_decimation_matches_the_reference(value_num, point_num):
+
+    values = np.random.default_rng(value_num).normal(0, 1, value_num)
+    indexes = reference_lttb_indexes(values, point_num)
+
+    series = decimate(values, 30, point_num, method='lttb')
+
+    assert np.array_equal(series.values, values[indexes])
+    assert np.allclose(series.times, np.asarray(indexes) * 30 / value_num + 1)
+
+
+@pytest.mark.parametrize('method', decimation_methods)
+def test_short_series_are_not_decimated(method):
+
+    values = np.random.default_rng(0).normal(0, 1, 40)
+
+    assert np.array_equal(decimate(values, 30, method=method).values, values)
+
+
+def test_unknown_decimation_method():
+
+    with pytest.raises(ValueError):
+        decimate(np.zeros(10), 30, method='median')
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import torch
+from agent.StateProcessing import batch_state_process
+from agent.RewardProcessing import batch_reward_process
+from utils.OfflineRun import run_offline_episode
+from settings.GeneralSettings import cf_mean_per_action, teleoperated_prr_requirement, teleoperated_delay_requirement
+from settings.StateSettings import state_feature_index_array, combination_num_index_array, \
+    combination_den_index_array, state_bounds, app_pdr_num_index, app_pdr_den_index, app_max_delay_index
+
+action_penalties = [cf_mean_per_action[action] for action in [1450, 1451, 1452]]
+max_penalty = 10 + np.max(action_penalties)
+user_num, step_num = 5, 20
+
+
+def step_loop_episode(agent, episode_data, default_action_index, train):
+
+    """
+    Reference: offline episode processed step by step
+    """
+
+    action_indexes = [default_action_index] * user_num
+
+    for step_data in episode_data:
+
+        new_states, _ = batch_state_process(step_data, state_feature_index_array, combination_num_index_array,
+                                            combination_den_index_array, state_bounds, user_num)
+        rewards, qos_per_user, cd_per_user = batch_reward_process(step_data, app_pdr_num_index, app_pdr_den_index,
+                                                                  app_max_delay_index, teleoperated_prr_requirement,
+                                                                  teleoperated_delay_requirement, action_indexes,
+                                                                  action_penalties, user_num, max_penalty, 0.5,
+                                                                  qos_bonus='delay')
+
+        states = [np.copy(new_state) for new_state in new_states]
+        _, q_values = agent.get_action(states, 0)
+
+        agent.update(action_indexes, q_values, rewards, states, qos_per_user, cd_per_user, 0, train)
+
+
+def whole_episode(agent, episode_data, default_action_index, train):
+
+    run_offline_episode(user_num, agent.state_dim, max_penalty, 0.5, default_action_index, action_penalties,
+                        teleoperated_prr_requirement, teleoperated_delay_requirement, train, agent, episode_data,
+                        'delay')
+
+
+@pytest.mark.parametrize('train', [False, True])
+def test_offline_episode_matches_step_loop(make_agent, make_episode_data, train):
+
+    # The replay memory gets full in the middle of the first episode
+
+    episodes = [(make_episode_data(step_num, user_num, seed), seed % 3) for seed in range(3)]
+    agents, next_draws = [], []
+
+    for run_episode in [step_loop_episode, whole_episode]:
+
+        np.random.seed(0)
+        agent = make_agent(user_num=user_num, step_num=step_num, memory_capacity=50)
+
+        for episode_data, action_index in episodes:
+            run_episode(agent, episode_data, action_index, train)
+
+        agents.append(agent)
+        next_draws.append(np.random.uniform())
+
+    loop_agent, episode_agent = agents
+
+    assert loop_agent.data_idx == episode_agent.data_idx
+    assert loop_agent.dql.memory_step == episode_agent.dql.memory_step
+    assert loop_agent.dql.learn_step == episode_agent.dql.learn_step
+
+    for name in ['state_data', 'action_data', 'chamfer_data', 'qos_data', 'reward_data', 'temperature_data']:
+        assert np.array_equal(getattr(loop_agent, name), getattr(episode_agent, name)), name
+
+    assert np.allclose(loop_agent.q_value_data, episode_agent.q_value_data, atol=1e-6)
+    assert np.allclose(loop_agent.loss_data, episode_agent.loss_data, atol=1e-6)
+
+    for loop_param, episode_param in zip(loop_agent.primary_net.parameters(), episode_agent.primary_net.parameters()):
+        assert torch.allclose(loop_param, episode_param, atol=1e-6)
+
+    if train:
+        assert loop_agent.dql.learn_step > 0
+        assert next_draws[0] == next_draws[1]  # Same random stream consumed (replay sampling and policy)
+
+        for name in ['states', 'actions', 'rewards', 'new_states']:
+            assert np.array_equal(getattr(loop_agent.dql.memory, name), getattr(episode_agent.dql.memory, name))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from agent.StateProcessing import state_process, batch_state_process
+from agent.RewardProcessing import reward_process, batch_reward_process
+from settings.GeneralSettings import teleoperated_prr_requirement, teleoperated_delay_requirement, cf_mean_per_action
+from settings.StateSettings import state_dim, state_feature_indexes, state_feature_normalization, \
+    combination_feature_indexes, combination_feature_normalization, state_feature_index_array, \
+    combination_num_index_array, combination_den_index_array, state_bounds, app_pdr_indexes, app_pdr_num_index, \
+    app_pdr_den_index, app_max_delay_index
+from utils.SyntheticData import action_labels
+
+action_penalties = [cf_mean_per_action[action] for action in action_labels]
+max_penalty = 10 + np.max(action_penalties)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_state_process_matches_per_user(make_episode_data, seed):
+
+    user_num = 12
+    step_data = make_episode_data(1, user_num, seed)[0].astype(float)
+
+    states, imsi_list = state_process(step_data, state_feature_indexes, state_feature_normalization,
+                                      combination_feature_indexes, combination_feature_normalization, state_dim,
+                                      user_num, online=True)
+    batch_states, batch_imsi_list = batch_state_process(step_data, state_feature_index_array,
+                                                        combination_num_index_array, combination_den_index_array,
+                                                        state_bounds, user_num)
+
+    assert np.allclose(np.stack(states), batch_states)
+    assert list(imsi_list) == list(batch_imsi_list)
+
+
+@pytest.mark.parametrize('qos_bonus', ['delay', 'prr'])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_reward_process_matches_per_user(make_episode_data, qos_bonus, seed):
+
+    user_num = 12
+    step_data = make_episode_data(1, user_num, seed)[0].astype(float)
+    last_actions = np.random.default_rng(seed).integers(0, len(action_labels), user_num)
+
+    rewards, qos, cds = reward_process(step_data, app_pdr_indexes, app_max_delay_index,
+                                       teleoperated_prr_requirement, teleoperated_delay_requirement, last_actions,
+                                       action_penalties, user_num, max_penalty, 0.5, online=True, qos_bonus=qos_bonus)
+    batch_rewards, batch_qos, batch_cds = batch_reward_process(step_data, app_pdr_num_index, app_pdr_den_index,
+                                                               app_max_delay_index, teleoperated_prr_requirement,
+                                                               teleoperated_delay_requirement, last_actions,
+                                                               action_penalties, user_num, max_penalty, 0.5,
+                                                               qos_bonus=qos_bonus)
+
+    assert np.allclose(rewards, batch_rewards)
+    assert np.array_equal(qos, batch_qos)
+    assert np.allclose(cds, batch_cds)
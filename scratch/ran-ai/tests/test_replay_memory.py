@@ -0,0 +1,16 @@
+import numpy as np
+from agent.ReplayMemory import ReplayMemory
+
+
+def test_uniform_sample_without_replacement():
+
+    memory = ReplayMemory(20, 3)
+    memory.store_batch(np.zeros((30, 3)), np.zeros(30), np.zeros(30), np.zeros((30, 3)))
+
+    np.random.seed(0)
+
+    for _ in range(100):
+        indexes, weights = memory.sample(20)
+
+        assert weights is None
+        assert np.array_equal(np.sort(indexes), np.arange(20))  # The whole memory, each transition once
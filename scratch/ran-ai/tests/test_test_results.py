@@ -0,0 +1,77 @@
+import os
+import numpy as np
+import pytest
+from settings.StateSettings import state_dim
+from utils.SyntheticData import random_episode
+from utils.TestResults import TestResults as Results, summary_file  # Not collected as a test class
+
+user_num, step_num, episode_num = 4, 20, 3
+
+
+@pytest.fixture
+def test_folder(tmp_path, make_agent):
+
+    """
+    Test folder with the learning data of a few episodes
+    """
+
+    rng = np.random.default_rng(0)
+    agent = make_agent(user_num=user_num, step_num=step_num)
+
+    for episode in range(episode_num):
+        agent.update_episode(*random_episode(rng, user_num, step_num), 0.5, False)
+
+    agent.save_data(str(tmp_path))
+
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('chunk_step_num', [7, 100000])
+def test_reductions_match_the_agent(test_folder, make_agent, chunk_step_num):
+
+    agent = make_agent(user_num=user_num, step_num=step_num)
+    agent.load_data(test_folder)
+
+    results = Results(test_folder, chunk_step_num)
+    data_idx = results.data_idx
+
+    assert data_idx == agent.data_idx
+
+    for feature_idx in range(state_dim):
+        assert np.allclose(results.user_mean('states', data_idx, feature_idx),
+                           np.mean(agent.state_data, axis=0)[feature_idx, :data_idx], rtol=0, atol=1e-6)
+
+    assert np.array_equal(results.user_values('rewards', data_idx), agent.reward_data.flatten()[:data_idx])
+    assert np.array_equal(results.user_values('chamfer_distances', data_idx),
+                          agent.chamfer_data.flatten()[:data_idx])
+
+    # All the values of the users
+
+    assert np.array_equal(results.user_values('rewards', user_num * (data_idx + 1)), agent.reward_data.flatten())
+
+
+def test_summaries_are_cached(test_folder):
+
+    results = Results(test_folder)
+    data_idx = results.data_idx
+
+    summary = results.summary('rewards', data_idx)
+    rewards = results.user_values('rewards', data_idx)
+
+    assert np.isclose(summary['mean'], np.mean(rewards, dtype=np.float64))
+    assert np.allclose(summary['quantiles'][0], np.min(rewards)) and np.allclose(summary['quantiles'][-1],
+                                                                                 np.max(rewards))
+    assert sum(summary['histogram']) == len(rewards)
+    assert os.path.isfile(os.path.join(test_folder, summary_file))
+
+    # The summaries are read from the cache, unless the requested series changes
+
+    cached = Results(test_folder)
+    cached.user_values = None  # The data is not read again
+
+    assert cached.summary('rewards', data_idx) == summary
+
+    cached = Results(test_folder)
+
+    assert cached.summary('rewards', data_idx // 2)['mean'] == pytest.approx(np.mean(rewards[:data_idx // 2],
+                                                                                     dtype=np.float64))
@@ -0,0 +1,134 @@
+import os
+import numpy as np
+import pytest
+from utils.TrainingLog import TrainingLog, load_training_log, log_folder, index_file
+
+shapes = {'rewards': (3,), 'q_values': (3, 2), 'losses': ()}
+
+
+def fill(log, rng, step_num):
+
+    """
+    Append step_num random steps to the log, returning them
+    """
+
+    rows = log.append(step_num)
+    steps = {name: rng.uniform(-1, 1, (step_num,) + shape).astype(np.float32) for name, shape in shapes.items()}
+
+    for name, data in steps.items():
+        log.buffers[name][rows] = data
+
+    return steps
+
+
+def snapshot(folder):
+
+    files = {}
+
+    for name in sorted(os.listdir(os.path.join(folder, log_folder))):
+        with open(os.path.join(folder, log_folder, name), 'rb') as file:
+            files[name] = file.read()
+
+    return files
+
+
+def test_round_trip(tmp_path):
+
+    rng = np.random.default_rng(0)
+    log = TrainingLog(shapes, 4)
+    log.open(str(tmp_path))
+
+    # The buffers are flushed when full, leaving some steps on disk and some in memory
+
+    chunks = [fill(log, rng, step_num) for step_num in [3, 2, 4, 1]]
+    expected = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in shapes}
+
+    assert log.disk_step_num > 0 and log.buffer_step_num > 0
+    assert len(log) == 10
+
+    for name in shapes:
+        assert np.array_equal(log.read(name), expected[name])
+
+    log.flush()
+
+    loaded = load_training_log(str(tmp_path), 4)
+    new_steps = fill(loaded, rng, 2)
+
+    for name in shapes:
+        assert np.array_equal(loaded.read(name), np.concatenate((expected[name], new_steps[name])))
+
+
+def test_read_does_not_write(tmp_path):
+
+    rng = np.random.default_rng(1)
+    log = TrainingLog(shapes, 4)
+    log.open(str(tmp_path))
+
+    fill(log, rng, 3)
+    log.flush()
+    fill(log, rng, 2)
+
+    files = snapshot(str(tmp_path))
+
+    for name in shapes:
+        assert len(log.read(name)) == 5
+
+    assert log.disk_step_num == 3 and log.buffer_step_num == 2
+    assert snapshot(str(tmp_path)) == files
+
+
+def test_open_keeps_the_previous_data_until_the_first_flush(tmp_path):
+
+    rng = np.random.default_rng(2)
+    log = TrainingLog(shapes, 8)
+    log.open(str(tmp_path))
+    previous_steps = fill(log, rng, 5)
+    log.flush()
+
+    files = snapshot(str(tmp_path))
+
+    # A new run logging in the same folder
+
+    new_log = TrainingLog(shapes, 8)
+    new_log.open(str(tmp_path))
+    new_steps = fill(new_log, rng, 2)
+
+    assert snapshot(str(tmp_path)) == files
+
+    previous_log = load_training_log(str(tmp_path))
+
+    for name in shapes:
+        assert np.array_equal(previous_log.read(name), previous_steps[name])
+
+    del previous_log  # Release the memory maps before the files are replaced
+
+    new_log.flush()
+
+    assert os.path.isfile(os.path.join(str(tmp_path), log_folder, index_file))
+
+    for name in shapes:
+        assert np.array_equal(load_training_log(str(tmp_path)).read(name), new_steps[name])
+
+
+@pytest.mark.parametrize('chunk_step_num', [1, 3, 100])
+def test_user_data_reads_the_files_and_the_buffers(tmp_path, chunk_step_num):
+
+    rng = np.random.default_rng(3)
+    log = TrainingLog(shapes, 4)
+    log.open(str(tmp_path))
+
+    for step_num in [3, 2, 4, 1]:
+        fill(log, rng, step_num)
+
+    assert log.disk_step_num > 0 and log.buffer_step_num > 0
+
+    for name in shapes:
+
+        chunks = list(log.chunks(name, 8, chunk_step_num))
+
+        assert all(len(chunk) <= chunk_step_num for chunk in chunks)
+        assert np.array_equal(np.concatenate(chunks), log.read(name)[:8])
+
+        for step_num in [0, 5, 10, 20]:
+            assert np.array_equal(log.user_data(name, step_num, chunk_step_num),
+                                  np.moveaxis(log.read(name)[:step_num], 0, -1))
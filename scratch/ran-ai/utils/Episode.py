@@ -1,4 +1,4 @@
-from py_interface import Ns3AIRL
+from py_interface import Ns3AIRL, BLOCK_WAIT, WarmExperiment
 import numpy as np
 import time
 from agent.Agent import CentralizedAgent
@@ -31,14 +31,77 @@ def initialize_online_episode(episode: int,
         temp = 0
 
     exp.reset()  # Reset the environment
-    rl = Ns3AIRL(memblock_key, Env, Act)  # Link the shared memory block with ns-3 script
-    ns3Settings['firstVehicleIndex'] = np.random.randint(1, 51)  # Randomly set the first vehicle
-    ns3Settings['RngRun'] = np.random.randint(1, 10)  # Randomly set the simulation seed
-    pro = exp.run(setting=ns3Settings, show_output=True)  # Set and run the ns-3 script (sim.cc)
+    rl = Ns3AIRL(memblock_key, Env, Act, waitMode=BLOCK_WAIT)  # Link the shared memory block with ns-3 script (sleep while ns-3 runs)
+    first_vehicle_index = np.random.randint(1, 51)  # Randomly set the first vehicle
+    rng_run = np.random.randint(1, 10)  # Randomly set the simulation seed
+
+    if isinstance(exp, WarmExperiment):
+        # Hand the episode parameters to an ns-3 script launched ahead of time
+        pro = exp.run(setting=ns3Settings, show_output=True,
+                      params={'firstVehicleIndex': first_vehicle_index, 'rngRun': rng_run})
+    else:
+        ns3Settings['firstVehicleIndex'] = first_vehicle_index
+        ns3Settings['RngRun'] = rng_run
+        pro = exp.run(setting=ns3Settings, show_output=True)  # Set and run the ns-3 script (sim.cc)
 
     return temp, episode_start_time, rl, pro
 
 
+def initialize_vec_online_episode(episode: int,
+                                  episode_num: int,
+                                  env_num: int,
+                                  agent: CentralizedAgent,
+                                  data_folder: str,
+                                  algorithm_training: bool,
+                                  temperatures: np.ndarray,
+                                  exp,
+                                  ns3Settings):
+
+    """
+    Start env_num concurrent simulations (episodes from episode to episode + env_num - 1)
+    Each simulation has its own memory block key and seeds
+    """
+
+    episode_start_time = time.time()
+
+    # Periodically save the episode date
+
+    save_period = int(episode_num / 10)
+
+    if episode_num > 10 and any(e > 0 and e % save_period == 0 for e in range(episode, episode + env_num)):
+        agent.save_data(data_folder)
+        agent.save_model(data_folder)
+        agent.plot_data(data_folder, agent.episode_num)
+
+    # Get the temperature of the episodes
+
+    if algorithm_training:
+        temp = temperatures[episode]
+    else:
+        temp = 0
+
+    exp.reset()  # Reset the environments
+
+    rls, settings = [], []
+
+    # Simulation seeds, different among the environments (when possible)
+
+    rng_runs = np.random.choice(np.arange(1, 10), env_num, replace=env_num > 9)
+
+    for env_idx in range(env_num):
+        rls.append(Ns3AIRL(memblock_key + env_idx, Env, Act, waitMode=BLOCK_WAIT))  # Link the shared memory block of the environment
+
+        env_settings = dict(ns3Settings)
+        env_settings['memBlockKey'] = memblock_key + env_idx
+        env_settings['firstVehicleIndex'] = np.random.randint(1, 51)  # Randomly set the first vehicle
+        env_settings['RngRun'] = rng_runs[env_idx]  # Randomly set the simulation seed
+        settings.append(env_settings)
+
+    pros = exp.run(settings, show_output=True)  # Set and run the ns-3 scripts (sim.cc)
+
+    return temp, episode_start_time, rls, pros
+
+
 def initialize_offline_episode(episode: int,
                                episode_num: int,
                                agent: CentralizedAgent,
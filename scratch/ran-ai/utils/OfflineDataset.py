@@ -0,0 +1,156 @@
+from settings.StateSettings import env_features
+import numpy as np
+import json
+import os
+
+dataset_file = 'dataset.bin'
+index_file = 'dataset.json'
+episode_file = 'data.npy'  # (step, user, env feature) array of a single episode
+
+
+def episode_array(episode_data):
+
+    """
+    Convert the DataFrame of an episode (one row per user and step, as returned by read_ran_ai)
+    into a (step, user, env feature) float32 array; the users are in order of appearance
+    """
+
+    # The traces label the packets as 'pcks', the environment features as 'pckts'
+
+    columns = [label if label in episode_data.columns else label.replace('pckts', 'pcks') for label in env_features]
+
+    imsis = episode_data['IMSI'].unique()
+    user_data = [episode_data.loc[episode_data['IMSI'] == imsi, columns].to_numpy(dtype=np.float32) for imsi in imsis]
+
+    step_num = min(len(data) for data in user_data)
+
+    return np.stack([data[:step_num] for data in user_data], axis=1)
+
+
+def write_offline_dataset(folder: str, episodes: dict):
+
+    """
+    Write the episodes {(vehicle, action): (step, user, env feature) array} of a scenario
+    in one contiguous (episode, step, user, env feature) array, padded with NaN, and its index
+    """
+
+    keys = sorted(episodes.keys())
+    step_nums = [len(episodes[key]) for key in keys]
+    user_num = max(episodes[key].shape[1] for key in keys)
+
+    shape = (len(keys), max(step_nums), user_num, len(env_features))
+
+    # Write the data first and the index last: a dataset without index is ignored
+
+    tmp_path = os.path.join(folder, dataset_file + '.tmp')
+
+    data = np.memmap(tmp_path, dtype=np.float32, mode='w+', shape=shape)
+    data[:] = np.nan
+
+    for episode_idx, key in enumerate(keys):
+        episode = episodes[key]
+        data[episode_idx, :len(episode), :episode.shape[1]] = episode
+
+    data.flush()
+    del data
+
+    os.replace(tmp_path, os.path.join(folder, dataset_file))
+
+    index = {'shape': shape,
+             'dtype': 'float32',
+             'features': env_features,
+             'episodes': [list(key) for key in keys],
+             'step_nums': step_nums}
+
+    with open(os.path.join(folder, index_file), 'w') as file:
+        json.dump(index, file)
+
+
+def convert_offline_dataset(folder: str):
+
+    """
+    Gather the episodes of a scenario (<folder>/<vehicle>/<action>/data.npy, or the pickled DataFrame data.pkl)
+    in the columnar format
+    """
+
+    episodes = {}
+
+    for vehicle in sorted(os.listdir(folder)):
+
+        vehicle_folder = os.path.join(folder, vehicle)
+
+        if not os.path.isdir(vehicle_folder):
+            continue
+
+        for action in sorted(os.listdir(vehicle_folder)):
+
+            episode_path = os.path.join(vehicle_folder, action, episode_file)
+            pickle_path = os.path.join(vehicle_folder, action, 'data.pkl')
+
+            if os.path.isfile(episode_path):
+                episodes[(vehicle, action)] = np.load(episode_path)
+
+            elif os.path.isfile(pickle_path):
+
+                import pickle5 as pickle
+
+                with open(pickle_path, 'rb') as episode_data:
+                    episodes[(vehicle, action)] = episode_array(pickle.load(episode_data))
+
+    if not episodes:
+        raise FileNotFoundError('No episodes in ' + folder)
+
+    write_offline_dataset(folder, episodes)
+
+
+class OfflineDataset(object):
+    """
+    class OfflineDataset
+    It maps the (episode, step, user, env feature) array of a scenario in memory,
+    so that the steps of an episode are read as slices without copies
+
+    """
+
+    def __init__(self, folder: str):
+
+        with open(os.path.join(folder, index_file)) as file:
+            index = json.load(file)
+
+        assert index['features'] == env_features
+
+        self.data = np.memmap(os.path.join(folder, dataset_file), dtype=index['dtype'], mode='r',
+                              shape=tuple(index['shape']))
+
+        self.episodes: [tuple] = [tuple(key) for key in index['episodes']]
+        self.step_nums: [int] = index['step_nums']
+        self.episode_indexes: dict = {key: episode_idx for episode_idx, key in enumerate(self.episodes)}
+
+        self.vehicles: [str] = sorted(set(vehicle for vehicle, _ in self.episodes))
+        self.actions: [str] = sorted(set(action for _, action in self.episodes))
+
+    def __len__(self):
+
+        return len(self.episodes)
+
+    def get(self, vehicle: str, action):
+
+        """
+        Return the (step, user, env feature) array of an episode
+        """
+
+        episode_idx = self.episode_indexes[(str(vehicle), str(action))]
+
+        return self.data[episode_idx, :self.step_nums[episode_idx]]
+
+
+def load_offline_dataset(folder: str):
+
+    """
+    Open the dataset of a scenario, converting the pickled episodes first if needed
+    """
+
+    if not os.path.isfile(os.path.join(folder, index_file)):
+        print("Converting the offline dataset in", folder)
+        convert_offline_dataset(folder)
+
+    return OfflineDataset(folder)
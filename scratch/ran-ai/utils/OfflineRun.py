@@ -1,11 +1,10 @@
-from agent.StateProcessing import state_process
-from agent.RewardProcessing import reward_process
+from agent.StateProcessing import batch_state_process
+from agent.RewardProcessing import batch_reward_process
 from agent.Agent import CentralizedAgent
-from settings.StateSettings import state_features, state_feature_normalization, combination_features, \
-    combination_feature_normalization
-from settings.StateSettings import app_pdr_labels, app_max_delay_label
+from settings.StateSettings import state_feature_index_array, combination_num_index_array, \
+    combination_den_index_array, state_bounds
+from settings.StateSettings import app_pdr_num_index, app_pdr_den_index, app_max_delay_index
 import numpy as np
-import pickle5 as pickle
 
 
 def run_offline_episode(user_num: int,
@@ -18,72 +17,109 @@ def run_offline_episode(user_num: int,
                         delay_requirement: float,
                         algorithm_training: bool,
                         agent: CentralizedAgent,
-                        episode_data,
+                        episode_data: np.ndarray,
                         qos_bonus: str,
                         step_num=None):
 
-    action_indexes = [default_action_index] * user_num
+    """
+    Run an offline episode at once: the actions are fixed, so the states, rewards, QoS and Chamfer distances
+    of all the steps are computed together
+    Without training, the q values are estimated with a single forward pass and the agent is updated with
+    the whole episode. With training, the steps are processed in blocks ending with a learning step,
+    so that the q values and the learning steps are the same as processing the episode step by step
+    """
 
-    with open(episode_data, "rb") as episode_data:
-        episode_data = pickle.load(episode_data)
+    # Episode data: (step, user, env feature) array, mapped from the offline dataset
 
-    imsi_indexes = episode_data['IMSI'].unique()
+    if step_num is None:
+        step_num = len(episode_data)
 
-    episode_data_per_user = []
+    episode_data = np.asarray(episode_data[:step_num, :user_num])
+    step_num = len(episode_data)
 
-    for imsi in imsi_indexes:
-        user_data = episode_data.loc[episode_data['IMSI'] == imsi]
-        user_data = user_data.reset_index()
-        episode_data_per_user.append(user_data)
+    # All the (step, user) rows of the episode, processed as the users of a single step
 
-    if step_num is None:
-        step_num = len(episode_data_per_user[0])
+    step_data = episode_data.reshape(-1, episode_data.shape[-1])
+    action_indexes = np.full((step_num, user_num), default_action_index)
+
+    # Process the agent states
+
+    states, _ = batch_state_process(step_data,
+                                    state_feature_index_array,
+                                    combination_num_index_array,
+                                    combination_den_index_array,
+                                    state_bounds,
+                                    len(step_data))
+
+    # Process the agent rewards
+
+    rewards, qos_per_user, cd_per_user = batch_reward_process(step_data,
+                                                              app_pdr_num_index,
+                                                              app_pdr_den_index,
+                                                              app_max_delay_index,
+                                                              pdr_requirement,
+                                                              delay_requirement,
+                                                              action_indexes.reshape(-1),
+                                                              action_penalties,
+                                                              len(step_data),
+                                                              max_penalty,
+                                                              reward_alpha,
+                                                              qos_bonus=qos_bonus)
+
+    states = states.astype(np.float32).reshape(step_num, user_num, -1)
+    rewards = rewards.reshape(step_num, user_num)
+    qos_per_user = qos_per_user.reshape(step_num, user_num)
+    cd_per_user = cd_per_user.reshape(step_num, user_num)
+
+    if not algorithm_training:
+
+        # Get the agent q values and update the data of the agent
+
+        q_values = agent.get_q_values(states.reshape(step_num * user_num, -1))
+
+        agent.update_episode(action_indexes,
+                             q_values.reshape(step_num, user_num, -1),
+                             rewards,
+                             states,
+                             qos_per_user,
+                             cd_per_user,
+                             0,
+                             algorithm_training)
+
+    else:
+
+        # Blocks of steps ending with a learning step (one step each once the replay memory is full)
 
-    # Repeat per each step of the episode
+        block_ends = list(np.flatnonzero(agent.learning_steps(step_num)) + 1)
 
-    for step in range(step_num):
+        if not block_ends or block_ends[-1] < step_num:
+            block_ends.append(step_num)
 
-        step_data_per_user = [user_data.loc[step] for user_data in episode_data_per_user]
+        block_start = 0
 
-        # Process the agent state
+        for block_end in block_ends:
 
-        new_states, imsi_list = state_process(step_data_per_user,
-                                              state_features,
-                                              state_feature_normalization,
-                                              combination_features,
-                                              combination_feature_normalization,
-                                              state_dim,
-                                              user_num,
-                                              online=False)
+            steps = slice(block_start, block_end)
+            block_num = block_end - block_start
 
-        # Process the agent reward
+            # Get the agent q values with the weights of the last learning step
+            # (with the same random draws of the greedy policy as the step by step update)
 
-        rewards, qos_per_user, cd_per_user = reward_process(step_data_per_user,
-                                                            app_pdr_labels,
-                                                            app_max_delay_label,
-                                                            pdr_requirement,
-                                                            delay_requirement,
-                                                            action_indexes,
-                                                            action_penalties,
-                                                            user_num,
-                                                            max_penalty,
-                                                            reward_alpha,
-                                                            online=False,
-                                                            qos_bonus=qos_bonus)
+            _, q_values = agent.get_action(states[steps].reshape(block_num * user_num, -1), 0)
 
-        states = [np.copy(new_state) for new_state in new_states]
+            # Update the data of the agent, inserting the transitions of the block before its learning step
 
-        # Get the agent q values
+            agent.update_episode(action_indexes[steps],
+                                 q_values.reshape(block_num, user_num, -1),
+                                 rewards[steps],
+                                 states[steps],
+                                 qos_per_user[steps],
+                                 cd_per_user[steps],
+                                 0,
+                                 algorithm_training)
 
-        _, q_values = agent.get_action(states, 0)
+            block_start = block_end
 
-        # Update the data of the agent
+    # Wait for the learning steps still pending in the learner thread (if any)
 
-        agent.update(action_indexes,
-                     q_values,
-                     rewards,
-                     states,
-                     qos_per_user,
-                     cd_per_user,
-                     0,
-                     algorithm_training)
+    agent.synchronize()
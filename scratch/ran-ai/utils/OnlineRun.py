@@ -1,9 +1,9 @@
-from agent.StateProcessing import state_process
-from agent.RewardProcessing import reward_process
+from agent.StateProcessing import batch_state_process
+from agent.RewardProcessing import batch_reward_process
 from agent.Agent import CentralizedAgent
-from settings.StateSettings import state_feature_indexes, state_feature_normalization, combination_feature_indexes, \
-    combination_feature_normalization
-from settings.StateSettings import app_pdr_indexes, app_max_delay_index
+from settings.StateSettings import state_feature_index_array, combination_num_index_array, \
+    combination_den_index_array, state_bounds
+from settings.StateSettings import app_pdr_num_index, app_pdr_den_index, app_max_delay_index
 import numpy as np
 
 
@@ -31,6 +31,12 @@ def run_online_episode(action_num: int,
     if step_num is None:
         step_num = np.infty
 
+    # Zero-copy views over the shared memory: (50, 28) statistics and (50, 2) actions
+
+    env_stats = experiment_instance.env_array()
+    env_actions = experiment_instance.act_array()
+    action_labels = np.asarray(action_labels)
+
     while not experiment_instance.isFinish():
         with experiment_instance as data:
 
@@ -41,31 +47,29 @@ def run_online_episode(action_num: int,
 
             # Process the agent state
 
-            new_states, state_imsi_list = state_process(data.env.imsiStatsMap,
-                                                        state_feature_indexes,
-                                                        state_feature_normalization,
-                                                        combination_feature_indexes,
-                                                        combination_feature_normalization,
-                                                        state_dim,
-                                                        user_num,
-                                                        online=True)
+            new_states, state_imsi_list = batch_state_process(env_stats,
+                                                              state_feature_index_array,
+                                                              combination_num_index_array,
+                                                              combination_den_index_array,
+                                                              state_bounds,
+                                                              user_num)
 
             # Process the agent reward
 
-            rewards, qos_per_user, cd_per_user = reward_process(data.env.imsiStatsMap,
-                                                                app_pdr_indexes,
-                                                                app_max_delay_index,
-                                                                pdr_requirement,
-                                                                delay_requirement,
-                                                                action_indexes,
-                                                                action_penalties,
-                                                                user_num,
-                                                                max_penalty,
-                                                                reward_alpha,
-                                                                online=True,
-                                                                qos_bonus=qos_bonus)
-
-            states = [np.copy(new_state) for new_state in new_states]
+            rewards, qos_per_user, cd_per_user = batch_reward_process(env_stats,
+                                                                      app_pdr_num_index,
+                                                                      app_pdr_den_index,
+                                                                      app_max_delay_index,
+                                                                      pdr_requirement,
+                                                                      delay_requirement,
+                                                                      action_indexes,
+                                                                      action_penalties,
+                                                                      user_num,
+                                                                      max_penalty,
+                                                                      reward_alpha,
+                                                                      qos_bonus=qos_bonus)
+
+            states = list(new_states)
 
             # Get the agent action and q values
 
@@ -92,8 +96,137 @@ def run_online_episode(action_num: int,
 
             # Implement the agent action in the ns3 environment
 
-            for user_idx, action_idx in enumerate(action_indexes):
-                imsi = state_imsi_list[user_idx]
-                action = action_labels[action_idx]
-                data.act.actions[user_idx][0] = int(imsi)
-                data.act.actions[user_idx][1] = action
+            env_actions[:user_num, 0] = state_imsi_list
+            env_actions[:user_num, 1] = action_labels[action_indexes]
+
+    # Wait for the learning steps still pending in the learner thread (if any)
+
+    agent.synchronize()
+
+
+def run_vec_online_episode(action_num: int,
+                           user_num: int,
+                           state_dim: int,
+                           max_penalty: float,
+                           reward_alpha: float,
+                           temp: float,
+                           agent_policy: str,
+                           default_action_index: int,
+                           action_labels: [],
+                           action_penalties: [],
+                           pdr_requirement: float,
+                           delay_requirement: float,
+                           algorithm_training: bool,
+                           agent: CentralizedAgent,
+                           experiment_instances: [],
+                           qos_bonus: str,
+                           step_num=None):
+
+    """
+    Run concurrent episodes, one per experiment instance, stepping them together
+    The agent controls the users of all the environments (env_num * user_num) at once
+    """
+
+    env_num = len(experiment_instances)
+    env_users = [slice(env_idx * user_num, (env_idx + 1) * user_num) for env_idx in range(env_num)]
+
+    action_indexes = np.random.randint(0, action_num, env_num * user_num)
+    step = -1
+
+    if step_num is None:
+        step_num = np.infty
+
+    # Zero-copy views over the shared memory of each environment
+
+    env_stats = [experiment_instance.env_array() for experiment_instance in experiment_instances]
+    env_actions = [experiment_instance.act_array() for experiment_instance in experiment_instances]
+    action_labels = np.asarray(action_labels)
+
+    states = [None] * (env_num * user_num)
+    rewards = np.zeros(env_num * user_num)
+    qos_per_user = np.zeros(env_num * user_num)
+    cd_per_user = np.zeros(env_num * user_num)
+    imsi_lists = [None] * env_num
+
+    while not any(experiment_instance.isFinish() for experiment_instance in experiment_instances):
+
+        data = []
+
+        try:
+
+            # Wait for the step of all the environments (they simulate in parallel)
+            # The blocks already acquired are released even if a later environment times out
+
+            for experiment_instance in experiment_instances:
+                data.append(experiment_instance.Acquire(experiment_instance.timeout))
+
+            step += 1
+
+            if any(env_data is None for env_data in data) or step >= step_num:
+                break
+
+            for env_idx, users in enumerate(env_users):
+
+                # Process the agent state
+
+                new_states, imsi_lists[env_idx] = batch_state_process(env_stats[env_idx],
+                                                                      state_feature_index_array,
+                                                                      combination_num_index_array,
+                                                                      combination_den_index_array,
+                                                                      state_bounds,
+                                                                      user_num)
+
+                states[users] = list(new_states)
+
+                # Process the agent reward
+
+                rewards[users], qos_per_user[users], cd_per_user[users] = batch_reward_process(env_stats[env_idx],
+                                                                                              app_pdr_num_index,
+                                                                                              app_pdr_den_index,
+                                                                                              app_max_delay_index,
+                                                                                              pdr_requirement,
+                                                                                              delay_requirement,
+                                                                                              action_indexes[users],
+                                                                                              action_penalties,
+                                                                                              user_num,
+                                                                                              max_penalty,
+                                                                                              reward_alpha,
+                                                                                              qos_bonus=qos_bonus)
+
+            # Get the agent action and q values (single forward pass for all the environments)
+
+            action_indexes, q_values = agent.get_action(states, temp)
+
+            if agent_policy == 'random':
+
+                action_indexes = np.random.randint(0, action_num, env_num * user_num)
+
+            elif agent_policy != 'dql':
+
+                action_indexes = np.full(env_num * user_num, default_action_index)
+
+            # Update tha agent data
+
+            agent.update(action_indexes,
+                         q_values,
+                         rewards,
+                         states,
+                         qos_per_user,
+                         cd_per_user,
+                         temp,
+                         algorithm_training)
+
+            # Implement the agent actions in the ns3 environments
+
+            for env_idx, users in enumerate(env_users):
+                env_actions[env_idx][:user_num, 0] = imsi_lists[env_idx]
+                env_actions[env_idx][:user_num, 1] = action_labels[action_indexes[users]]
+
+        finally:
+            for env_data, experiment_instance in zip(data, experiment_instances):
+                if env_data is not None:
+                    experiment_instance.Release()
+
+    # Wait for the learning steps still pending in the learner thread (if any)
+
+    agent.synchronize()
@@ -1,6 +1,7 @@
 import os
 import numpy as np
 from agent.Agent import CentralizedAgent
+from utils.OfflineDataset import load_offline_dataset
 
 
 def get_input(args: []):
@@ -62,11 +63,7 @@ def get_input(args: []):
 
         # Number of episode
         if args['episode_num'] is None:
-            vehicle_folders = os.listdir(offline_folder)
-            vehicle_num = len(vehicle_folders)
-            action_folders = os.listdir(vehicle_folders[0])
-            action_num = len(action_folders)
-            episode_num = vehicle_num * action_num
+            episode_num = len(load_offline_dataset(offline_folder))
         else:
             if agent_policy != 'random':
                 episode_num = args['episode_num']
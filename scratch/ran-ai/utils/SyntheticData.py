@@ -0,0 +1,78 @@
+from settings.StateSettings import state_dim, state_full_labels, state_normalization, state_mask, env_features, \
+    env_normalization, combination_den_index_array
+import numpy as np
+
+# Random data and agents, shared by benchmark.py and the tests
+
+action_labels = [1450, 1451, 1452]
+
+
+def random_step_data(rng: np.random.Generator, user_num: int):
+
+    """
+    Generate a (users, env features) step matrix with plausible values
+    """
+
+    step_data = rng.uniform(0, 1, (user_num, len(env_features)))
+    step_data[:, 0] = np.arange(1, user_num + 1)
+
+    for feature_idx, feature in enumerate(env_features[1:], 1):
+        min_value, max_value = env_normalization[feature]
+        step_data[:, feature_idx] = rng.uniform(min_value, 1.2 * max_value, user_num)
+
+    # Some users did not transmit anything in the step
+
+    step_data[::3, combination_den_index_array] = 0
+
+    return step_data
+
+
+def random_episode(rng: np.random.Generator, user_num: int, step_num: int):
+
+    """
+    Generate the (step, user, ...) arguments of update_episode for an episode
+    """
+
+    return (rng.integers(0, len(action_labels), (step_num, user_num)),
+            rng.uniform(0, 1, (step_num, user_num, len(action_labels))).astype(np.float32),
+            rng.uniform(-1, 1, (step_num, user_num)),
+            rng.uniform(0, 1, (step_num, user_num, state_dim)).astype(np.float32),
+            rng.uniform(0, 1, (step_num, user_num)),
+            rng.uniform(0, 10, (step_num, user_num)))
+
+
+def build_agent(user_num: int,
+                memory_capacity: int = 10000,
+                prioritized_replay: bool = False,
+                async_learning: bool = False,
+                episode_num: int = 1,
+                step_num: int = 800,
+                target_replace: int = 8000,
+                learning_rate: float = 0.00001,
+                plot_workers: int = 1):
+
+    """
+    Build an agent with the settings of the ran-ai scenario
+    """
+
+    from agent.Agent import CentralizedAgent  # torch is imported only by the callers building agents
+
+    return CentralizedAgent(step_num=step_num,
+                            episode_num=episode_num,
+                            state_dim=state_dim,
+                            action_num=len(action_labels),
+                            user_num=user_num,
+                            state_labels=state_full_labels,
+                            action_labels=action_labels,
+                            state_normalization=state_normalization,
+                            state_mask=state_mask,
+                            gamma=0.95,
+                            batch_size=10,
+                            target_replace=target_replace,
+                            memory_capacity=memory_capacity,
+                            learning_rate=learning_rate,
+                            eps=0.001,
+                            weight_decay=0.0001,
+                            prioritized_replay=prioritized_replay,
+                            async_learning=async_learning,
+                            plot_workers=plot_workers)
@@ -0,0 +1,171 @@
+from utils.TrainingLog import load_training_log, log_folder, index_file, chunk_step_num
+import numpy as np
+import hashlib
+import json
+import os
+
+# Summaries of the plotted series, cached in the test folder: the mean, the quantiles at quantile_num + 1
+# evenly spaced levels (a sample of quantile_num + 1 values with the distribution of the series)
+# and a histogram with bin_num bins
+
+summary_file = 'summary.json'
+quantile_num = 1000
+bin_num = 100
+
+
+def series_summary(values: np.ndarray) -> dict:
+
+    """
+    Summary of a series of values
+    """
+
+    histogram, bin_edges = np.histogram(values, bins=bin_num)
+
+    return {'mean': float(np.mean(values, dtype=np.float64)),
+            'quantiles': np.quantile(values, np.linspace(0, 1, quantile_num + 1)).tolist(),
+            'histogram': histogram.tolist(),
+            'bin_edges': bin_edges.tolist()}
+
+
+class TestResults(object):
+    """
+    class TestResults
+    It reads the learning data saved in a test folder (see CentralizedAgent.save_data), without building the agent.
+    The data is mapped in memory and reduced chunk by chunk, so that only the results are loaded.
+    The summaries of the series are cached in the folder, and computed again only if the data changes
+
+    """
+
+    def __init__(self, data_folder: str, chunk_step_num: int = chunk_step_num):
+
+        self.data_folder: str = data_folder
+        self.log = load_training_log(data_folder)
+
+        self.data_idx: int = len(self.log) - 1
+        self.chunk_step_num: int = chunk_step_num
+
+        self.summaries: dict = None  # Summaries of the folder, loaded at the first request
+
+    def chunks(self, name: str, step_num: int):
+
+        # (step, user, ...) chunks of the first step_num steps of a quantity
+
+        return self.log.chunks(name, step_num, self.chunk_step_num)
+
+    def user_mean(self, name: str, step_num: int, index: int = None) -> np.ndarray:
+
+        """
+        Mean over the users of the first step_num steps of a quantity, as a (..., step) array
+        (index selects a single feature of the quantity, e.g. a state feature)
+        """
+
+        means = []
+
+        for chunk in self.chunks(name, step_num):
+
+            if index is not None:
+                chunk = chunk[..., index]
+
+            # Users added one after the other, as np.mean does over the user axis of a (user, ..., step) array
+
+            user_sum = np.array(chunk[:, 0])
+
+            for user_idx in range(1, chunk.shape[1]):
+                user_sum += chunk[:, user_idx]
+
+            means.append(user_sum / chunk.shape[1])
+
+        return np.moveaxis(np.concatenate(means), 0, -1)
+
+    def user_values(self, name: str, value_num: int) -> np.ndarray:
+
+        """
+        First value_num values of a (user, step) quantity, flattened user after user
+        """
+
+        step_num = len(self.log)
+        user_num = self.log.shapes[name][0]
+
+        values = np.zeros(min(value_num, user_num * step_num), dtype=np.float32)
+        value_idx = 0
+
+        for user_idx in range(user_num):
+
+            user_step_num = min(step_num, len(values) - value_idx)
+
+            for chunk in self.chunks(name, user_step_num):
+                values[value_idx:value_idx + len(chunk)] = chunk[:, user_idx]
+                value_idx += len(chunk)
+
+        return values
+
+    def source_hash(self) -> str:
+
+        """
+        Hash of the files of the learning data (name, size and modification time, as reading them would
+        take as long as computing the summaries)
+        """
+
+        if self.log.folder is not None:
+            paths = [self.log.path(name) for name in sorted(self.log.shapes)]
+            paths.append(os.path.join(self.data_folder, log_folder, index_file))
+        else:
+            paths = [os.path.join(self.data_folder, name + '.npy') for name in sorted(self.log.shapes)]
+            paths.append(os.path.join(self.data_folder, 'data_idx.npy'))
+
+        digest = hashlib.sha1()
+
+        for path in paths:
+            stat = os.stat(path)
+            digest.update((os.path.basename(path) + ' ' + str(stat.st_size) + ' ' + str(stat.st_mtime_ns)).encode())
+
+        return digest.hexdigest()
+
+    def summary(self, name: str, value_num: int, index: int = None) -> dict:
+
+        """
+        Summary (see series_summary) of the series plotted for a quantity: the mean over the users of the first
+        value_num steps of a feature (index), or the first value_num values flattened user after user
+        """
+
+        key = name if index is None else name + '/' + str(index)
+
+        if self.summaries is None:
+            self.load_summaries()
+
+        if key in self.summaries and self.summaries[key]['value_num'] == value_num:
+            return self.summaries[key]
+
+        if index is not None:
+            self.summaries[key] = series_summary(self.user_mean(name, value_num, index))
+        else:
+            self.summaries[key] = series_summary(self.user_values(name, value_num))
+
+        self.summaries[key]['value_num'] = value_num
+
+        self.save_summaries()
+
+        return self.summaries[key]
+
+    def load_summaries(self):
+
+        # The cached summaries are discarded if the learning data changed
+
+        self.summaries = {}
+
+        if os.path.isfile(os.path.join(self.data_folder, summary_file)):
+
+            with open(os.path.join(self.data_folder, summary_file)) as file:
+                cache = json.load(file)
+
+            if cache['hash'] == self.source_hash():
+                self.summaries = cache['summaries']
+
+    def save_summaries(self):
+
+        tmp_path = os.path.join(self.data_folder, summary_file + '.tmp')
+
+        with open(tmp_path, 'w') as file:
+            json.dump({'hash': self.source_hash(), 'summaries': self.summaries}, file)
+
+        os.replace(tmp_path, os.path.join(self.data_folder, summary_file))
@@ -0,0 +1,215 @@
+import numpy as np
+import json
+import os
+
+log_folder = 'learning_data'  # Subfolder of the data folder with the log files
+index_file = 'index.json'
+chunk_step_num = 100000  # Steps read at once from the files
+
+
+class TrainingLog(object):
+    """
+    class TrainingLog
+    It logs the learning data of the agent: for each quantity, a (step, ...) float32 array.
+    The last steps are buffered in memory, the others are appended to a raw file per quantity,
+    so that the memory does not grow with the number of episodes and a checkpoint only writes the new steps.
+    The steps on disk are read lazily, mapping the files in memory
+
+    """
+
+    def __init__(self, shapes: dict, buffer_step_num: int):
+
+        # Shape of the data of a step, for each quantity
+
+        self.shapes: dict = {name: tuple(shape) for name, shape in shapes.items()}
+
+        self.folder: str = None
+        self.disk_step_num: int = 0  # Steps written in the folder
+        self.buffer_step_num: int = 0  # Steps in the buffers, after those on disk
+
+        self.buffers: dict = {name: np.zeros((buffer_step_num,) + shape, dtype=np.float32)
+                              for name, shape in self.shapes.items()}
+
+    def __len__(self):
+
+        return self.disk_step_num + self.buffer_step_num
+
+    def path(self, name: str):
+
+        return os.path.join(self.folder, log_folder, name + '.bin')
+
+    def open(self, folder: str):
+
+        """
+        Log the steps in a folder (the steps buffered so far are written at the next flush)
+        Its previous data is replaced at the first flush, so that it is kept if the run stops before
+        """
+
+        if self.folder is not None:
+            if os.path.normpath(self.folder) != os.path.normpath(folder):
+                raise ValueError('The learning data is logged in ' + self.folder)
+            return
+
+        assert self.disk_step_num == 0
+
+        os.makedirs(os.path.join(folder, log_folder), exist_ok=True)
+
+        self.folder = folder
+
+    def append(self, step_num: int):
+
+        """
+        Add step_num steps (filled with zeros), returning their rows in the buffers, where the caller writes them
+        The buffered steps are written in the folder first, if there is no room for the new ones
+        """
+
+        capacity = len(next(iter(self.buffers.values())))
+
+        if self.buffer_step_num + step_num > capacity and self.folder is not None:
+            self.flush()
+
+        if self.buffer_step_num + step_num > capacity:
+
+            # Without a folder (or with more steps than the buffers hold), the buffers grow
+
+            capacity = max(2 * capacity, self.buffer_step_num + step_num)
+
+            for name, buffer in self.buffers.items():
+                self.buffers[name] = np.zeros((capacity,) + self.shapes[name], dtype=np.float32)
+                self.buffers[name][:self.buffer_step_num] = buffer[:self.buffer_step_num]
+
+        rows = slice(self.buffer_step_num, self.buffer_step_num + step_num)
+
+        for buffer in self.buffers.values():
+            buffer[rows] = 0
+
+        self.buffer_step_num += step_num
+
+        return rows
+
+    def flush(self):
+
+        """
+        Append the buffered steps to the files of the folder
+        """
+
+        for name, buffer in self.buffers.items():
+
+            # The first flush replaces the previous data of the folder
+
+            with open(self.path(name), 'ab' if self.disk_step_num > 0 else 'wb') as file:
+
+                # Drop the steps written after the last index (e.g., by an interrupted flush)
+
+                file.truncate(self.disk_step_num * int(np.prod(self.shapes[name])) * buffer.itemsize)
+                file.write(buffer[:self.buffer_step_num].tobytes())
+
+        self.disk_step_num += self.buffer_step_num
+        self.buffer_step_num = 0
+
+        # Write the data first and the index last: the steps missing from the index are ignored
+
+        self.write_index()
+
+    def write_index(self):
+
+        index = {'step_num': self.disk_step_num,
+                 'dtype': 'float32',
+                 'shapes': self.shapes}
+
+        tmp_path = os.path.join(self.folder, log_folder, index_file + '.tmp')
+
+        with open(tmp_path, 'w') as file:
+            json.dump(index, file)
+
+        os.replace(tmp_path, os.path.join(self.folder, log_folder, index_file))
+
+    def read(self, name: str):
+
+        """
+        Return the (step, ...) array of a quantity, mapped in memory from the files when possible
+        (the steps still buffered are appended to a copy of the steps on disk)
+        """
+
+        if self.disk_step_num == 0:
+            return self.buffers[name][:self.buffer_step_num]
+
+        disk_data = np.memmap(self.path(name), dtype=np.float32, mode='r',
+                              shape=(self.disk_step_num,) + self.shapes[name])
+
+        if self.buffer_step_num == 0:
+            return disk_data
+
+        return np.concatenate((disk_data, self.buffers[name][:self.buffer_step_num]))
+
+
+    def chunks(self, name: str, step_num: int, chunk_step_num: int = chunk_step_num):
+
+        """
+        Yield the first step_num steps of a quantity as (step, ...) chunks, read from the files and then the buffers
+        (unlike read, nothing is copied)
+        """
+
+        step_num = min(step_num, len(self))
+        disk_step_num = min(step_num, self.disk_step_num)
+
+        if disk_step_num > 0:
+
+            disk_data = np.memmap(self.path(name), dtype=np.float32, mode='r',
+                                  shape=(self.disk_step_num,) + self.shapes[name])
+
+            for start in range(0, disk_step_num, chunk_step_num):
+                yield disk_data[start:min(start + chunk_step_num, disk_step_num)]
+
+        for start in range(0, step_num - disk_step_num, chunk_step_num):
+            yield self.buffers[name][start:min(start + chunk_step_num, step_num - disk_step_num)]
+
+    def user_data(self, name: str, step_num: int, chunk_step_num: int = chunk_step_num):
+
+        """
+        Return the first step_num steps of a quantity as a (..., step) array (e.g., (user, state, step) for the states),
+        reading the log once, chunk by chunk
+        """
+
+        step_num = min(step_num, len(self))
+        data = np.zeros(self.shapes[name] + (step_num,), dtype=np.float32)
+
+        start = 0
+
+        for chunk in self.chunks(name, step_num, chunk_step_num):
+            data[..., start:start + len(chunk)] = np.moveaxis(chunk, 0, -1)
+            start += len(chunk)
+
+        return data
+
+
+def load_training_log(folder: str, buffer_step_num: int = 0):
+
+    """
+    Open the learning data of a data folder, saved by a TrainingLog or as whole .npy arrays (older format)
+    New steps are appended after those in the folder
+    """
+
+    if os.path.isfile(os.path.join(folder, log_folder, index_file)):
+
+        with open(os.path.join(folder, log_folder, index_file)) as file:
+            index = json.load(file)
+
+        log = TrainingLog(index['shapes'], buffer_step_num)
+        log.folder = folder
+        log.disk_step_num = index['step_num']
+
+        return log
+
+    # Older format (read only): a (user, ..., step) array per quantity, preallocated for all the steps,
+    # and the index of the last step
+
+    arrays = {name: np.load(os.path.join(folder, name + '.npy'), mmap_mode='r')
+              for name in ['states', 'rewards', 'actions', 'q_values', 'temperatures', 'losses', 'qos',
+                           'chamfer_distances']}
+
+    log = TrainingLog({name: array.shape[:-1] for name, array in arrays.items()}, 0)
+    log.buffers = {name: np.moveaxis(array, -1, 0) for name, array in arrays.items()}
+    log.buffer_step_num = int(np.load(os.path.join(folder, 'data_idx.npy'))) + 1
+
+    return log
@@ -23,6 +23,8 @@ appPlots = False
 pdcpPlots = False
 rlcPlots = False
 load = True
+# read RxPacketTrace.txt from disk in chunks (for traces larger than the memory)
+streamTraces = False
 
 (ns_path, ns_script, ns_res_path, 
 allParams, base_figure_foder) = get_campaign_params (campaignName)
@@ -39,10 +41,14 @@ for kittiModel in allParams ['kittiModel']:
     if (phyPlots):
         phy_folder = figure_foder + "/phy"
         Path(phy_folder).mkdir(parents=True, exist_ok=True)
-        results = campaign.get_results_as_dataframe(sample_rxPacketTrace,
-                                                    params=overall_list,
-                                                    verbose=True, 
-                                                    parallel_parsing=False)
+        if (streamTraces):
+            results = get_streamed_results_as_dataframe(campaign, stream_sample_rxPacketTrace,
+                                                        overall_list)
+        else:
+            results = campaign.get_results_as_dataframe(sample_rxPacketTrace,
+                                                        params=overall_list,
+                                                        verbose=True,
+                                                        parallel_parsing=False)
                                                     
         plot_stat (results [results ['UL/DL'] == 'UL'], 'Time [s]', 'SINR [dB]', phy_folder + '/ul-sinr', '-')
         plot_stat (results [results ['UL/DL'] == 'UL'], 'Time [s]', 'MCS', phy_folder + '/ul-mcs')
@@ -134,10 +140,14 @@ for kittiModel in allParams ['kittiModel']:
     if (load):
         load_folder = figure_foder + "/load"
         Path(load_folder).mkdir(parents=True, exist_ok=True)
-        results = campaign.get_results_as_dataframe(calc_ofdm_sym,
-                                                    params=overall_list,
-                                                    verbose=True, 
-                                                    parallel_parsing=False)
+        if (streamTraces):
+            results = get_streamed_results_as_dataframe(campaign, stream_calc_ofdm_sym,
+                                                        overall_list)
+        else:
+            results = campaign.get_results_as_dataframe(calc_ofdm_sym,
+                                                        params=overall_list,
+                                                        verbose=True,
+                                                        parallel_parsing=False)
         available_sym = 100 * 4 * 12 # 100 subframes * 4 slots per sf * 12 data symbols
         results ['load'] = results ['OFDM symbols'] / available_sym
         plot_stat (results, 'Time [s]', 'load', load_folder + '/load', '-')
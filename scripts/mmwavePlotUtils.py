@@ -1,8 +1,174 @@
 import sem
+import numpy as np
 import pandas as pd
 from io import StringIO
 import matplotlib.pyplot as plt
 
+"""
+    Parse a tab separated trace file with the C engine of pandas and return
+    a DataFrame with one typed column per field. The first line (header) is
+    skipped and the fields are read in the given order.
+    Args:
+        source (str or file): the content of the trace as a string, or a file
+        columns (list): (field index, label, dtype) of the fields to keep
+"""
+def parse_trace (source, columns):
+    if isinstance (source, str):
+        source = StringIO (source)
+    try:
+        df = pd.read_csv (source, **trace_csv_options (columns))
+    except pd.errors.EmptyDataError:
+        df = empty_trace (columns)
+    return label_trace (df, columns)
+
+"""
+    Parse a tab separated trace file in chunks of at most chunkRows lines,
+    read from disk one at a time, and yield a DataFrame per chunk (as
+    returned by parse_trace). The memory used does not depend on the size
+    of the trace.
+    Args:
+        source (str or file): the path of the trace, or a file
+        columns (list): (field index, label, dtype) of the fields to keep
+        chunkRows (int): maximum number of lines of each chunk
+"""
+def parse_trace_chunks (source, columns, chunkRows=200000):
+    try:
+        reader = pd.read_csv (source, chunksize=chunkRows,
+                              **trace_csv_options (columns))
+    except pd.errors.EmptyDataError:
+        yield label_trace (empty_trace (columns), columns)
+        return
+    with reader:
+        for df in reader:
+            yield label_trace (df, columns)
+
+def trace_csv_options (columns):
+    return {'sep': '\t', 'header': None, 'skiprows': 1,
+            'usecols': [index for index, _, _ in columns],
+            'dtype': {index: dtype for index, _, dtype in columns},
+            'engine': 'c'}
+
+def empty_trace (columns):
+    return pd.DataFrame ({index: pd.Series (dtype=dtype)
+                         for index, _, dtype in columns})
+
+def label_trace (df, columns):
+    df = df [[index for index, _, _ in columns]]
+    df.columns = [label for _, label, _ in columns]
+    return df
+
+"""
+    Return the rows of a DataFrame as lists of Python values, as expected by
+    the functions decorated with sem.utils.yields_multiple_results.
+"""
+def trace_rows (df):
+    return df.astype (object).values.tolist ()
+
+"""
+    Resample a trace in time bins, separately for each combination of the key
+    columns, with a single groupby on the keys and the bin index. Return a
+    DataFrame with the keys, the time label (start of the bin, as a Timedelta)
+    and the aggregated columns, sorted by keys and time.
+    Args:
+        df (DataFrame): the trace, with the time in seconds
+        keys (list): labels of the key columns (e.g. Cell ID, RNTI)
+        aggregations (dict): column label -> aggregation (e.g. 'mean', 'sum')
+        binWidth (float): width of the bins [s]
+        timeLabel (str): label of the time column
+        origin (str): 'start' to start the bins of each key combination at its
+                      first sample (as DataFrame.resample), 'zero' to align
+                      the bins of all the key combinations to time 0
+        fillGaps (bool): add the empty bins between the first and the last bin
+                         of each key combination (NaN, or 0 if summed)
+"""
+def resample_trace (df, keys, aggregations, binWidth=0.1, timeLabel='Time [s]',
+                    origin='start', fillGaps=True):
+    return next (stream_resample_trace ([df], keys, aggregations, binWidth,
+                                        timeLabel, origin, fillGaps))
+
+"""
+    Resample a trace read in consecutive chunks (e.g. from parse_trace_chunks)
+    as resample_trace, and yield the bins completed by each chunk as soon as
+    it is read. The samples of the bins that can still grow are carried over
+    to the next chunk, so that the memory used is bounded by the size of a
+    chunk. The samples must be in time order, as in the ns-3 traces.
+    Concatenated, the yielded DataFrames contain the rows of resample_trace
+    on the whole trace; each one is sorted by keys and time.
+    Args:
+        chunks (iterable): DataFrames of consecutive parts of the trace
+        others: as in resample_trace
+"""
+def stream_resample_trace (chunks, keys, aggregations, binWidth=0.1,
+                           timeLabel='Time [s]', origin='start', fillGaps=True):
+    if origin not in ['start', 'zero']:
+        raise ValueError ('Unknown origin ' + origin)
+    # Same nanosecond rounding as pd.to_timedelta and resample
+    binNs = int (round (binWidth * 1e9))
+    labels = keys + [timeLabel] + list (aggregations)
+    summed = [label for label, agg in aggregations.items () if agg == 'sum']
+    origins = None   # first sample of each key combination [ns]
+    lastBins = None  # last bin yielded for each key combination
+    pending = None   # samples of the bins that are not complete yet
+
+    # Read one chunk ahead, to know which one is the last
+    chunks = iter (chunks)
+    chunk = next (chunks, None)
+    while chunk is not None:
+        nextChunk = next (chunks, None)
+        samples = chunk [labels]
+        if pending is not None:
+            samples = pd.concat ([pending, samples], ignore_index=True)
+
+        timeNs = pd.to_timedelta (samples [timeLabel], unit='s').to_numpy ().view (np.int64)
+        df = samples [keys + list (aggregations)].assign (origin=0)
+        if origin == 'start':
+            first = df [keys].assign (origin=timeNs).groupby (keys, as_index=False, sort=False).min ()
+            origins = first if origins is None else pd.concat ([origins, first]).drop_duplicates (keys)
+            df ['origin'] = df [keys].merge (origins, on=keys, how='left') ['origin'].to_numpy ()
+        df ['bin'] = (timeNs - df ['origin'].to_numpy ()) // binNs
+
+        # A bin is complete once a later sample has been read (all of them
+        # after the last chunk)
+        if nextChunk is not None and len (samples) > 0:
+            complete = df ['origin'].to_numpy () + (df ['bin'].to_numpy () + 1) * binNs <= timeNs.max ()
+            pending = samples [~complete]
+            df = df [complete]
+
+        sampledDf = df.groupby (keys + ['bin'], sort=True).agg ({**aggregations, 'origin': 'first'})
+        if fillGaps and len (sampledDf) > 0:
+            ranges = sampledDf.reset_index ().groupby (keys, as_index=False, sort=True).agg (
+                first=('bin', 'min'), last=('bin', 'max'), origin=('origin', 'first'))
+            if lastBins is not None:
+                # Continue from the last bin yielded for the key combination
+                previous = ranges [keys].merge (lastBins, on=keys, how='left') ['bin'].to_numpy ()
+                ranges ['first'] = np.where (np.isnan (previous), ranges ['first'], previous + 1).astype (np.int64)
+            counts = (ranges ['last'] - ranges ['first'] + 1).to_numpy ()
+            offsets = np.arange (counts.sum ()) - np.repeat (np.cumsum (counts) - counts, counts)
+            fullIndex = ranges.iloc [np.repeat (np.arange (len (ranges)), counts)] [keys].reset_index (drop=True)
+            fullIndex ['bin'] = np.repeat (ranges ['first'].to_numpy (), counts) + offsets
+            sampledDf = sampledDf.reindex (pd.MultiIndex.from_frame (fullIndex))
+            sampledDf ['origin'] = np.repeat (ranges ['origin'].to_numpy (), counts)
+            sampledDf [summed] = sampledDf [summed].fillna (0).astype (df [summed].dtypes)
+            last = ranges [keys].assign (bin=ranges ['last'])
+            lastBins = last if lastBins is None else pd.concat ([last, lastBins]).drop_duplicates (keys)
+        sampledDf.reset_index (inplace=True)
+        sampledDf [timeLabel] = pd.to_timedelta (sampledDf ['origin'].astype (np.int64) +
+                                                 sampledDf ['bin'] * binNs, unit='ns')
+        # Skip the chunks that complete no bins, but always yield the last one
+        if len (sampledDf) > 0 or nextChunk is None:
+            yield sampledDf.drop (columns=['bin', 'origin'])
+        chunk = nextChunk
+
+rxPacketTraceColumns = [(0, 'UL/DL', object), # mode (UL/DL)
+                        (1, 'Time [s]', np.float64),
+                        (6, 'OFDM symbols', np.int64),
+                        (7, 'Cell ID', np.int64),
+                        (8, 'RNTI', np.int64),
+                        (9, 'CC ID', np.int64),
+                        (10, 'TB size [bytes]', np.int64),
+                        (11, 'MCS', np.int64),
+                        (13, 'SINR [dB]', np.float64)]
+
 """
     Read RxPacketTrace.txt trace file and return a list containing the 
     parsed values. Can be used as input for the function 
@@ -15,56 +181,32 @@ import matplotlib.pyplot as plt
                           'CC ID', 'TB size [bytes]', 'MCS', 'SINR [dB]'])
 @sem.utils.only_load_some_files(r'.*RxPacketTrace.txt')
 def read_rxPacketTrace (result):    
-    data = [] 
-    lines = result['output']['RxPacketTrace.txt'].splitlines()
-    for line in lines [1:]:
-        values = line.split ("\t")
-        row = [values [0], # mode (UL/DL)
-               float (values [1]), # Time [s]
-               int (values [6]), # OFDM symbols
-               int (values [7]), # Cell ID
-               int (values [8]), # RNTI
-               int (values [9]), # CC ID
-               int (values [10]), # TB size [bytes]
-               int (values [11]), # MCS
-               float (values [13])] # SINR [dB]
-        data += [row]
-    return data
-
-def read_pdcpAndRlcStats (values):
-    start = float (values [0])
-    end = float (values [1])
-    numTxPdus = int (values [6])
-    txBytes = int (values [7])
-    numRxPdus = int (values [8])
-    rxBytes = int (values [9])
-    
-    
-    row = [start, # start [s]
-           end, # end [s]
-           int (values [2]), # Cell ID
-           int (values [3]), # IMSI
-           int (values [4]), # RNTI
-           int (values [5]), # LCID
-           int (values [6]), # num tx PDUs
-           txBytes, # tx bytes
-           int (values [8]), # num rx PDUs
-           rxBytes, # rx bytes
-           float (values [10]), # delay [s]
-           float (values [11]), # delay std dev
-           float (values [12]), # delay min
-           float (values [13]), # delay max
-           txBytes * 8 / (end - start), # avg goodput [bps]
-           rxBytes * 8 / (end - start), # avg throughput [bps]
-           numRxPdus / numTxPdus # avg prr
-          ]
-    return row
+    df = parse_trace (result['output']['RxPacketTrace.txt'], rxPacketTraceColumns)
+    return trace_rows (df)
 
 pdcpAndRlcLabels = ['start [s]', 'end [s]', 'Cell ID', 'IMSI', 'RNTI', 
                    'LCID', 'num tx PDUs', 'tx bytes', 'num rx PDUs', 
                    'rx bytes', 'delay [s]', 'delay std dev', 'delay min',
                    'delay max', 'avg goodput [bps]', 'avg throughput [bps]', 
                    'avg prr']
+
+pdcpAndRlcColumns = [(index, label, np.float64 if label in ['start [s]', 'end [s]'] 
+                      or index >= 10 else np.int64) 
+                     for index, label in enumerate (pdcpAndRlcLabels [:14])]
+
+"""
+    Parse a PDCP or RLC stats trace file and return a DataFrame with the
+    columns in pdcpAndRlcLabels.
+    Args:
+        source (str or file): the content of the trace as a string, or a file
+"""
+def parse_pdcpAndRlcStats (source):
+    df = parse_trace (source, pdcpAndRlcColumns)
+    duration = df ['end [s]'] - df ['start [s]']
+    df ['avg goodput [bps]'] = df ['tx bytes'] * 8 / duration
+    df ['avg throughput [bps]'] = df ['rx bytes'] * 8 / duration
+    df ['avg prr'] = df ['num rx PDUs'] / df ['num tx PDUs']
+    return df
                    
 """
     Read DlPdcpStats.txt trace file and return a list containing the 
@@ -80,13 +222,8 @@ pdcpAndRlcLabels = ['start [s]', 'end [s]', 'Cell ID', 'IMSI', 'RNTI',
 @sem.utils.output_labels(pdcpAndRlcLabels)
 @sem.utils.only_load_some_files(r'.*DlPdcpStats.txt')
 def read_dlPdcpStatsTrace (result):    
-    data = [] 
-    lines = result['output']['DlPdcpStats.txt'].splitlines()
-    for line in lines [1:]:
-        values = line.split ("\t")
-        row = read_pdcpAndRlcStats (values)
-        data += [row]
-    return data
+    df = parse_pdcpAndRlcStats (result['output']['DlPdcpStats.txt'])
+    return trace_rows (df)
 
 """
     Read UlPdcpStats.txt trace file and return a list containing the 
@@ -102,13 +239,8 @@ def read_dlPdcpStatsTrace (result):
 @sem.utils.output_labels(pdcpAndRlcLabels)
 @sem.utils.only_load_some_files(r'.*UlPdcpStats.txt')
 def read_ulPdcpStatsTrace (result):    
-    data = [] 
-    lines = result['output']['UlPdcpStats.txt'].splitlines()
-    for line in lines [1:]:
-        values = line.split ("\t")
-        row = read_pdcpAndRlcStats (values)
-        data += [row]
-    return data
+    df = parse_pdcpAndRlcStats (result['output']['UlPdcpStats.txt'])
+    return trace_rows (df)
 
 """
     Read DlRlcStats.txt trace file and return a list containing the 
@@ -124,13 +256,8 @@ def read_ulPdcpStatsTrace (result):
 @sem.utils.output_labels(pdcpAndRlcLabels)
 @sem.utils.only_load_some_files(r'.*DlRlcStats.txt')
 def read_dlRlcStatsTrace (result):    
-    data = [] 
-    lines = result['output']['DlRlcStats.txt'].splitlines()
-    for line in lines [1:]:
-        values = line.split ("\t")
-        row = read_pdcpAndRlcStats (values)
-        data += [row]
-    return data
+    df = parse_pdcpAndRlcStats (result['output']['DlRlcStats.txt'])
+    return trace_rows (df)
 
 """
     Read UlRlcStats.txt trace file and return a list containing the 
@@ -146,14 +273,21 @@ def read_dlRlcStatsTrace (result):
 @sem.utils.output_labels(pdcpAndRlcLabels)
 @sem.utils.only_load_some_files(r'.*UlRlcStats.txt')
 def read_ulRlcStatsTrace (result):    
-    data = [] 
-    lines = result['output']['UlRlcStats.txt'].splitlines()
-    for line in lines [1:]:
-        values = line.split ("\t")
-        row = read_pdcpAndRlcStats (values)
-        data += [row]
-    return data
+    df = parse_pdcpAndRlcStats (result['output']['UlRlcStats.txt'])
+    return trace_rows (df)
     
+appStatsColumns = [(0, 'start [s]', np.float64),
+                   (1, 'end [s]', np.float64),
+                   (2, 'NodeId', np.int64),
+                   (3, 'nTxBursts', np.int64),
+                   (4, 'TxBytes', np.int64),
+                   (5, 'nRxBursts', np.int64),
+                   (6, 'RxBytes', np.int64),
+                   (7, 'delay [s]', np.float64),
+                   (8, 'stdDev', np.float64),
+                   (9, 'min', np.float64),
+                   (10, 'max', np.float64)]
+
 """
     Read AppStats.txt trace file and return a list containing the 
     parsed values. Can be used as input for the function 
@@ -162,36 +296,26 @@ def read_ulRlcStatsTrace (result):
         result (str): the content of AppStats.txt as a string
 """
 @sem.utils.yields_multiple_results
-@sem.utils.output_labels(['start [s]', 'end [s]', 'NodeId', 'nTxBursts', 'TxBytes', 
-                          'nRxBursts', 'RxBytes', 'delay [s]', 'stdDev', 'min', 
-                          'max', 'avg prr', 'avg throughput [bps]'])
+@sem.utils.output_labels([label for _, label, _ in appStatsColumns] + 
+                         ['avg prr', 'avg throughput [bps]'])
 @sem.utils.only_load_some_files(r'.*AppStats.txt')
 def read_appStatsTrace (result):    
-    data = [] 
-    lines = result['output']['AppStats.txt'].splitlines()
-    for line in lines [1:]:
-        values = line.split ("\t")
-        start = float (values [0])
-        end = float (values [1])
-        nTxBursts = int (values [3]) 
-        nRxBursts = int (values [5])
-        rxBytes = int (values [6])
-        row = [start, # start [s]
-               end, # end [s]
-               int (values [2]), # NodeId
-               nTxBursts, # nTxBursts
-               int (values [4]), # TxBytes
-               nRxBursts, # nRxBursts
-               rxBytes, # RxBytes
-               float (values [7])/1e9, # delay [ns]
-               float (values [8]), # stdDev
-               float (values [9]), # min
-               float (values [10]), # max
-               nRxBursts / nTxBursts, # avg prr
-               rxBytes * 8 / (end - start)] # avg throughput [bps]
-        data += [row]
-    return data
-    
+    df = parse_trace (result['output']['AppStats.txt'], appStatsColumns)
+    df ['delay [s]'] = df ['delay [s]'] / 1e9 # delay [ns]
+    df ['avg prr'] = df ['nRxBursts'] / df ['nTxBursts']
+    df ['avg throughput [bps]'] = df ['RxBytes'] * 8 / (df ['end [s]'] - df ['start [s]'])
+    return trace_rows (df)
+
+sampledRxPacketTraceLabels = ['Time [s]', 'OFDM symbols', 'Cell ID', 'RNTI',
+                              'CC ID', 'TB size [bytes]', 'MCS', 'SINR [dB]', 'UL/DL']
+
+# Average the values of each user (and direction) in periods of 100 ms
+sampledRxPacketTraceResampling = {'keys': ['Cell ID', 'RNTI', 'CC ID', 'UL/DL'],
+                                  'aggregations': {'OFDM symbols': 'mean',
+                                                   'TB size [bytes]': 'mean',
+                                                   'MCS': 'mean',
+                                                   'SINR [dB]': 'mean'}}
+
 """
     Read RxPacketTrace.txt trace file, parse it using a sampling time of 100 ms 
     and return a list containing the sampled values. 
@@ -200,42 +324,32 @@ def read_appStatsTrace (result):
         result (str): the content of RxPacketTrace.txt as a string
 """
 @sem.utils.yields_multiple_results
-@sem.utils.output_labels(['Time [s]', 'OFDM symbols', 'Cell ID', 'RNTI', 
-                          'CC ID', 'TB size [bytes]', 'MCS', 'SINR [dB]', 'UL/DL'])
+@sem.utils.output_labels(sampledRxPacketTraceLabels)
 @sem.utils.only_load_some_files(r'.*RxPacketTrace.txt')
 def sample_rxPacketTrace (result):    
-    data = []
-    df = pd.read_csv (StringIO (result ['output']['RxPacketTrace.txt']), 
-                      delimiter = "\t", index_col=False, 
-                      usecols = [0, 1, 6, 7, 8, 9, 10, 11, 13], 
-                      names = ['UL/DL', 'Time [s]', 'OFDM symbols', 'Cell ID', 
-                               'RNTI', 'CC ID', 'TB size [bytes]', 'MCS', 'SINR [dB]'], 
-                      dtype = {'mode' : 'object', 
-                               'Time [s]' : 'float', 
-                               'OFDM symbols' : 'int', 
-                               'Cell ID' : 'int', 
-                               'RNTI' : 'int', 
-                               'CC ID' : 'int', 
-                               'TB size [bytes]' : 'int', 
-                               'MCS' : 'int', 
-                               'SINR [dB]' : 'float'}, 
-                      engine='python', header=0)
-    
-    grouper = df.groupby (['Cell ID', 'RNTI', 'CC ID', 'UL/DL'])
-    sampledDf = pd.DataFrame ()
-    for name, group in grouper: 
-        group ['Time [s]'] = pd.to_timedelta (group ['Time [s]'], unit='s')
-        group.set_index ('Time [s]', inplace=True)
-        
-        numeric = group.select_dtypes('number').columns
-        non_num = group.columns.difference(numeric)
-        d = {**{x: 'mean' for x in numeric}, **{x: 'first' for x in non_num}}
-
-        group = group.resample ("100ms").agg (d)
-        group.reset_index (inplace=True)
-        sampledDf = sampledDf.append (group, ignore_index=True)
-    
-    return sampledDf.values.tolist ()
+    df = parse_trace (result ['output']['RxPacketTrace.txt'], rxPacketTraceColumns)
+    sampledDf = resample_trace (df, **sampledRxPacketTraceResampling)
+    return trace_rows (sampledDf [sampledRxPacketTraceLabels])
+
+"""
+    Read a RxPacketTrace.txt trace file from disk in chunks and yield the
+    values sampled as in sample_rxPacketTrace, as DataFrames, while it is
+    read. The memory used does not depend on the size of the trace.
+    Args:
+        path (str): the path of RxPacketTrace.txt
+        chunkRows (int): number of lines read at a time
+"""
+def stream_sample_rxPacketTrace (path, chunkRows=200000):
+    chunks = parse_trace_chunks (path, rxPacketTraceColumns, chunkRows)
+    for sampledDf in stream_resample_trace (chunks, **sampledRxPacketTraceResampling):
+        yield sampledDf [sampledRxPacketTraceLabels]
+
+ofdmSymLabels = ['Time [s]', 'OFDM symbols', 'Cell ID', 'RNTI', 'CC ID']
+
+# Group the results by user, resample them using a sampling period of
+# 100 ms and compute the overall number of OFDM symbols used in each period
+ofdmSymResampling = {'keys': ['Cell ID', 'RNTI', 'CC ID'],
+                     'aggregations': {'OFDM symbols': 'sum'}}
 
 """
     Read RxPacketTrace.txt trace file, parse it using a sampling time of 100 ms 
@@ -245,42 +359,84 @@ def sample_rxPacketTrace (result):
         result (str): the content of RxPacketTrace.txt as a string
 """
 @sem.utils.yields_multiple_results
-@sem.utils.output_labels(['Time [s]', 'OFDM symbols', 'Cell ID', 'RNTI', 
-                          'CC ID'])
+@sem.utils.output_labels(ofdmSymLabels)
 @sem.utils.only_load_some_files(r'.*RxPacketTrace.txt')
 def calc_ofdm_sym (result):    
+    df = parse_trace (result ['output']['RxPacketTrace.txt'], rxPacketTraceColumns [:6])
+    sampledDf = resample_trace (df, **ofdmSymResampling)
+    return trace_rows (sampledDf [ofdmSymLabels])
+
+"""
+    Read a RxPacketTrace.txt trace file from disk in chunks and yield the
+    number of OFDM symbols used in each time period, as in calc_ofdm_sym,
+    as DataFrames, while it is read.
+    Args:
+        path (str): the path of RxPacketTrace.txt
+        chunkRows (int): number of lines read at a time
+"""
+def stream_calc_ofdm_sym (path, chunkRows=200000):
+    chunks = parse_trace_chunks (path, rxPacketTraceColumns [:6], chunkRows)
+    for sampledDf in stream_resample_trace (chunks, **ofdmSymResampling):
+        yield sampledDf [ofdmSymLabels]
+
+"""
+    Streaming counterpart of the function get_results_as_dataframe provided
+    by sem: apply a stream_* function to the trace file of each result,
+    without loading it in memory, and return the sampled values of all the
+    results in a DataFrame, with a column per parameter.
+    Args:
+        campaign (CampaignManager): the sem campaign
+        function (function): e.g. stream_sample_rxPacketTrace
+        params (list): the parameter combinations (as sem.list_param_combinations)
+        fileName (str): the name of the trace file
+        chunkRows (int): number of lines read at a time
+"""
+def get_streamed_results_as_dataframe (campaign, function, params,
+                                       fileName='RxPacketTrace.txt',
+                                       chunkRows=200000):
     data = []
-    df = pd.read_csv (StringIO (result ['output']['RxPacketTrace.txt']), 
-                      delimiter = "\t", index_col=False, 
-                      usecols = [0, 1, 6, 7, 8, 9], 
-                      names = ['UL/DL', 'Time [s]', 'OFDM symbols', 'Cell ID', 
-                               'RNTI', 'CC ID'], 
-                      dtype = {'mode' : 'object', 
-                               'Time [s]' : 'float', 
-                               'OFDM symbols' : 'int', 
-                               'Cell ID' : 'int', 
-                               'RNTI' : 'int', 
-                               'CC ID' : 'int'}, 
-                      engine='python', header=0)
-    
-    # Group the results, each group corresponds to a single user
-    grouper = df.groupby (['Cell ID', 'RNTI', 'CC ID'])
-    sampledDf = pd.DataFrame ()
-    
-    # For each user, resample the results and compute the number of OFDM symbols
-    # that have been used
-    for name, group in grouper: 
-        group ['Time [s]'] = pd.to_timedelta (group ['Time [s]'], unit='s')
-        group.set_index ('Time [s]', inplace=True)
-        
-        # Resample and aggregate the results using a sampling period of 100 ms
-        # In each sampling period, compute the overall number of OFDM symbols 
-        # that have been used 
-        d = {'OFDM symbols': 'sum', 'Cell ID': 'first', 'RNTI': 'first', 'CC ID': 'first'}
-        group = group.resample ("100ms").agg (d)
-        group.reset_index (inplace=True)
-        sampledDf = sampledDf.append (group, ignore_index=True)
-    return sampledDf.values.tolist ()
+    for paramsComb in params:
+        for result in campaign.db.get_results (paramsComb):
+            path = campaign.db.get_result_files (result) [fileName]
+            for df in function (path, chunkRows):
+                data.append (df.assign (**result ['params'])
+                             [list (result ['params']) + list (df.columns)])
+    if not data:
+        return pd.DataFrame ()
+    return pd.concat (data, ignore_index=True)
+
+ranAiLabels = ['Time [s]',
+               'IMSI',
+               'MCS',
+               'OFDM symbols',
+               'SINR [dB]',
+               'RLC tx pcks',
+               'RLC tx bytes',
+               'RLC rx pcks',
+               'RLC rx bytes',
+               'RLC avg delay',
+               'RLC std delay',
+               'RLC min delay',
+               'RLC max delay',
+               'PDCP tx pcks',
+               'PDCP tx bytes',
+               'PDCP rx pcks',
+               'PDCP rx bytes',
+               'PDCP avg delay',
+               'PDCP std delay',
+               'PDCP min delay',
+               'PDCP max delay',
+               'APP tx pcks',
+               'APP tx bytes',
+               'APP rx pcks',
+               'APP rx bytes',
+               'APP avg delay',
+               'APP std delay',
+               'APP min delay',
+               'APP max delay']
+
+ranAiColumns = [(index, label, np.int64 if label == 'IMSI' else np.float64) 
+                for index, label in enumerate (ranAiLabels)]
 
 """
     Read RanAiStats.txt trace file and return a list containing the 
@@ -290,72 +446,8 @@ def calc_ofdm_sym (result):
         result (str): the content of RanAiStats.txt as a string
 """
 @sem.utils.yields_multiple_results
-@sem.utils.output_labels(['Time [s]',
-                          'IMSI',
-                          'MCS',
-                          'OFDM symbols',
-                          'SINR [dB]',
-                          'RLC tx pcks',
-                          'RLC tx bytes',
-                          'RLC rx pcks',
-                          'RLC rx bytes',
-                          'RLC avg delay',
-                          'RLC std delay',
-                          'RLC min delay',
-                          'RLC max delay',
-                          'PDCP tx pcks',
-                          'PDCP tx bytes',
-                          'PDCP rx pcks',
-                          'PDCP rx bytes',
-                          'PDCP avg delay',
-                          'PDCP std delay',
-                          'PDCP min delay',
-                          'PDCP max delay',
-                          'APP tx pcks',
-                          'APP tx bytes',
-                          'APP rx pcks',
-                          'APP rx bytes',
-                          'APP avg delay',
-                          'APP std delay',
-                          'APP min delay',
-                          'APP max delay'
-                          ])
+@sem.utils.output_labels(ranAiLabels)
 @sem.utils.only_load_some_files(r'.*RanAiStats.txt')
 def read_ran_ai(result):
-    data = []
-    lines = result['output']['RanAiStats.txt'].splitlines()
-
-    for line in lines[1:]:
-        values = line.split("\t")
-        row = [float(values[0]),
-               int(values[1]),
-               float(values[2]),
-               float(values[3]),
-               float(values[4]),
-               float(values[5]),
-               float(values[6]),
-               float(values[7]),
-               float(values[8]),
-               float(values[9]),
-               float(values[10]),
-               float(values[11]),
-               float(values[12]),
-               float(values[13]),
-               float(values[14]),
-               float(values[15]),
-               float(values[16]),
-               float(values[17]),
-               float(values[18]),
-               float(values[19]),
-               float(values[20]),
-               float(values[21]),
-               float(values[22]),
-               float(values[23]),
-               float(values[24]),
-               float(values[25]),
-               float(values[26]),
-               float(values[27]),
-               float(values[28])
-               ]
-        data += [row]
-    return data
+    df = parse_trace (result['output']['RanAiStats.txt'], ranAiColumns)
+    return trace_rows (df)
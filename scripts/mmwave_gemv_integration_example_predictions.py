@@ -9,12 +9,14 @@ from pathlib import Path
 import logging as log
 # log.basicConfig(level=log.DEBUG)
 from scipy import interpolate
+from scipy.spatial import cKDTree, Delaunay
 from sklearn.metrics import mean_squared_error, accuracy_score, precision_score, recall_score
 import matplotlib.colors as colors
-import geopy.distance
 import math
 import argparse
-from multiprocessing import Process
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 def plot_map (ax, x, y, z):
     im = ax.scatter (x, y, c = z, s = 5, norm=colors.PowerNorm (gamma = 0.5))
@@ -43,6 +45,29 @@ def plot_counts (train):
     ax.set_title ('Number of available measurements')
     plt.show ()
 
+"""
+Builds the interpolators of the delay measured in the visited locations, as
+interpolate.griddata does at each call, so that they can be reused for any
+set of unknown points: a KD-tree for the nearest neighbor and a Delaunay
+triangulation for the linear interpolation.
+
+Params: 
+    - trainSamples: dataframe containing the measerements retrieved in the 
+                    visited locations
+    - methods: the interpolation methods to build ('nearest', 'linear')
+Return:
+    - dictionary with the interpolator of each method
+"""
+def build_interpolators (trainSamples, methods=('nearest', 'linear')):
+    points = np.array (trainSamples ['coordinates'].to_list (), dtype=float).reshape (-1, 2)
+    values = trainSamples ['delay [s]'].to_numpy ()
+    interpolators = {}
+    if ('nearest' in methods):
+        interpolators ['nearest'] = interpolate.NearestNDInterpolator (points, values)
+    if ('linear' in methods):
+        interpolators ['linear'] = interpolate.LinearNDInterpolator (Delaunay (points), values)
+    return interpolators
+
 """
 Predicts the delay in unknown points by using a nearest neighbor or linear 
 interpolation approach. 
@@ -52,19 +77,81 @@ Params:
                     visited locations
     - unknownPoints: coordinates of the unknown locations 
     - method: 'nearest' for nearest neighbor, 'linear' for linear interpolation
+    - interpolators: the interpolators of trainSamples, if already built (see
+                     build_interpolators)
 """     
-def predict (trainSamples, unknownPoints, method):
-    # import pdb; pdb.set_trace ()
-    Z = interpolate.griddata (trainSamples ['coordinates'].to_list (),
-                              trainSamples ['delay [s]'].to_numpy (),
-                              unknownPoints, 
-                              method=method)
+def predict (trainSamples, unknownPoints, method, interpolators=None):
+    if (interpolators is None):
+        interpolators = build_interpolators (trainSamples, [method])
+    Z = interpolators [method] (np.array (unknownPoints, dtype=float).reshape (-1, 2))
     return Z
 
+WGS84_A = 6378137.0 # semi-major axis [m]
+WGS84_E2 = 6.69437999014e-3 # first eccentricity squared
+
+"""
+Returns the meridian and the prime vertical radii of curvature [m] of the 
+WGS-84 ellipsoid (the one used by geopy.distance) at the given latitudes.
+
+Params: 
+    - lat: latitudes in degrees
+"""
+def ellipsoid_radii (lat):
+    w = np.sqrt (1 - WGS84_E2 * np.sin (np.radians (lat))**2)
+    return WGS84_A * (1 - WGS84_E2) / w**3, WGS84_A / w
+
+"""
+Projects points on a plane tangent to the ellipsoid in [origin], where the 
+euclidean distance approximates the geodesic one around the origin.
+As in geopy.distance, the first coordinate of each point is the latitude and 
+the second one the longitude, in degrees.
+
+Params: 
+    - points: array (or list) of points, with shape (numPoints, 2)
+    - origin: point of tangency
+Return:
+    - array with the (north, east) coordinates of the points in meters
+"""
+def project_points (points, origin):
+    points = np.asarray (points, dtype=float).reshape (-1, 2)
+    m, n = ellipsoid_radii (origin [0])
+    return np.column_stack ((np.radians (points [:, 0] - origin [0]) * m,
+                             np.radians (points [:, 1] - origin [1]) * n * np.cos (np.radians (origin [0]))))
+
+"""
+Computes the distance in meters between two arrays of points (same 
+convention as project_points), on the plane tangent to the ellipsoid at their 
+mean latitude. For points closer than a few kilometers it matches 
+geopy.distance.distance within a millimeter.
+"""
+def local_distance (p, q):
+    lat = (p [..., 0] + q [..., 0]) / 2
+    m, n = ellipsoid_radii (lat)
+    return np.hypot (np.radians (p [..., 0] - q [..., 0]) * m,
+                     np.radians (p [..., 1] - q [..., 1]) * n * np.cos (np.radians (lat)))
+
+"""
+Builds a KD-tree over the visited locations, projected with project_points 
+around their centroid, so that the neighbors of any set of points can be 
+found with a single query. 
+
+Params: 
+    - trainSamples: dataframe containing the measerements retrieved in the 
+                    visited locations
+Return:
+    - (tree, origin of the projection, coordinates of the visited locations)
+"""
+def build_spatial_index (trainSamples):
+    points = np.array (trainSamples ['coordinates'].to_list (), dtype=float).reshape (-1, 2)
+    origin = points.mean (axis=0)
+    return cKDTree (project_points (points, origin)), origin, points
+
 """
 Predicts the delay in unknown points by averaging the value measured in the 
 [numNeighbors] closest visited locations. 
 If idw = True, inverse distance weighting is applied.
+The closest locations of all the unknown points are found at once with a 
+spatial index (see build_spatial_index), then sorted by their distance.
 
 Params: 
     - trainSamples: dataframe containing the measerements retrieved in the 
@@ -72,38 +159,144 @@ Params:
     - unknownPoints: coordinates of the unknown locations 
     - numNeighbors: number of closest visited points to be considered 
     - idw: whether to apply inverse distance weighting
+    - index: the spatial index of trainSamples, if already built
+Return:
+    - array with the predicted values
 """  
-def movAv_predict (trainSamples, unknownPoints, numNeighbors=5, idw=False):
-    Z = []
-    for u in unknownPoints:
-        # compute the distance between the unknown location and the visited 
-        # locations 
-        d = []
-        newTrainSamples = trainSamples
-        newTrainSamples ['distance'] = newTrainSamples.apply (lambda row, u=u: 
-                                       # math.sqrt ((u [0] - row.x)**2 + (u [1] - row.y)**2), 
-                                       geopy.distance.distance (u, row.coordinates).m, 
-                                       axis = 1)
-                
-        # extract the [numNeighbors] closest visited locations
-        closestPoints = newTrainSamples.sort_values ('distance').head (numNeighbors)
-        
-        # predict the value in the unknown location by averaging the values 
-        # achieved in the closest visited locations
-        if (idw):
-            weights = 1 / closestPoints ['distance']
-            if (np.isinf (weights).any ()):
-                prediction = closestPoints ['delay [s]'].to_numpy () [0] 
-            else:
-                prediction = (closestPoints ['delay [s]'] * weights).sum () / weights.sum ()
-        else:
-            prediction = closestPoints ['delay [s]'].mean ()
-                    
-        Z.append (prediction)
-    return Z    
+def movAv_predict (trainSamples, unknownPoints, numNeighbors=5, idw=False, index=None):
+    if (index is None):
+        index = build_spatial_index (trainSamples)
+    tree, origin, points = index
+    values = trainSamples ['delay [s]'].to_numpy (dtype=float)
+    unknownPoints = np.array (unknownPoints, dtype=float).reshape (-1, 2)
+    if (len (unknownPoints) == 0):
+        return np.array ([])
+    
+    # the projection slightly distorts the distances far from the origin, 
+    # hence we take twice the candidates from the tree and sort them by their 
+    # distance from the unknown location (equal distances by position in 
+    # trainSamples)
+    numNeighbors = min (numNeighbors, len (points))
+    numCandidates = min (2 * numNeighbors, len (points))
+    _, candidates = tree.query (project_points (unknownPoints, origin), k=numCandidates)
+    candidates = candidates.reshape (len (unknownPoints), numCandidates)
+    distances = local_distance (unknownPoints [:, np.newaxis, :], points [candidates])
+    order = np.lexsort ((candidates, distances), axis=1) [:, :numNeighbors]
+    closestPoints = np.take_along_axis (candidates, order, axis=1)
+    distances = np.take_along_axis (distances, order, axis=1)
+    
+    # predict the value in the unknown location by averaging the values 
+    # achieved in the closest visited locations
+    if (idw):
+        with np.errstate (divide='ignore', invalid='ignore'):
+            weights = 1 / distances
+            weighted = (values [closestPoints] * weights).sum (axis=1) / weights.sum (axis=1)
+        # an unknown location that has been visited takes the measured value
+        return np.where (np.isinf (weights).any (axis=1), 
+                         values [closestPoints [:, 0]], weighted)
+    return values [closestPoints].mean (axis=1)
+
+"""
+Predicts the delay in unknown points with all the methods, each one with a
+single call for all the points: nearest neighbor, linear interpolation,
+moving average and inverse distance weighting.
+
+Params: 
+    - trainSamples: dataframe containing the measerements retrieved in the 
+                    visited locations
+    - unknownPoints: coordinates of the unknown locations 
+    - numNeighbors: number of closest visited points to be considered (moving
+                    average and inverse distance weighting)
+    - interpolators: the interpolators of trainSamples, if already built
+    - index: the spatial index of trainSamples, if already built
+Return:
+    - arrays with the nearest neighbor, linear, moving average and inverse
+      distance weighting predictions
+"""
+def predict_all (trainSamples, unknownPoints, numNeighbors, interpolators=None, index=None):
+    if (interpolators is None):
+        interpolators = build_interpolators (trainSamples)
+    if (index is None):
+        index = build_spatial_index (trainSamples)
+    nn_predictions = predict (trainSamples, unknownPoints, 'nearest', interpolators)
+    # NOTE linear predictions may not be feasible for each point in the
+    # trajectory, because the point may lay "outside of the convex hull of
+    # the input points."
+    # In this case, we use NN to predict the experienced delay.
+    lin_predictions = predict (trainSamples, unknownPoints, 'linear', interpolators)
+    lin_predictions [np.isnan (lin_predictions)] = nn_predictions [np.isnan (lin_predictions)]
+    movAv_predictions = movAv_predict (trainSamples, unknownPoints, numNeighbors, index=index)
+    idw_predictions = movAv_predict (trainSamples, unknownPoints, numNeighbors, idw=True, index=index)
+    return nn_predictions, lin_predictions, movAv_predictions, idw_predictions
 
 ###############################################################################
 
+"""
+Returns the time of the last change in the results of a simulation campaign
+(new simulations update the campaign database and data folder)
+
+Params: 
+    - ns_res_path: the path to the simulation results
+    - figure_path: the figures folder, ignored if it is in ns_res_path
+"""
+def campaign_mtime (ns_res_path, figure_path):
+    return max ([os.path.getmtime (ns_res_path)] +
+                [entry.stat ().st_mtime for entry in os.scandir (ns_res_path)
+                 if os.path.abspath (entry.path) != os.path.abspath (figure_path)])
+
+"""
+Parses the APP layer results of the campaign specified by [campaignName]
+obtained with the specified [kittiModel], and associates the delay to the
+positions visited by each vehicle. The parsed data is saved in the figure
+folder of the campaign and loaded from there, until the campaign results
+change.
+
+Params: 
+    - campaignName: name of the simualtion campaign to load
+    - kittiModel: kitti model 
+Return:
+    - dictionary with the vehicle indexes ('vehicles', as in the results) and
+      a dataframe with the firstVehicleIndex, the visited positions (x, y) and
+      the delay measured there, vehicle by vehicle ('data')
+"""
+def load_prediction_data (campaignName, kittiModel):
+    (ns_path, ns_script, ns_res_path, 
+    params_grid, base_figure_foder) = get_campaign_params (campaignName)
+    log.debug ('results path: ' + ns_res_path)
+    
+    cacheFolder = base_figure_foder + 'predictions/' + str (kittiModel) + '/'
+    cachePath = cacheFolder + 'data.pkl'
+    if (os.path.isfile (cachePath) and
+        os.path.getmtime (cachePath) >= campaign_mtime (ns_res_path, base_figure_foder)):
+        return pd.read_pickle (cachePath)
+
+    # for the moment focus on a single APP mode
+    params_grid ['kittiModel'] = kittiModel
+
+    campaign = sem.CampaignManager.load (campaign_dir=ns_res_path)
+    log.debug (campaign)
+    overall_list = sem.list_param_combinations(params_grid)
+    log.debug (overall_list)
+
+    # parse APP layer results
+    results = campaign.get_results_as_dataframe(read_appStatsTrace,
+                                                params=overall_list,
+                                                verbose=True, 
+                                                parallel_parsing=False)
+    log.debug (results)
+    # results = results [results ['firstVehicleIndex'].isin ([0,1])] # for testing purposes
+    vehicles = results ['firstVehicleIndex'].unique ()
+    data = pd.concat ([map_position_to_metric (results [results ['firstVehicleIndex'] == i], 'delay [s]')
+                       .assign (firstVehicleIndex=i) for i in vehicles], ignore_index=True)
+    predictionData = {'vehicles': vehicles,
+                      'data': data [['firstVehicleIndex', 'x', 'y', 'delay [s]']]}
+
+    # write a new file and replace the old one, to never leave a partial file
+    Path (cacheFolder).mkdir (parents=True, exist_ok=True)
+    pd.to_pickle (predictionData, cachePath + '.tmp')
+    os.replace (cachePath + '.tmp', cachePath)
+    return predictionData
+
 """
 Main function. Loads the the campaign specified by [campaignName] and extracts 
 those obtained with the specified [kittiModel]. It draws [numVisitedLocations] 
@@ -122,8 +315,10 @@ Params:
     - numNeighbors: number of neighboring locations (used by moving average and 
                     inverse distance weighting to determing the size of the 
                     neighborhood)
+    - predictionData: the data returned by load_prediction_data, if already
+                      loaded
 """  
-def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
+def main (campaignName, kittiModel, numVisitedLocations, numNeighbors, predictionData=None):
 
     print ("\ncampaignName = " + str (campaignName))
     print ("kittiModel = " + str (kittiModel))
@@ -135,29 +330,18 @@ def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
 
     (ns_path, ns_script, ns_res_path, 
     params_grid, base_figure_foder) = get_campaign_params (campaignName)
-    log.debug ('results path: ' + ns_res_path)
 
-    # for the moment focus on a single APP mode
-    params_grid ['kittiModel'] = kittiModel
     figure_folder = (base_figure_foder + 'predictions/' + 
                      str (kittiModel) + 
                     '/numVisitedLocations=' + str (numVisitedLocations) + 
                     '/numNeighbors=' + str (numNeighbors) + '/')
     Path(figure_folder).mkdir (parents=True, exist_ok=True)
 
-    campaign = sem.CampaignManager.load (campaign_dir=ns_res_path)
-    log.debug (campaign)
-    overall_list = sem.list_param_combinations(params_grid)
-    log.debug (overall_list)
-
-    # parse APP layer results
-    results = campaign.get_results_as_dataframe(read_appStatsTrace,
-                                                params=overall_list,
-                                                verbose=True, 
-                                                parallel_parsing=False)
-    log.debug (results)
-    # results = results [results ['firstVehicleIndex'].isin ([0,1])] # for testing purposes
-    data = map_position_to_metric (results, 'delay [s]')
+    if (predictionData is None):
+        predictionData = load_prediction_data (campaignName, kittiModel)
+    vehicles = predictionData ['vehicles']
+    vehicleData = predictionData ['data']
+    data = vehicleData [['x', 'y', 'delay [s]']].copy ()
 
     # create a new column by merging (x, y) values
     data ['coordinates'] = list (zip (data ['x'], data ['y']))
@@ -182,9 +366,24 @@ def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
     # We take the mean over the available measurements.
     meanTrainSamples = train.groupby ('coordinates', as_index=False).mean ()
     log.debug ('\nMean trains samples\n' + str (meanTrainSamples))
+    
+    # create test set: the trajectory of each vehicle
+    tests = []
+    for i in vehicles:
+        test = vehicleData [vehicleData ['firstVehicleIndex'] == i] [['x', 'y', 'delay [s]']].reset_index (drop=True)
+        test ['coordinates'] = list (zip (test ['x'], test ['y']))
+        tests.append (test)
+
+    # predict the values measured by the vehicles during their trajectories,
+    # all at once: the visited locations are the same for all the trajectories
+    allPoints = np.array ([c for test in tests for c in test ['coordinates']], dtype=float).reshape (-1, 2)
+    allPredictions = predict_all (meanTrainSamples, allPoints, numNeighbors)
+    splits = np.cumsum ([len (test) for test in tests]) [:-1]
+    (nn_all, lin_all, movAv_all,
+     idw_all) = [np.split (predictions, splits) for predictions in allPredictions]
 
     num_cols = 5
-    num_plots = len (results ['firstVehicleIndex'].unique ())
+    num_plots = len (vehicles)
     num_rows = ceil (num_plots / num_cols)
     fig_predictions, ax_predictions = plt.subplots (num_rows, num_cols, 
                                                     figsize=(7*num_rows, 9*num_cols), 
@@ -209,24 +408,13 @@ def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
     lin_recallScore = []
     movAv_recallScore = []
     idw_recallScore = []
-    for i in results ['firstVehicleIndex'].unique ():
+    for v, i in enumerate (vehicles):
         print ('Testing vehicle ' + str (i))
-        # create test set
-        # consider a single trajectory at a time
-        test = map_position_to_metric (results [results ['firstVehicleIndex'] == i], 'delay [s]')
-        test ['coordinates'] = list (zip (test ['x'], test ['y']))
-        
-        # predict the values measured by the vehicle during its trajectory
-        nn_predictions = predict (meanTrainSamples, test ['coordinates'].to_list (), 'nearest')
-        # NOTE linear predictions may not be feasible for each point in the 
-        # trajectory, because the point may lay "outside of the convex hull of 
-        # the input points." 
-        # In this case, we use NN to predict the experienced delay. 
-        lin_predictions = predict (meanTrainSamples, test ['coordinates'].to_list (), 'linear')
-        lin_predictions [np.isnan (lin_predictions)] = nn_predictions [np.isnan (lin_predictions)]
-        movAv_predictions = movAv_predict (meanTrainSamples, test ['coordinates'].to_list (), numNeighbors)
-        idw_predictions = movAv_predict (meanTrainSamples, test ['coordinates'].to_list (), numNeighbors, idw=True)
-        # import pdb; pdb.set_trace ()
+        test = tests [v]
+        nn_predictions = nn_all [v]
+        lin_predictions = lin_all [v]
+        movAv_predictions = movAv_all [v]
+        idw_predictions = idw_all [v]
 
         row_index = int (i / num_cols)
         col_index = i % num_cols
@@ -306,10 +494,10 @@ def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
     # plot MSE
     fig_mse, ax_mse = plt.subplots (1, 1)
     width = 0.2
-    ax_mse.bar (results ['firstVehicleIndex'].unique () - 0.5, nn_mse, width=width, label='nn')
-    ax_mse.bar (results ['firstVehicleIndex'].unique () - 0.5 + width, lin_mse, width=width, label='lin')
-    ax_mse.bar (results ['firstVehicleIndex'].unique () - 0.5 + 2*width, movAv_mse, width=width, label='movAv')
-    ax_mse.bar (results ['firstVehicleIndex'].unique () - 0.5 + 3*width, idw_mse, width=width, label='idw')
+    ax_mse.bar (vehicles - 0.5, nn_mse, width=width, label='nn')
+    ax_mse.bar (vehicles - 0.5 + width, lin_mse, width=width, label='lin')
+    ax_mse.bar (vehicles - 0.5 + 2*width, movAv_mse, width=width, label='movAv')
+    ax_mse.bar (vehicles - 0.5 + 3*width, idw_mse, width=width, label='idw')
     ax_mse.set_ylabel ('MSE')
     ax_mse.set_yscale ('log')
     ax_mse.legend ()
@@ -323,7 +511,7 @@ def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
                                           'MOV_AV mse', 'MOV_AV accuracy', 'MOV_AV precision', 'MOV_AV recall', 
                                           'IDW mse', 'IDW accuracy', 'IDW precision', 'IDW recall'])
 
-    df_metrics ['firstVehicleIndex'] = results ['firstVehicleIndex'].unique ()
+    df_metrics ['firstVehicleIndex'] = vehicles
     df_metrics ['NN mse'] = nn_mse
     df_metrics ['LIN mse'] = lin_mse
     df_metrics ['MOV_AV mse'] = movAv_mse
@@ -350,6 +538,46 @@ def main (campaignName, kittiModel, numVisitedLocations, numNeighbors):
     print ('MOV_AV\t', sum ([abs (n) for n in movAv_mse]))
     print ('IDW\t', sum ([abs (n) for n in idw_mse]))
 
+# data of each kitti model, inherited by the worker processes
+sharedPredictionData = {}
+
+def share_prediction_data (predictionData):
+    sharedPredictionData.update (predictionData)
+
+def run_shared_prediction (campaignName, kittiModel, numVisitedLocations, numNeighbors):
+    main (campaignName, kittiModel, numVisitedLocations, numNeighbors,
+          sharedPredictionData [kittiModel])
+
+"""
+Runs main for each combination of the parameters on a bounded pool of
+processes. The results of each kitti model are parsed (or loaded from the
+cache) once, before starting the pool, and shared with the processes, which
+inherit them when they are forked.
+
+Params: 
+    - campaignName: name of the simualtion campaign to load
+    - kittiModelList: kitti models
+    - numVisitedLocationsList: numbers of visited locations
+    - numNeighborsList: numbers of neighboring locations
+    - numWorkers: maximum number of parallel processes (default: number of
+                  CPUs)
+"""
+def run_predictions (campaignName, kittiModelList, numVisitedLocationsList,
+                     numNeighborsList, numWorkers=None):
+    predictionData = {k: load_prediction_data (campaignName, k) for k in kittiModelList}
+    combinations = [(k, v, n) for k in kittiModelList
+                    for v in numVisitedLocationsList for n in numNeighborsList]
+    numWorkers = min (numWorkers or os.cpu_count (), len (combinations))
+    with ProcessPoolExecutor (max_workers=numWorkers,
+                              mp_context=multiprocessing.get_context ('fork'),
+                              initializer=share_prediction_data,
+                              initargs=(predictionData,)) as pool:
+        futures = [pool.submit (run_shared_prediction, campaignName, k, v, n)
+                   for k, v, n in combinations]
+        # wait for all the combinations, raising the first error (if any)
+        for future in futures:
+            future.result ()
+
 if __name__ == "__main__":
     
     # define default arguments
@@ -368,6 +596,8 @@ if __name__ == "__main__":
                         help='number of visited locations (can be a list)')
     parser.add_argument('-n', type=int, nargs='+', dest='numNeighborsList',
                         help='number of nighbor locations (can be a list)')
+    parser.add_argument('-w', type=int, dest='numWorkers', default=None,
+                        help='maximum number of parallel processes (default: number of CPUs)')
     args = parser.parse_args ()
 
     if (args.campaignName != None):
@@ -383,20 +613,11 @@ if __name__ == "__main__":
     if (parallelExecution):
         # if more than one value per command line argument is specified, run 
         # multiple processes in parallel
-        proc = [] # list of running processes
-        for k in kittiModelList:
-            for v in numVisitedLocationsList:
-                for n in numNeighborsList: 
-                    p = Process (target=main, args=(campaignName, k, v, n))
-                    p.start ()
-                    proc.append (p)
-
-        # join the processes that are running
-        for p in proc:
-            p.join ()
+        run_predictions (campaignName, kittiModelList, numVisitedLocationsList,
+                         numNeighborsList, args.numWorkers)
     else:
         for k in kittiModelList:
+            predictionData = load_prediction_data (campaignName, k)
             for v in numVisitedLocationsList:
                 for n in numNeighborsList: 
-                    main (campaignName, k, v, n)
-        
+                    main (campaignName, k, v, n, predictionData)
@@ -59,6 +59,39 @@ def plot_stat (results, xMetric, yMetric, figName, style='-'):
     fig.tight_layout ()
     save_figure (fig, figName + '.pdf')
     
+mobilityPath = "input/bolognaLeftHalfRSU3_50vehicles_100sec/mobility/nodes/"
+mobilityCache = {} # mobility traces already read, by file path
+
+"""
+Reads the mobility trace of a vehicle (time [s], x, y), once: the following
+calls return the same dataframe, which must not be modified
+
+Params: 
+    - vehicleIndex: the index of the vehicle
+Return:
+    - dataframe with the positions of the vehicle over time
+"""
+def read_mobility (vehicleIndex):
+    path = mobilityPath + "node-" + str (vehicleIndex) + ".txt"
+    if (path not in mobilityCache):
+        mobilityCache [path] = pd.read_csv (path, header=None, delimiter=" ",
+                                            names=['time [s]', 'x', 'y'])
+    return mobilityCache [path]
+
+"""
+Raised when a position of a vehicle falls in more than one of the time windows
+of the measurements, so that the metric of the position is ambiguous
+
+Attributes:
+    - overlaps: dataframe with the vehicle, the time of the position and the
+                overlapping measurements (one row per measurement)
+"""
+class OverlappingWindowsError (ValueError):
+    def __init__ (self, overlaps):
+        self.overlaps = overlaps
+        super ().__init__ (str (overlaps [['firstVehicleIndex', 'time [s]']].drop_duplicates ().shape [0]) +
+                           " positions have more than 1 metric value\n" + str (overlaps))
+
 """
 Associates a metric measured by a certain vehicle over multiple time instants 
 with the visited positions  
@@ -74,48 +107,75 @@ Return:
     - z: list of values measured at each location 
 """ 
 def map_position_to_metric_single_vehicle (vehicleIndex, rlcOrPdcpStat, metric):
-    mobilityPath = "input/bolognaLeftHalfRSU3_50vehicles_100sec/mobility/nodes/"
-    mobilityDf = pd.read_csv (mobilityPath + "node-" + str (vehicleIndex) + ".txt", 
-                              header=None, delimiter=" ", names=['time [s]', 'x', 'y']) 
-    rlcOrPdcpStat = rlcOrPdcpStat [(rlcOrPdcpStat ['firstVehicleIndex'] == vehicleIndex)][['start [s]','end [s]', metric]]
-    x = []
-    y = []
-    z = []
-    for index, row in mobilityDf.iterrows ():
-        values = rlcOrPdcpStat [(row ['time [s]'] >= rlcOrPdcpStat ['start [s]']) &
-                                (row ['time [s]'] < rlcOrPdcpStat ['end [s]'])] [metric].values
-        if (len (values) == 0):
-            continue
-        if (len (values) > 1):
-            print (rlcOrPdcpStat [(row ['time [s]'] >= rlcOrPdcpStat ['start [s]']) &
-                                    (row ['time [s]'] < rlcOrPdcpStat ['end [s]'])])
-            print ("Error: more than 1 delay value")
-            exit ()
-        x += [float (row ['x'])]
-        y += [float (row ['y'])]
-        z += [float (values [0])]
-    return x,y,z
+    rlcOrPdcpStat = rlcOrPdcpStat [(rlcOrPdcpStat ['firstVehicleIndex'] == vehicleIndex)]
+    data = map_position_to_metric (rlcOrPdcpStat, metric)
+    return data ['x'].to_list (), data ['y'].to_list (), data [metric].to_list ()
 
 """
 Associates a metric measured by multiple vehicles over multiple time instants 
 with the visited positions.   
+Each position of the mobility trace of a vehicle takes the value measured in
+the time window [start, end) that contains it, if any, with a join on the
+sorted window boundaries of all the vehicles at once.
 
 Params: 
     - rlcOrPdcpStat: dataframe containing the simulation results (works only 
                      with RLC, PDCP or APP results)
     - metric: the metric to consider
 Return:
-    - x: list of x coordinates visited by the vehicle
-    - y: list of y coordinates visited by the vehicle
-    - z: list of average values measured at each location 
+    - dataframe with the x and y coordinates visited by the vehicles and the
+      value measured at each location (metric column), vehicle by vehicle
+Raises:
+    - OverlappingWindowsError: if a position falls in more than one window
 """ 
 def map_position_to_metric (rlcOrPdcpResult, metric):
-    allXYZ = pd.DataFrame ()
-    for i in rlcOrPdcpResult ['firstVehicleIndex'].unique ():
-        (x, y, z) = map_position_to_metric_single_vehicle (i, rlcOrPdcpResult, metric)
-        data = {'x' : x, 'y' : y, metric : z}
-        allXYZ = allXYZ.append (pd.DataFrame (data), ignore_index=True)
-    return allXYZ   
+    vehicles = rlcOrPdcpResult ['firstVehicleIndex'].unique ()
+    if (len (vehicles) == 0):
+        return pd.DataFrame (columns=['x', 'y', metric], dtype=float)
+    mobility = pd.concat ([read_mobility (i).assign (firstVehicleIndex=i) for i in vehicles],
+                          ignore_index=True)
+    mobility = mobility.astype ({'time [s]': float})
+    windows = rlcOrPdcpResult [['firstVehicleIndex', 'start [s]', 'end [s]', metric]]
+    windows = windows.dropna (subset=['start [s]', 'end [s]']).reset_index (drop=True)
+    windows = windows.astype ({'firstVehicleIndex': mobility ['firstVehicleIndex'].dtype,
+                               'start [s]': float, 'end [s]': float})
+    
+    # for each position, the last window started and the number of windows
+    # started and ended (end <= t) in the same vehicle, up to its time
+    starts = windows.assign (window=np.arange (len (windows))).sort_values ('start [s]', kind='stable')
+    starts ['numStarted'] = starts.groupby ('firstVehicleIndex').cumcount () + 1
+    ends = windows.sort_values ('end [s]', kind='stable')
+    ends ['numEnded'] = ends.groupby ('firstVehicleIndex').cumcount () + 1
+    positions = mobility [['firstVehicleIndex', 'time [s]']].assign (position=np.arange (len (mobility)))
+    positions = positions.sort_values ('time [s]', kind='stable')
+    positions = pd.merge_asof (positions, starts [['firstVehicleIndex', 'start [s]', 'numStarted', 'window']],
+                               left_on='time [s]', right_on='start [s]', by='firstVehicleIndex')
+    positions = pd.merge_asof (positions, ends [['firstVehicleIndex', 'end [s]', 'numEnded']],
+                               left_on='time [s]', right_on='end [s]', by='firstVehicleIndex')
+    positions = positions.sort_values ('position')
+    numWindows = (positions ['numStarted'].fillna (0) - positions ['numEnded'].fillna (0)).to_numpy ()
+    window = positions ['window'].fillna (-1).to_numpy (dtype=int, copy=True)
+    time = positions ['time [s]'].to_numpy ()
+    
+    # with a single window containing the position, it is the last one
+    # started, unless it contains a shorter one that already ended
+    nested = np.flatnonzero ((numWindows == 1) & (windows ['end [s]'].to_numpy () [window] <= time))
+    for p in nested:
+        vehicleWindows = windows [(windows ['firstVehicleIndex'] == mobility ['firstVehicleIndex'] [p]) &
+                                  (windows ['start [s]'] <= time [p]) & (time [p] < windows ['end [s]'])]
+        window [p] = vehicleWindows.index [0]
+    
+    ambiguous = np.flatnonzero (numWindows > 1)
+    if (len (ambiguous) > 0):
+        overlaps = mobility.iloc [ambiguous] [['firstVehicleIndex', 'time [s]']].merge (windows, on='firstVehicleIndex')
+        overlaps = overlaps [(overlaps ['start [s]'] <= overlaps ['time [s]']) &
+                             (overlaps ['time [s]'] < overlaps ['end [s]'])]
+        raise OverlappingWindowsError (overlaps.reset_index (drop=True))
+    
+    found = numWindows == 1
+    return pd.DataFrame ({'x': mobility ['x'].to_numpy (dtype=float) [found],
+                          'y': mobility ['y'].to_numpy (dtype=float) [found],
+                          metric: windows [metric].to_numpy (dtype=float) [window [found]]})
          
 """
 Produces a map plot in which each point represents a visited location. 
@@ -135,7 +195,7 @@ Params:
 def plot_metric_map (rlcOrPdcpResult, metric, figName, gamma=0.5):
     fig, ax = plt.subplots (1, 1)
     ax.grid ()
-    allXYZ = map_position_to_metric (rlcOrPdcpStat, metric)
+    allXYZ = map_position_to_metric (rlcOrPdcpResult, metric)
     
     # if multiple measures are available for the same position, compute the
     # average
@@ -0,0 +1,120 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import geopy.distance
+from scipy import interpolate
+from sklearn.metrics import mean_squared_error, accuracy_score, precision_score, recall_score
+from mmwave_gemv_integration_example_predictions import movAv_predict, build_spatial_index, predict_all
+
+"""
+    Compare the moving average and inverse distance weighting predictions of
+    movAv_predict (spatial index, all the points at once) with the previous
+    implementation (geodesic distance from every visited location, point by
+    point), on synthetic trajectories in the area of the Bologna scenario.
+    The reference implementation is timed on a subset of the trajectories.
+    Then, compare the nearest neighbor and linear predictions of griddata,
+    called for each trajectory, with predict_all, which predicts all the
+    trajectories with every method in one call.
+"""
+
+parser = argparse.ArgumentParser()
+parser.add_argument('-visited', '--visited', type=int, default=100) # Number of visited locations
+parser.add_argument('-trajectories', '--trajectories', type=int, default=50) # Number of test trajectories
+parser.add_argument('-points', '--points', type=int, default=100) # Points per trajectory
+parser.add_argument('-neighbors', '--neighbors', type=int, default=5) # Number of neighbors
+parser.add_argument('-reference_trajectories', '--reference_trajectories', type=int, default=5) # Trajectories predicted with the reference implementation
+args = vars(parser.parse_args())
+
+DELAY_REQ = 0.1
+
+def reference_predict (trainSamples, unknownPoints, numNeighbors=5, idw=False):
+    # Previous implementation of movAv_predict
+    Z = []
+    for u in unknownPoints:
+        newTrainSamples = trainSamples.copy ()
+        newTrainSamples ['distance'] = newTrainSamples.apply (lambda row, u=u:
+                                       geopy.distance.distance (u, row.coordinates).m,
+                                       axis = 1)
+        closestPoints = newTrainSamples.sort_values ('distance').head (numNeighbors)
+        if (idw):
+            weights = 1 / closestPoints ['distance']
+            if (np.isinf (weights).any ()):
+                prediction = closestPoints ['delay [s]'].to_numpy () [0]
+            else:
+                prediction = (closestPoints ['delay [s]'] * weights).sum () / weights.sum ()
+        else:
+            prediction = closestPoints ['delay [s]'].mean ()
+        Z.append (prediction)
+    return Z
+
+def delay (x, y):
+    # Smooth synthetic delay map, around the QoS requirement
+    return 0.1 + 0.05 * np.sin (x * 900) * np.cos (y * 700)
+
+rng = np.random.default_rng (1)
+# Locations around the points of a grid (about a meter apart), as the positions
+# of the vehicles on the roads
+grid = [(round (x + rng.normal (0, 1e-5), 7), round (y + rng.normal (0, 1e-5), 7))
+        for x in np.linspace (11.310, 11.3215, 60) for y in np.linspace (44.491, 44.4975, 40)]
+visited = [grid [i] for i in rng.choice (len (grid), args['visited'], replace=False)]
+train = pd.DataFrame ({'coordinates': visited,
+                       'delay [s]': [delay (x, y) + rng.normal (0, 0.01) for x, y in visited]})
+trajectories = [[grid [i] for i in rng.choice (len (grid), args['points'])]
+                for _ in range (args['trajectories'])]
+
+def run (function, trajectories, **kwargs):
+    start = time.time ()
+    predictions = [np.asarray (function (train, points, args['neighbors'], idw=idw, **kwargs))
+                   for points in trajectories for idw in [False, True]]
+    return predictions, time.time () - start
+
+def metrics (predictions, trajectories):
+    rows = []
+    for points, prediction in zip ([t for t in trajectories for _ in range (2)], predictions):
+        trueValues = np.array ([delay (x, y) for x, y in points])
+        trueClasses = (trueValues < DELAY_REQ).astype (int)
+        predClasses = (prediction < DELAY_REQ).astype (int)
+        rows.append ([mean_squared_error (trueValues, prediction),
+                      accuracy_score (trueClasses, predClasses),
+                      precision_score (trueClasses, predClasses, zero_division=0),
+                      recall_score (trueClasses, predClasses, zero_division=0)])
+    return np.array (rows)
+
+index = build_spatial_index (train)
+predictions, elapsed = run (movAv_predict, trajectories, index=index)
+print ("Spatial index ; trajectories", len (trajectories), "; time [s]", elapsed)
+
+subset = trajectories [:args['reference_trajectories']]
+reference, referenceElapsed = run (reference_predict, subset)
+print ("Reference ; trajectories", len (subset), "; time [s]", referenceElapsed,
+       "; expected for all the trajectories [s]", referenceElapsed * len (trajectories) / len (subset))
+
+difference = max (np.abs (p - r).max () for p, r in zip (predictions, reference))
+print ("Max prediction difference [s]", difference)
+print ("Same MSE/accuracy/precision/recall",
+       np.allclose (metrics (predictions [:len (reference)], subset), metrics (reference, subset),
+                    rtol=1e-9, atol=1e-12))
+
+# Nearest neighbor and linear interpolation, with griddata for each trajectory
+# (the triangulation is rebuilt at each call)
+start = time.time ()
+gridPredictions = []
+for points in trajectories:
+    nn = interpolate.griddata (train ['coordinates'].to_list (), train ['delay [s]'].to_numpy (), points, method='nearest')
+    lin = interpolate.griddata (train ['coordinates'].to_list (), train ['delay [s]'].to_numpy (), points, method='linear')
+    lin [np.isnan (lin)] = nn [np.isnan (lin)]
+    gridPredictions += [nn, lin]
+print ("griddata per trajectory ; time [s]", time.time () - start)
+
+start = time.time ()
+allPoints = np.array ([point for points in trajectories for point in points])
+nn, lin, movAv, idw = predict_all (train, allPoints, args['neighbors'])
+print ("predict_all, all methods and trajectories ; time [s]", time.time () - start)
+splits = np.cumsum ([len (points) for points in trajectories]) [:-1]
+batchPredictions = [p for pair in zip (np.split (nn, splits), np.split (lin, splits)) for p in pair]
+# The walk that finds the triangle of each point starts from the triangle of
+# the previous one: a point on a shared edge (or vertex) may be interpolated
+# in a different triangle, with a difference in the last bits
+print ("Max nearest neighbor and linear prediction difference [s]",
+       max (np.abs (g - b).max () for g, b in zip (gridPredictions, batchPredictions)))
@@ -0,0 +1,125 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+import numpy as np
+import pandas as pd
+from mmwavePlotUtils import (parse_trace, trace_rows, resample_trace, rxPacketTraceColumns,
+                             sample_rxPacketTrace, stream_sample_rxPacketTrace)
+
+"""
+    Compare the parsing of a RxPacketTrace.txt file line by line in Python,
+    with the Python engine of pandas and with parse_trace (C engine), and
+    time the resampling in periods of 100 ms of the parsed trace. Finally,
+    compare the peak memory of sample_rxPacketTrace on the whole trace and of
+    its streaming version, reading the trace in chunks.
+    A synthetic trace of the requested size is generated, unless a trace
+    file is given.
+"""
+
+parser = argparse.ArgumentParser()
+parser.add_argument('-file', '--file', type=str, default=None) # Existing RxPacketTrace.txt
+parser.add_argument('-size', '--size', type=int, default=300) # Size of the synthetic trace [MB]
+parser.add_argument('-chunk_rows', '--chunk_rows', type=int, default=200000) # Lines per chunk, in streaming
+parser.add_argument('-python_engine', '--python_engine', action='store_const', const=True, default=False) # Time the Python engine too (slow)
+args = vars(parser.parse_args())
+
+def write_trace (path, size):
+    header = "DL/UL\ttime\tframe\tsubF\tslot\t1stSym\tsymbol#\tcellId\trnti\tccId\ttbSize\tmcs\trv\tSINR(dB)\tcorrupt\tTBler\n"
+    rng = np.random.default_rng (0)
+    chunk = 200000
+    with open (path, 'w') as f:
+        f.write (header)
+        start = 0.0
+        while f.tell () < size * 1e6:
+            df = pd.DataFrame ({'mode': rng.choice (['DL', 'UL'], chunk),
+                                'time': start + np.sort (rng.uniform (0, 1, chunk)),
+                                'frame': rng.integers (0, 1024, chunk),
+                                'subF': rng.integers (0, 10, chunk),
+                                'slot': rng.integers (0, 8, chunk),
+                                '1stSym': rng.integers (0, 24, chunk),
+                                'symbol#': rng.integers (1, 24, chunk),
+                                'cellId': rng.integers (1, 4, chunk),
+                                'rnti': rng.integers (1, 50, chunk),
+                                'ccId': 0,
+                                'tbSize': rng.integers (10, 50000, chunk),
+                                'mcs': rng.integers (0, 29, chunk),
+                                'rv': 0,
+                                'SINR(dB)': rng.uniform (-5, 40, chunk).round (5),
+                                'corrupt': 0,
+                                'TBler': rng.uniform (0, 1e-3, chunk).round (8)})
+            df.to_csv (f, sep='\t', header=False, index=False)
+            start += 1
+
+def python_lines (text):
+    # Reference implementation: split and convert each line in Python
+    data = []
+    for line in text.splitlines () [1:]:
+        values = line.split ("\t")
+        data += [[values [0], float (values [1]), int (values [6]), int (values [7]),
+                  int (values [8]), int (values [9]), int (values [10]),
+                  int (values [11]), float (values [13])]]
+    return data
+
+def python_engine (text):
+    return pd.read_csv (StringIO (text), delimiter="\t", index_col=False,
+                        usecols=[0, 1, 6, 7, 8, 9, 10, 11, 13],
+                        names=[label for _, label, _ in rxPacketTraceColumns],
+                        engine='python', header=0)
+
+def peak_memory (label, function, *function_args):
+    # Peak of the memory allocated by Python and numpy while the function runs
+    tracemalloc.start ()
+    start = time.time ()
+    rows = function (*function_args)
+    elapsed = time.time () - start
+    _, peak = tracemalloc.get_traced_memory ()
+    tracemalloc.stop ()
+    print (label, "; time [s]", elapsed, "; rows", rows, "; peak memory [MB]", peak / 1e6)
+
+def whole_trace (path):
+    with open (path) as f:
+        return len (sample_rxPacketTrace ({'output': {'RxPacketTrace.txt': f.read ()}}))
+
+def streamed_trace (path):
+    return sum (len (df) for df in stream_sample_rxPacketTrace (path, args['chunk_rows']))
+
+def timed (label, function, *function_args):
+    start = time.time ()
+    result = function (*function_args)
+    elapsed = time.time () - start
+    print (label, "; time [s]", elapsed, "; rows", len (result), "; MB/s", size / elapsed)
+    return result
+
+with tempfile.TemporaryDirectory () as folder:
+    path = args['file']
+    if path is None:
+        path = os.path.join (folder, 'RxPacketTrace.txt')
+        write_trace (path, args['size'])
+    size = os.path.getsize (path) / 1e6
+    print ("RxPacketTrace.txt; size [MB]", size)
+
+    with open (path) as f:
+        text = f.read ()
+
+    timed ("Line by line", python_lines, text)
+    if args['python_engine']:
+        timed ("pandas, Python engine", python_engine, text)
+    timed ("parse_trace, from string", parse_trace, text, rxPacketTraceColumns)
+    with open (path) as f:
+        df = timed ("parse_trace, from file", parse_trace, f, rxPacketTraceColumns)
+    # Rows of Python values, as returned to sem by read_rxPacketTrace
+    timed ("parse_trace + trace_rows", lambda text: trace_rows (parse_trace (text, rxPacketTraceColumns)), text)
+
+    # Resampling of calc_ofdm_sym and sample_rxPacketTrace
+    timed ("resample_trace, sum per user", resample_trace, df, ['Cell ID', 'RNTI', 'CC ID'],
+           {'OFDM symbols': 'sum'})
+    timed ("resample_trace, means per user and direction", resample_trace, df,
+           ['Cell ID', 'RNTI', 'CC ID', 'UL/DL'],
+           {'OFDM symbols': 'mean', 'TB size [bytes]': 'mean', 'MCS': 'mean', 'SINR [dB]': 'mean'})
+
+    del text, df
+    peak_memory ("sample_rxPacketTrace, whole trace", whole_trace, path)
+    peak_memory ("stream_sample_rxPacketTrace, %d lines per chunk" % args['chunk_rows'], streamed_trace, path)
@@ -3096,10 +3096,8 @@ MmWaveHelper::InstallSingleSub6EnbDevice (Ptr<Node> n)
 }
 
 void
-MmWaveHelper::InstallRanAI (NetDeviceContainer devices, std::map<uint16_t, Ptr<Application>> imsiApplication, Ptr<BurstyAppStatsCalculator> appStats)
+MmWaveHelper::InstallRanAI (NetDeviceContainer devices, std::map<uint16_t, Ptr<Application>> imsiApplication, Ptr<BurstyAppStatsCalculator> appStats, uint16_t memBlockKey)
 {
-  int memBlockKey = 2333; ///< memory block key, need to keep the same in the python script
-  
   for (auto dev = devices.Begin (); dev != devices.End (); ++dev)
   {
     DynamicCast<MmWaveEnbNetDevice>(*dev)->InstallRanAI(memBlockKey, GetRlcStats(), GetPdcpStats(), imsiApplication, appStats);
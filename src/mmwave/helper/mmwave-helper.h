@@ -332,7 +332,16 @@ public:
   NetDeviceContainer InstallSub6UeDevice (NodeContainer n);
   Ptr<NetDevice> InstallSingleSub6UeDevice (Ptr<Node>);
 
-  void InstallRanAI (NetDeviceContainer devices, std::map<uint16_t, Ptr<Application>> imsiApplication, Ptr<BurstyAppStatsCalculator> appStats);
+  /**
+   * Install the RAN AI on eNB devices
+   *
+   * \param devices enb devices
+   * \param imsiApplication the application of each IMSI
+   * \param appStats the application stats calculator
+   * \param memBlockKey the key of the shared memory block, must be the same
+   *        in the python script and unique among concurrent simulations
+   */
+  void InstallRanAI (NetDeviceContainer devices, std::map<uint16_t, Ptr<Application>> imsiApplication, Ptr<BurstyAppStatsCalculator> appStats, uint16_t memBlockKey = 2333);
   
   /**
    * Install a fake RAN AI on eNB devices, used for testing purposes